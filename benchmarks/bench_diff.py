@@ -0,0 +1,68 @@
+"""Benchmarks diffing two snapshots of a zone against loading both into Python sets.
+
+Writes two synthetic gzip snapshots that differ by a small fraction of delegations, then
+diffs them with ZoneDiff for an increasing number of partitions and with a naive
+set-of-lines comparison, reporting wall time and peak resident memory so far.
+
+Usage:
+    python benchmarks/bench_diff.py --records 5000000 --partitions 1 8 64
+"""
+
+import argparse
+import gzip
+import os
+import resource
+import tempfile
+import time
+
+from czds.diff import ZoneDiff
+from czds.stream import iter_file_records
+
+
+def write_zone(path, records, offset):
+    """Writes a synthetic zone, shifted by offset so consecutive snapshots overlap."""
+    with gzip.open(path, "wt", compresslevel=6) as f:
+        for i in range(offset, records + offset):
+            f.write(f"example{i}.com.\t172800\tin\tns\tns{i % 250}.example-dns.net.\n")
+            f.write(f"example{i}.com.\t172800\tin\tns\tns{(i + 1) % 250}.example-dns.net.\n")
+
+
+def peak_rss():
+    """Returns the peak resident memory of this process in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000, help="Number of delegations per snapshot.")
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 16, 64], help="Partition counts.")
+    parser.add_argument("--sets", action="store_true", help="Also run the naive set comparison (uses most memory).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        old = os.path.join(directory, "old.txt.gz")
+        new = os.path.join(directory, "com.txt.gz")
+        write_zone(old, args.records, 0)
+        write_zone(new, args.records, args.records // 100)
+
+        # Peak memory only grows, so the most partitioned (smallest) run goes first.
+        for partitions in sorted(args.partitions, reverse=True):
+            start = time.perf_counter()
+            zone_diff = ZoneDiff(old, new, partitions=partitions)
+            for _ in zone_diff:
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"{f'{partitions} partitions':<16} {elapsed:>8.1f}s peak {peak_rss():>8.0f} MiB {zone_diff.counts}")
+
+        if args.sets:
+            start = time.perf_counter()
+            old_lines = set(iter_file_records(old))
+            new_lines = set(iter_file_records(new))
+            changed = len(old_lines ^ new_lines)
+            elapsed = time.perf_counter() - start
+            print(f"{'python sets':<16} {elapsed:>8.1f}s peak {peak_rss():>8.0f} MiB {changed} lines differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmarks the cost of logging calls on the download hot path.
+
+Compares the previous `Base.log`, which called `inspect.stack()` to find the calling
+class's logger, with the current one that uses the logger bound to each class, and an
+f-string debug message with the lazy `%` style one while debug logging is disabled.
+It also compares writing enabled records on the logging thread with queueing them for
+`start_queue_logging`'s background thread. Records are written to os.devnull, the cheapest
+possible handler, so queueing only wins once a handler blocks, such as a slow terminal or
+disk, and on a single CPU the listener thread competes with the caller.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 100000
+"""
+
+import argparse
+import inspect
+import logging
+import os
+import time
+
+from czds.base import Base
+from czds.logger import start_queue_logging
+from czds.logger import stop_queue_logging
+
+
+class Component(Base):
+    """A class logging through Base.log, like the connector does."""
+
+    def legacy_log(self, message, level="info"):
+        """The previous Base.log, which inspected the whole stack on every call."""
+        parent = inspect.stack()[1][0].f_locals.get("self", None)
+        component = parent.__class__.__name__
+        try:
+            getattr(getattr(parent, f"_{component}__logger"), level)(message)
+        except AttributeError:
+            getattr(logging.getLogger("Base"), level)(message)
+
+    def call_legacy(self, url):
+        """Logs through the previous Base.log."""
+        self.legacy_log(f"Making request to '{url}'.", "debug")
+
+    def call_log(self, url):
+        """Logs through the current Base.log."""
+        self.log("Making request to '%s'.", "debug", url)
+
+    def call_fstring(self, url):
+        """Logs an eagerly formatted debug message."""
+        self.__logger.debug(f"Making request to '{url}'.")
+
+    def call_lazy(self, url):
+        """Logs a lazily formatted debug message."""
+        self.__logger.debug("Making request to '%s'.", url)
+
+    def call_enabled(self, url):
+        """Logs a message that is written."""
+        self.__logger.warning("Making request to '%s'.", url)
+
+
+def rate(method, calls):
+    """Returns how many calls per second method manages."""
+    url = "https://czds-api.icann.org/czds/downloads/com.zone"
+    start = time.perf_counter()
+    for _ in range(calls):
+        method(url)
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100_000, help="Number of log calls per case.")
+    args = parser.parse_args()
+
+    component = Component()
+    logging.getLogger().setLevel(logging.INFO)
+    # The previous Base.log is slow enough that a hundredth of the calls gives a stable rate.
+    for name, method, calls in [
+        ("Base.log before", component.call_legacy, max(1, args.calls // 100)),
+        ("Base.log after", component.call_log, args.calls),
+        ("f-string debug", component.call_fstring, args.calls),
+        ("lazy debug", component.call_lazy, args.calls),
+    ]:
+        print(f"{name:<20} {rate(method, calls):>14,.0f} calls/s")
+
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        root = logging.getLogger()
+        saved = root.handlers[:]
+        root.handlers = [handler]
+        try:
+            print(f"{'written in thread':<20} {rate(component.call_enabled, args.calls):>14,.0f} calls/s")
+            start_queue_logging()
+            print(f"{'queued':<20} {rate(component.call_enabled, args.calls):>14,.0f} calls/s")
+        finally:
+            stop_queue_logging()
+            root.handlers = saved
+
+
+if __name__ == "__main__":
+    main()
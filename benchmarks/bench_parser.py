@@ -0,0 +1,82 @@
+"""Benchmarks zone line parsing on a synthetic zone.
+
+Compares the original token-counting `_parse_line` with `czds.parser.parse_line`
+(one dictionary per record) and `czds.parser.parse_records` (one tuple per record)
+and reports records/sec for each.
+
+Usage:
+    python benchmarks/bench_parser.py --records 5000000
+"""
+
+import argparse
+import time
+
+from czds.parser import parse_line
+from czds.parser import parse_records
+
+
+TEMPLATES = (
+    "example{0}.com.\t172800\tin\tns\tns{1}.example-dns.net.",
+    "example{0}.com.\t86400\tin\tds\t{1} 8 2 49FD46E6C4B45C55D4AC69CBD3CD34AC1AFE51DE",
+    "ns{1}.example{0}.com.\tin\t172800\ta\t192.0.2.{1}",
+    "example{0}.com.\t172800\tin\tns\tns{1}.example-dns.org.",
+)
+
+
+def synthetic_zone(records):
+    """Returns a list of synthetic zone lines in both TTL/class orderings."""
+    return [TEMPLATES[i % len(TEMPLATES)].format(i, i % 250) for i in range(records)]
+
+
+def original_parse_line(line):
+    """The parser used before czds.parser, kept here as the baseline."""
+    count = 1
+    zone_dict = {}
+    record_data_list = []
+    for item in line.split():
+        if count == 1:
+            zone_dict["dns_record"] = item.rstrip(".")
+        elif count == 2:
+            try:
+                int(item)
+                zone_dict["ttl"] = item
+            except Exception:
+                zone_dict["record_class"] = item
+        elif count == 3:
+            if zone_dict.get("record_class"):
+                zone_dict["ttl"] = item
+            else:
+                zone_dict["record_class"] = item
+        elif count == 4:
+            zone_dict["record_type"] = item
+        else:
+            record_data_list.append(item)
+        count += 1
+    zone_dict["record_data"] = " ".join(record_data_list)
+    return zone_dict
+
+
+def measure(name, function, lines, baseline=None):
+    """Times function over lines and prints records/sec."""
+    start = time.perf_counter()
+    function(lines)
+    rate = len(lines) / (time.perf_counter() - start)
+    speedup = f"{rate / baseline:>6.1f}x" if baseline else ""
+    print(f"{name:<32} {rate:>14,.0f} records/s {speedup}")
+    return rate
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2_000_000, help="Number of synthetic zone lines.")
+    args = parser.parse_args()
+
+    lines = synthetic_zone(args.records)
+    baseline = measure("original _parse_line (dict)", lambda ls: [original_parse_line(x) for x in ls], lines)
+    measure("parser.parse_line (dict)", lambda ls: [parse_line(x) for x in ls], lines, baseline)
+    measure("parser.parse_records (tuple)", lambda ls: list(parse_records(ls)), lines, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmarks the multi-process parsing pipeline against the number of workers.
+
+Writes a synthetic gzip zone, then parses it serially and with ParallelParser for
+an increasing number of workers, reporting records/sec and the speedup over one core.
+Decompression stays in the main process, so throughput levels off once the workers
+parse faster than one core can inflate.
+
+Usage:
+    python benchmarks/bench_pipeline.py --records 5000000 --workers 1 2 4 8 16 32
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+
+from czds.parser import parse_records
+from czds.pipeline import ParallelParser
+from czds.stream import iter_file_records
+
+
+def write_zone(path, records):
+    """Writes a synthetic zone file with the provided number of records."""
+    with gzip.open(path, "wt", compresslevel=6) as f:
+        for i in range(records):
+            f.write(f"example{i}.com.\t172800\tin\tns\tns{i % 250}.example-dns.net.\n")
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2_000_000, help="Number of synthetic zone records.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()], help="Worker counts.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.txt.gz")
+        write_zone(path, args.records)
+
+        start = time.perf_counter()
+        count = sum(1 for _ in parse_records(iter_file_records(path)))
+        serial = count / (time.perf_counter() - start)
+        print(f"{'serial':<12} {serial:>14,.0f} records/s")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            count = ParallelParser(workers=workers).count(path)
+            rate = count / (time.perf_counter() - start)
+            print(f"{f'{workers} workers':<12} {rate:>14,.0f} records/s {rate / serial:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Runs the offline benchmark suite against a local fake CZDS server and stores the results.
+
+Synthetic gzip zones are served by FakeCZDSServer with the requested latency, bandwidth cap,
+429 rate and dropped connections. Each scenario runs in a fresh process, so its peak
+resident memory is its own, and reports its throughput:
+
+    get_zone_sequential   every zone downloaded one after another
+    get_zone_threaded     the same zones with `get_zone(threaded=True)`
+    get_zone_faults       threaded, with 429s and dropped connections injected
+    write_path            one large zone with no latency or bandwidth cap
+    parse_lines           `iter_file_records(parse=False)` over a local zone
+    parse_records         `iter_file_records()`, one ZoneData per record
+    parse_batches         `iter_file_batches()`, columnar batches
+    export_ndjson         `export_file(output_format="ndjson")`
+
+Results are written as JSON to the results directory, named after the time and commit, with
+the settings, Python version and platform. Comparing against an earlier file reports the
+change of every metric and exits with status 1 when one regressed by more than the threshold.
+
+Usage:
+    python benchmarks/bench_suite.py --zones 8 --records 200000 --latency 0.02
+    python benchmarks/bench_suite.py --compare benchmarks/results/<earlier>.json --threshold 0.1
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from datetime import timezone
+
+from fake_server import FakeCZDSServer
+from fake_server import make_zone
+
+
+SCENARIOS = (
+    "get_zone_sequential",
+    "get_zone_threaded",
+    "get_zone_faults",
+    "write_path",
+    "parse_lines",
+    "parse_records",
+    "parse_batches",
+    "export_ndjson",
+)
+# Compared metrics where a lower value is better. Rates, ending in `_per_s`, are better higher.
+LOWER_IS_BETTER = ("seconds", "peak_rss_mib")
+
+
+def peak_rss():
+    """Returns the peak resident memory of this process in MiB.
+
+    Linux keeps ru_maxrss across exec, so a spawned process would report its parent's peak.
+    VmHWM starts over with the new program.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def client(url, directory, settings):
+    """Points czds at the fake server and returns a CZDS client collecting metrics."""
+    from czds import CZDS
+    from czds.base import Base
+
+    Base.BASE_URL = url
+    Base.AUTH_URL = url + "/api/authenticate"
+    Base.THREAD_COUNT = settings["threads"]
+    Base.BACKOFF_FACTOR = settings["backoff"]
+    return CZDS("bench", "bench", directory, rate_limit=settings["rate_limit"], metrics=True)
+
+
+def download(url, settings, threaded, link=None):
+    """Downloads every zone, or one link, into a new directory and reports MB/s."""
+    with tempfile.TemporaryDirectory() as directory:
+        czds = client(url, directory, settings)
+        start = time.perf_counter()
+        czds.get_zone(link, threaded=threaded)
+        seconds = time.perf_counter() - start
+        totals = json.loads(czds.metrics_report())["totals"]
+    return {"seconds": seconds, "mb_per_s": totals["bytes"] / seconds / 1e6, "retries": totals["retries"]}
+
+
+def parse(path, scenario, settings):
+    """Parses a local zone in the scenario's mode and reports records/s."""
+    with tempfile.TemporaryDirectory() as directory:
+        czds = client("http://127.0.0.1:9", directory, settings)
+        start = time.perf_counter()
+        if scenario == "parse_lines":
+            records = sum(1 for _ in czds.iter_file_records(path, parse=False))
+        elif scenario == "parse_records":
+            records = sum(1 for _ in czds.iter_file_records(path))
+        elif scenario == "parse_batches":
+            records = sum(len(batch) for batch in czds.iter_file_batches(path))
+        else:
+            output = czds.export_file(path, output_format="ndjson", destination=directory)
+            with open(output, "rb") as f:
+                records = sum(1 for _ in f)
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "records_per_s": records / seconds}
+
+
+def run_scenario(scenario, url, zone_path, settings, results):
+    """Runs one scenario in this process and puts its metrics on the results queue."""
+    # Injected faults would otherwise log a warning for every retry.
+    logging.disable(logging.WARNING)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        if scenario.startswith("get_zone"):
+            result = download(url, settings, threaded=scenario != "get_zone_sequential")
+        elif scenario == "write_path":
+            result = download(url, settings, threaded=False, link=url + "/czds/downloads/big.zone")
+        else:
+            result = parse(zone_path, scenario, settings)
+    result["peak_rss_mib"] = peak_rss()
+    results.put(result)
+
+
+def in_fresh_process(scenario, url, zone_path, settings):
+    """Runs a scenario in a new interpreter and returns its metrics."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_scenario, args=(scenario, url, zone_path, settings, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def serve(scenario, args, zones, big_zone):
+    """Returns the fake server a scenario downloads from."""
+    if scenario == "write_path":
+        return FakeCZDSServer(zones={"big": big_zone})
+    faults = scenario == "get_zone_faults"
+    return FakeCZDSServer(
+        zones=zones,
+        latency=args.latency,
+        bandwidth=int(args.bandwidth_mb * 1e6),
+        throttle_rate=args.throttle_rate if faults else 0.0,
+        drop_rate=args.drop_rate if faults else 0.0,
+        seed=args.seed,
+    )
+
+
+def git_commit():
+    """Returns the short hash of the checked out commit, or 'unknown'."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold):
+    """Prints the change of every metric against a baseline and returns the regressed metrics."""
+    regressions = []
+    for scenario, metrics in results.items():
+        for name, value in metrics.items():
+            before = baseline.get("results", {}).get(scenario, {}).get(name)
+            if not before or not (name in LOWER_IS_BETTER or name.endswith("_per_s")):
+                continue
+            change = (value - before) / before
+            worse = change > threshold if name in LOWER_IS_BETTER else change < -threshold
+            if worse:
+                regressions.append(f"{scenario}.{name}")
+            flag = "  REGRESSED" if worse else ""
+            print(f"{scenario:<22} {name:<14} {before:>12.2f} -> {value:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    """Runs the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=8, help="Number of zones served.")
+    parser.add_argument("--records", type=int, default=200_000, help="Records per zone.")
+    parser.add_argument("--big-records", type=int, default=2_000_000, help="Records in the write_path zone.")
+    parser.add_argument("--threads", type=int, default=8, help="THREAD_COUNT for threaded downloads.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency per request, in seconds.")
+    parser.add_argument("--bandwidth-mb", type=float, default=0, help="Per connection cap in MB/s, 0 for none.")
+    parser.add_argument("--throttle-rate", type=float, default=0.2, help="Share of downloads answered 429.")
+    parser.add_argument("--drop-rate", type=float, default=0.2, help="Share of downloads dropped halfway.")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Client requests per second, 0 for none.")
+    parser.add_argument("--backoff", type=float, default=0.05, help="Client BACKOFF_FACTOR in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected faults.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="What to run.")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(__file__), "results"), help="Results dir.")
+    parser.add_argument("--compare", help="An earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change counted as a regression.")
+    args = parser.parse_args()
+
+    settings = {"threads": args.threads, "backoff": args.backoff, "rate_limit": args.rate_limit}
+    zones = {f"tld{i}": make_zone(f"tld{i}", args.records) for i in range(args.zones)}
+    needs_big = "write_path" in args.scenarios or any(s.startswith(("parse", "export")) for s in args.scenarios)
+    big_zone = make_zone("big", args.big_records) if needs_big else b""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        zone_path = os.path.join(directory, "big.txt.gz")
+        with open(zone_path, "wb") as f:
+            f.write(big_zone)
+        for scenario in args.scenarios:
+            with serve(scenario, args, zones, big_zone) as server:
+                results[scenario] = in_fresh_process(scenario, server.url, zone_path, settings)
+                if scenario == "get_zone_faults":
+                    results[scenario].update({name: server.stats[name] for name in ("throttled", "dropped", "resumed")})
+            result = results[scenario]
+            rates = " ".join(f"{value:,.1f} {name}" for name, value in result.items() if name.endswith("_per_s"))
+            print(f"{scenario:<22} {result['seconds']:>8.2f}s {rates:>28} peak {result['peak_rss_mib']:>6.0f} MiB")
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "timestamp": now.isoformat(),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "settings": vars(args),
+        },
+        "results": results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{now:%Y%m%dT%H%M%SZ}-{report['meta']['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
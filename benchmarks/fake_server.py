@@ -0,0 +1,185 @@
+"""A local stand-in for the CZDS authentication and download endpoints.
+
+The server answers the same paths the connector uses:
+
+    POST /api/authenticate            -> {"accessToken": "..."}
+    GET  /czds/downloads/links        -> a JSON list of zone links
+    GET  /czds/downloads/<tld>.zone   -> the zone file body, or its tail for a Range request
+
+Zone bodies are held in memory and served with HTTP/1.1 keep-alive. Faults can be injected
+to reproduce a busy server: latency before each response, a per-connection bandwidth cap,
+429 responses and connections dropped partway through a zone. Faults are drawn from a
+seeded random generator, so runs with the same settings see the same sequence.
+"""
+
+import gzip
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Dict
+
+
+TEMPLATES = (
+    "example{0}.{2}.\t172800\tin\tns\tns{1}.example-dns.net.\n",
+    "example{0}.{2}.\t86400\tin\tds\t{1} 8 2 49FD46E6C4B45C55D4AC69CBD3CD34AC1AFE51DE\n",
+    "ns{1}.example{0}.{2}.\tin\t172800\ta\t192.0.2.{1}\n",
+    "example{0}.{2}.\t172800\tin\tns\tns{1}.example-dns.org.\n",
+)
+
+
+def make_zone(tld, records, compresslevel=6):
+    """Returns a gzip compressed synthetic zone with the provided number of records."""
+    lines = "".join(TEMPLATES[i % len(TEMPLATES)].format(i, i % 250, tld) for i in range(records))
+    return gzip.compress(lines.encode(), compresslevel=compresslevel)
+
+
+class FakeCZDSHandler(BaseHTTPRequestHandler):
+    """Request handler for FakeCZDSServer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        """Silences request logging."""
+
+    def _send_body(self, body, status=200, headers=None, drop_at=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        view = memoryview(body)
+        end = len(body) if drop_at is None else drop_at
+        block = 1024 * 1024
+        if self.server.bandwidth:
+            # Small blocks keep the pacing smooth.
+            block = max(1024, min(block, self.server.bandwidth // 20))
+        start = time.perf_counter()
+        for offset in range(0, end, block):
+            self.wfile.write(view[offset : min(offset + block, end)])
+            if self.server.bandwidth:
+                delay = (offset + block) / self.server.bandwidth - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+        if drop_at is not None:
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+
+    def do_POST(self):
+        """Serves the authentication endpoint."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count("requests")
+        time.sleep(self.server.latency)
+        self._send_body(b'{"accessToken": "fake-token"}', headers={"Content-Type": "application/json"})
+
+    def do_GET(self):
+        """Serves the link list and zone files."""
+        self.server.count("requests")
+        time.sleep(self.server.latency)
+        if self.path == "/czds/downloads/links":
+            links = [f"{self.server.url}/czds/downloads/{tld}.zone" for tld in self.server.zones]
+            self._send_body(json.dumps(links).encode(), headers={"Content-Type": "application/json"})
+            return
+        tld = self.path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+        body = self.server.zones.get(tld)
+        if body is None:
+            self._send_body(b"", status=404)
+            return
+        if self.command == "GET" and self.server.roll("throttled", self.server.throttle_rate):
+            self._send_body(b"", status=429, headers={"Retry-After": str(self.server.retry_after)})
+            return
+        self._send_zone(tld, body)
+
+    def _send_zone(self, tld, body):
+        headers = {"Content-Disposition": f"attachment;filename={tld}.txt.gz", "Accept-Ranges": "bytes"}
+        status, start = 200, 0
+        requested = self.headers.get("Range", "")
+        if requested.startswith("bytes=") and requested.endswith("-"):
+            start = int(requested[len("bytes=") : -1])
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            self.server.count("resumed")
+        body = body[start:] if start else body
+        drop_at = None
+        if self.command == "GET" and len(body) > 1 and self.server.roll("dropped", self.server.drop_rate):
+            drop_at = len(body) // 2
+        self._send_body(body, status=status, headers=headers, drop_at=drop_at)
+
+    do_HEAD = do_GET
+
+
+class FakeCZDSServer(ThreadingHTTPServer):
+    """A threaded HTTP server serving in-memory zone files.
+
+    Example:
+        with FakeCZDSServer(zones={"com": data}, latency=0.05, throttle_rate=0.1) as server:
+            Base.BASE_URL = server.url
+            Base.AUTH_URL = server.url + "/api/authenticate"
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        zones: Dict[str, bytes] = None,
+        latency: float = 0.0,
+        bandwidth: int = 0,
+        throttle_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        retry_after: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """Binds the server to a free port on localhost.
+
+        Args:
+            zones (Dict[str, bytes]): The zone file bodies keyed by TLD. Defaults to None.
+            latency (float): Seconds to wait before answering each request. Defaults to 0.0.
+            bandwidth (int): The most bytes per second sent on each connection, 0 for unlimited. Defaults to 0.
+            throttle_rate (float): The share of zone downloads answered with 429. Defaults to 0.0.
+            drop_rate (float): The share of zone downloads whose connection is closed halfway. Defaults to 0.0.
+            retry_after (int): The Retry-After sent with each 429, in seconds. Defaults to 0.
+            seed (int): Seeds the choice of throttled and dropped requests. Defaults to 0.
+        """
+        super().__init__(("127.0.0.1", 0), FakeCZDSHandler)
+        self.zones = dict(zones or {})
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.throttle_rate = throttle_rate
+        self.drop_rate = drop_rate
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "throttled": 0, "dropped": 0, "resumed": 0}
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def count(self, name):
+        """Increments one of the request counters in stats."""
+        with self._lock:
+            self.stats[name] += 1
+
+    def roll(self, name, rate):
+        """Returns whether to inject a fault with the provided probability, counting it in stats."""
+        if rate <= 0:
+            return False
+        with self._lock:
+            hit = self._random.random() < rate
+            if hit:
+                self.stats[name] += 1
+        return hit
+
+    def __enter__(self):
+        """Starts serving on a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stops the server."""
+        self.shutdown()
+        self.server_close()
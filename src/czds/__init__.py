@@ -1,6 +1,33 @@
-"""CZDS."""
+"""CZDS.
 
-from .czds import CZDS
+The public classes are imported on first access, so importing `czds`, or running a CLI
+command that never talks to CZDS, does not pay for the HTTP and asyncio stacks.
+"""
 
+from typing import Any
 
-__all__ = ["CZDS"]
+
+__all__ = ["AsyncCZDS", "CZDS"]
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the public classes on first access.
+
+    Args:
+        name (str): The attribute name.
+
+    Raises:
+        AttributeError: Raises when the name is not a public class.
+
+    Returns:
+        Any: The class.
+    """
+    if name == "CZDS":
+        from .czds import CZDS
+
+        return CZDS
+    if name == "AsyncCZDS":
+        from .aio import AsyncCZDS
+
+        return AsyncCZDS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,10 +3,12 @@
 import fire
 
 from .czds import CZDS
+from .logger import configure_logging
 
 
 def main():
     """Main entry point for the command line interface of CZDS."""
+    configure_logging()
     fire.Fire(CZDS)
 
 
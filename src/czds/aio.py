@@ -0,0 +1,359 @@
+"""Asyncio download engine for czds.
+
+`AsyncCZDS` and `AsyncCZDSConnector` mirror `CZDS` and `CZDSConnector` but run every
+request on a single event loop using `aiohttp`. The number of in-flight zone streams
+is bounded by a semaphore instead of by an OS thread pool.
+
+`aiohttp` is an optional dependency and can be installed with `pip install czds[async]`.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any
+from typing import AnyStr
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
+
+from .auth import TokenCache
+from .base import Base
+from .exceptions import CZDSConnectionError
+from .exceptions import UnsupportedTypeError
+from .logger import configure_logging
+
+
+def _import_aiohttp() -> Any:
+    """Imports aiohttp on first use so it stays an optional dependency.
+
+    Raises:
+        ImportError: Raises when aiohttp is not installed.
+
+    Returns:
+        Any: The aiohttp module.
+    """
+    try:
+        import aiohttp
+    except ImportError as ie:
+        raise ImportError("AsyncCZDS requires aiohttp. Install it with 'pip install czds[async]'.") from ie
+    return aiohttp
+
+
+def _discard(f: Any, path: AnyStr) -> None:
+    """Closes a part file and removes it.
+
+    Args:
+        f (Any): The open part file.
+        path (AnyStr): The path of the part file.
+    """
+    f.close()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class AsyncCZDSConnector(Base):
+    """Asynchronous CZDS connection class.
+
+    All asynchronous API calls go through this class. Use it as an async context manager
+    so the underlying connection pool is closed when you are done.
+    """
+
+    CHUNK_SIZE: int = 64 * 1024
+    # Bytes gathered from the stream before each write is handed to the executor.
+    WRITE_SIZE: int = 1024 * 1024
+
+    def __init__(self, max_concurrency: int = 10) -> None:
+        """Creates a credential property and the semaphore bounding in-flight downloads.
+
+        Args:
+            max_concurrency (int): The maximum number of zone files streamed at once. Defaults to 10.
+        """
+        self.credential: dict = {"username": Base.USERNAME, "password": Base.PASSWORD}
+        self.max_concurrency = max(1, max_concurrency)
+        self.token: AnyStr = None
+        self._session = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def __aenter__(self) -> "AsyncCZDSConnector":
+        """Opens the connection pool and retrieves our access token.
+
+        Returns:
+            AsyncCZDSConnector: This connector.
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Closes the connection pool."""
+        await self.close()
+
+    async def open(self) -> None:
+        """Opens the connection pool and retrieves our access token."""
+        if self._session is None:
+            aiohttp = _import_aiohttp()
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency + 1)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None))
+        if not self.token:
+            self.token = await self.get_token()
+
+    async def close(self) -> None:
+        """Closes the connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _raise_for_status(self, response: Any) -> None:
+        """Maps HTTP error responses onto our CZDSConnectionError.
+
+        Args:
+            response (Any): The aiohttp ClientResponse object.
+
+        Raises:
+            CZDSConnectionError: Raises when a connection error occurs.
+        """
+        aiohttp = _import_aiohttp()
+        try:
+            response.raise_for_status()
+        except aiohttp.ClientResponseError as error:
+            if error.status == 404:
+                raise CZDSConnectionError(status_code=error.status, name="InvalidURL", http_error=error)
+            elif error.status == 401:
+                raise CZDSConnectionError(status_code=401, name="InvalidAuthentication", http_error=error)
+            elif error.status == 500:
+                raise CZDSConnectionError(status_code=500, name="InternalServerError", http_error=error)
+            else:
+                raise CZDSConnectionError(status_code=error.status, name="UnknownError", http_error=error)
+
+    async def get_token(self) -> AnyStr:
+        """Retrieves the access token for all other API calls, reusing a cached one when possible.
+
+        Returns:
+            AnyStr: An access token.
+        """
+        # The cache takes a thread lock and may read its file, so it is consulted off the event loop.
+        token = await asyncio.to_thread(TokenCache.peek, self.credential["username"])
+        if token is not None:
+            return token
+        async with self._session.post(
+            self.AUTH_URL, data=json.dumps(self.credential), headers=self.BASE_HEADERS
+        ) as response:
+            self._raise_for_status(response)
+            token = (await response.json(content_type=None))["accessToken"]
+        await asyncio.to_thread(TokenCache.put, self.credential["username"], token)
+        return token
+
+    def _headers(self) -> Dict[str, str]:
+        """Returns the headers used for all authenticated calls to CZDS.
+
+        Returns:
+            Dict[str, str]: The request headers.
+        """
+        return {**Base.BASE_HEADERS, "Authorization": f"Bearer {self.token}"}
+
+    async def _get_zone_links(self) -> List[str]:
+        """Retrieves all available CZDS zone file links.
+
+        Returns:
+            List[str]: A list of available CZDS zone file links.
+        """
+        async with self._session.get(self.BASE_URL + "/czds/downloads/links", headers=self._headers()) as response:
+            self._raise_for_status(response)
+            return await response.json(content_type=None)
+
+    async def _download_single_zone_file(self, zone_file_link: AnyStr) -> AnyStr:
+        """Streams a zone file to SAVE_PATH while holding one semaphore slot.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file to download from.
+
+        Returns:
+            AnyStr: The path that the zone file was downloaded to.
+        """
+        async with self._semaphore:
+            self.__logger.debug("Making request to '%s'.", zone_file_link)
+            async with self._session.get(zone_file_link, headers=self._headers()) as response:
+                self._raise_for_status(response)
+                filename = None
+                if response.content_disposition is not None:
+                    filename = response.content_disposition.filename
+                # If we could not get a filename from the header, then makeup one like [tld].txt.gz
+                if not filename:
+                    filename = zone_file_link.rsplit("/", 1)[-1].rsplit(".")[-2] + ".txt.gz"
+                path = os.path.join(Base.SAVE_PATH, filename)
+                await self._write_to_disk(response, path)
+        return path
+
+    async def _write_to_disk(self, response: Any, path: AnyStr) -> None:
+        """Streams a response body into `<path>.part` and renames it into place once complete.
+
+        File I/O runs in the default executor, so a slow disk never stalls the event loop and the
+        other downloads on it. A failed or cancelled download removes its part file.
+
+        Args:
+            response (Any): The aiohttp ClientResponse object.
+            path (AnyStr): The path to save the zone file to.
+        """
+        temp_path = path + ".part"
+        f = await asyncio.to_thread(open, temp_path, "wb")
+        pending = None
+
+        async def run(function: Any, *args: Any) -> Any:
+            # Shielded, so cancelling the download never closes the file under a write still in the executor.
+            nonlocal pending
+            pending = asyncio.ensure_future(asyncio.to_thread(function, *args))
+            return await asyncio.shield(pending)
+
+        try:
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) >= self.WRITE_SIZE:
+                    await run(f.write, buffer)
+                    buffer = bytearray()
+            await run(f.write, buffer)
+            await run(f.close)
+            await run(os.replace, temp_path, path)
+        except BaseException:
+            if pending is not None:
+                await asyncio.wait([pending])
+            await asyncio.to_thread(_discard, f, temp_path)
+            raise
+
+    async def iter_download(self, zone_file_list: List[AnyStr]) -> AsyncIterator[AnyStr]:
+        """Downloads zone files concurrently and yields each path as soon as its zone finishes.
+
+        Args:
+            zone_file_list (List[AnyStr]): The zone file links to download.
+
+        Yields:
+            AnyStr: The path that each zone file was saved to, in completion order.
+        """
+        if Base.SAVE_PATH and not os.path.exists(Base.SAVE_PATH):
+            os.makedirs(Base.SAVE_PATH)
+        tasks = [asyncio.ensure_future(self._download_single_zone_file(link)) for link in zone_file_list]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def download(self, zone_file_list: AnyStr or List[AnyStr]) -> AnyStr or List[AnyStr]:
+        """Main method used to download zone files.
+
+        Args:
+            zone_file_list (AnyStr or List[AnyStr]): One or more zone file(s) to download.
+
+        Raises:
+            UnsupportedTypeError: Raised when a unsupported type is provided.
+
+        Returns:
+            AnyStr or List[AnyStr]: The path(s) that the zone file(s) were saved to.
+        """
+        if isinstance(zone_file_list, list):
+            return [path async for path in self.iter_download(zone_file_list)]
+        elif isinstance(zone_file_list, str):
+            return [path async for path in self.iter_download([zone_file_list])][0]
+        else:
+            self.__logger.critical(
+                "Unable to download. Unknown data structure provided to this method. %s", zone_file_list
+            )
+            raise UnsupportedTypeError("""Unknown data type. Should be 'list' or 'str'.""")
+
+
+class AsyncCZDS(Base):
+    """Asynchronous interface for ICAAN CZDS.
+
+    Example:
+        async with AsyncCZDS(username, password, save_directory) as czds:
+            async for path in czds.iter_zone():
+                print(path)
+    """
+
+    def __init__(self, username: AnyStr, password: AnyStr, save_directory: AnyStr, max_concurrency: int = 10) -> None:
+        """Sets the username and password for API authentication.
+
+        Args:
+            username (AnyStr): The username to access CZDS.
+            password (AnyStr): The password to access CZDS.
+            save_directory (AnyStr): The directory to save zone files to.
+            max_concurrency (int): The maximum number of zone files streamed at once. Defaults to 10.
+        """
+        Base.USERNAME = username
+        Base.PASSWORD = password
+        Base.SAVE_PATH = save_directory
+        configure_logging()
+        self.max_concurrency = max_concurrency
+        self.links: List[str] = []
+        self.connection: AsyncCZDSConnector = None
+
+    async def __aenter__(self) -> "AsyncCZDS":
+        """Opens the underlying connector.
+
+        Returns:
+            AsyncCZDS: This instance.
+        """
+        await self._connect()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Closes the underlying connector."""
+        await self.close()
+
+    async def _connect(self) -> AsyncCZDSConnector:
+        """Creates and opens the connector on first use.
+
+        Returns:
+            AsyncCZDSConnector: The open connector.
+        """
+        if self.connection is None:
+            self.connection = AsyncCZDSConnector(max_concurrency=self.max_concurrency)
+        await self.connection.open()
+        return self.connection
+
+    async def close(self) -> None:
+        """Closes the underlying connector."""
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+    async def list_links(self) -> List[str]:
+        """Returns a list of all CZDS Zone Link urls.
+
+        Returns:
+            List[str]: A list CZDS Zone Link urls.
+        """
+        connection = await self._connect()
+        if not self.links:
+            self.links = await connection._get_zone_links()
+        return self.links
+
+    async def iter_zone(self, link: AnyStr or List[AnyStr] = None) -> AsyncIterator[AnyStr]:
+        """Downloads one, several or all CZDS Zone Files, yielding each path as it finishes.
+
+        Args:
+            link (AnyStr or List[AnyStr]): One or more CZDS Zone Link URLs. Defaults to all available links.
+
+        Yields:
+            AnyStr: The path that each zone file was saved to, in completion order.
+        """
+        connection = await self._connect()
+        if link is None:
+            links = await self.list_links()
+        else:
+            links = link if isinstance(link, list) else [link]
+        async for path in connection.iter_download(links):
+            yield path
+
+    async def get_zone(self, link: AnyStr or List[AnyStr] = None) -> List[AnyStr]:
+        """Retrieves all or a single CZDS Zone File.
+
+        If you DO NOT provide a link, we will retrieve all available link files from your account.
+
+        Args:
+            link (AnyStr or List[AnyStr]): One or more CZDS Zone Link URLs. Defaults to None.
+
+        Returns:
+            List[AnyStr]: The paths the zone files were saved to, in completion order.
+        """
+        return [path async for path in self.iter_zone(link=link)]
@@ -0,0 +1,227 @@
+"""Access token cache.
+
+ICANN access tokens are JWTs valid for 24 hours, and the account API rate-limits
+authentication. `TokenCache` keeps one token per username in-process, and optionally in a
+JSON file (`Base.TOKEN_CACHE_PATH`) so separate runs share it too. Tokens are refreshed
+`REFRESH_MARGIN` seconds before the expiry in their `exp` claim.
+
+Each username has its own lock, so when many threads need a token at once only one of them
+authenticates and the rest reuse its result. A caller that had a token rejected passes it
+back as `stale_token`; if another thread already replaced it, the replacement is returned
+without authenticating again.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any
+from typing import AnyStr
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .base import Base
+
+
+def jwt_expiry(token: AnyStr) -> Optional[float]:
+    """Reads the expiry of a JWT without verifying its signature.
+
+    Args:
+        token (AnyStr): The JWT.
+
+    Returns:
+        Optional[float]: The `exp` claim as a Unix timestamp, or None when the token has none.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache(Base):
+    """Process-wide, optionally persistent, cache of access tokens keyed by username."""
+
+    # How long before expiry a token is replaced.
+    REFRESH_MARGIN: float = 3600.0
+    # The lifetime assumed for tokens that carry no expiry claim.
+    DEFAULT_LIFETIME: float = 24 * 3600.0
+
+    _entries: Dict[AnyStr, Dict[str, Any]] = {}
+    _locks: Dict[AnyStr, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _user_lock(cls, username: AnyStr) -> threading.Lock:
+        """Returns the lock that serializes authentication for a username.
+
+        Args:
+            username (AnyStr): The username.
+
+        Returns:
+            threading.Lock: The lock.
+        """
+        with cls._lock:
+            return cls._locks.setdefault(username, threading.Lock())
+
+    @staticmethod
+    def _disk_key(username: AnyStr) -> AnyStr:
+        """Returns the key a username is stored under on disk, so the file holds no usernames.
+
+        Args:
+            username (AnyStr): The username.
+
+        Returns:
+            AnyStr: The SHA-256 of the username.
+        """
+        return hashlib.sha256((username or "").encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _read_disk(cls) -> Dict[AnyStr, Dict[str, Any]]:
+        """Reads the token cache file.
+
+        Returns:
+            Dict[AnyStr, Dict[str, Any]]: The cached entries, or an empty dictionary when there are none.
+        """
+        if not Base.TOKEN_CACHE_PATH or not os.path.isfile(Base.TOKEN_CACHE_PATH):
+            return {}
+        try:
+            with open(Base.TOKEN_CACHE_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            cls.__logger.warning("Ignoring unreadable token cache '%s'. %s", Base.TOKEN_CACHE_PATH, e)
+            return {}
+
+    @classmethod
+    def _write_disk(cls, username: AnyStr, entry: Optional[Dict[str, Any]]) -> None:
+        """Atomically updates one username's entry in the token cache file, readable only by its owner.
+
+        Args:
+            username (AnyStr): The username.
+            entry (Optional[Dict[str, Any]]): The token and its expiry, or None to remove it.
+        """
+        if not Base.TOKEN_CACHE_PATH:
+            return
+        with cls._lock:
+            entries = cls._read_disk()
+            if entry is None:
+                entries.pop(cls._disk_key(username), None)
+            else:
+                entries[cls._disk_key(username)] = entry
+            temp_path = Base.TOKEN_CACHE_PATH + ".tmp"
+            with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, Base.TOKEN_CACHE_PATH)
+
+    @classmethod
+    def _is_fresh(cls, entry: Optional[Dict[str, Any]]) -> bool:
+        """Whether a cached entry can still be used without refreshing it.
+
+        Args:
+            entry (Optional[Dict[str, Any]]): The token and its expiry.
+
+        Returns:
+            bool: True when the token does not expire within REFRESH_MARGIN.
+        """
+        return bool(entry) and entry["expires_at"] - cls.REFRESH_MARGIN > time.time()
+
+    @classmethod
+    def _cached(cls, username: AnyStr, stale_token: AnyStr = None) -> Optional[Dict[str, Any]]:
+        """Returns a fresh cached entry for a username from memory, or failing that from disk.
+
+        The cache file is only read when memory holds no usable token.
+
+        Args:
+            username (AnyStr): The username.
+            stale_token (AnyStr): A token the server rejected, which must not be returned. Defaults to None.
+
+        Returns:
+            Optional[Dict[str, Any]]: The token and its expiry, or None when no cached token will do.
+        """
+        entry = cls._entries.get(username)
+        if cls._is_fresh(entry) and entry["token"] != stale_token:
+            return entry
+        entry = cls._read_disk().get(cls._disk_key(username))
+        if cls._is_fresh(entry) and entry["token"] != stale_token:
+            cls._entries[username] = entry
+            return entry
+        return None
+
+    @classmethod
+    def _store(cls, username: AnyStr, token: AnyStr) -> Dict[str, Any]:
+        """Caches a new token in memory and on disk.
+
+        Args:
+            username (AnyStr): The username.
+            token (AnyStr): The token.
+
+        Returns:
+            Dict[str, Any]: The token and its expiry.
+        """
+        entry = {"token": token, "expires_at": jwt_expiry(token) or time.time() + cls.DEFAULT_LIFETIME}
+        cls._entries[username] = entry
+        cls._write_disk(username, entry)
+        cls.__logger.debug("Cached a new access token.")
+        return entry
+
+    @classmethod
+    def get(
+        cls, username: AnyStr, authenticate: Callable[[], AnyStr], stale_token: AnyStr = None
+    ) -> Tuple[AnyStr, float]:
+        """Returns a usable token for a username, authenticating only when no cached token will do.
+
+        Args:
+            username (AnyStr): The username.
+            authenticate (Callable[[], AnyStr]): Called to obtain a new token.
+            stale_token (AnyStr): A token the server rejected, which must not be returned again. Defaults to None.
+
+        Returns:
+            Tuple[AnyStr, float]: The token and the time at which it should be refreshed.
+        """
+        with cls._user_lock(username):
+            entry = cls._cached(username, stale_token=stale_token) or cls._store(username, authenticate())
+            return entry["token"], entry["expires_at"] - cls.REFRESH_MARGIN
+
+    @classmethod
+    def peek(cls, username: AnyStr) -> Optional[AnyStr]:
+        """Returns a cached token that is not due for refresh, without authenticating.
+
+        This lets callers that authenticate asynchronously share the cache. It may take a lock and
+        read the cache file, so asynchronous callers should run it in a thread.
+
+        Args:
+            username (AnyStr): The username.
+
+        Returns:
+            Optional[AnyStr]: The token, or None when a new one is needed.
+        """
+        with cls._user_lock(username):
+            entry = cls._cached(username)
+            return entry["token"] if entry else None
+
+    @classmethod
+    def put(cls, username: AnyStr, token: AnyStr) -> None:
+        """Caches a token obtained by the caller.
+
+        Args:
+            username (AnyStr): The username.
+            token (AnyStr): The token.
+        """
+        with cls._user_lock(username):
+            cls._store(username, token)
+
+    @classmethod
+    def invalidate(cls, username: AnyStr) -> None:
+        """Forgets the cached token of a username, in memory and on disk.
+
+        Args:
+            username (AnyStr): The username.
+        """
+        with cls._user_lock(username):
+            cls._entries.pop(username, None)
+            cls._write_disk(username, None)
@@ -4,10 +4,10 @@ This Base class inherits from our LoggingBase metaclass and gives us
 shared logging across any class inheriting from Base.
 """
 
-import inspect
 import os
 from typing import Any
 from typing import AnyStr
+from typing import Dict
 from typing import List
 
 from .logger import LoggingBase
@@ -24,6 +24,21 @@ class Base(metaclass=LoggingBase):
     PASSWORD: AnyStr = None
     SAVE_PATH: AnyStr = None
     OUTPUT_FORMAT: AnyStr = None
+    RECORD_FILTER: Any = None
+    FORCE_DOWNLOAD: bool = False
+    CHUNK_SIZE: int = 1024 * 1024
+    PREALLOCATE: bool = False
+    BUILD_FILTERS: bool = False
+    TOKEN_CACHE_PATH: AnyStr = None
+    LINK_CACHE_TTL: float = 6 * 3600.0
+    MAX_RETRIES: int = 5
+    BACKOFF_FACTOR: float = 1.0
+    BACKOFF_MAX: float = 60.0
+    RATE_LIMIT: float = 20.0
+    RATE_BURST: int = 40
+    MAX_CONCURRENCY: int = os.cpu_count() * 5
+    MIN_CONCURRENCY: int = 1
+    METRICS: Any = None
 
     # We create a Connector object and set it to this class property in czds.py
     connection = None
@@ -32,63 +47,59 @@ class Base(metaclass=LoggingBase):
         chunk_size = max(1, chunk_size)
         return (items[i : i + chunk_size] for i in range(0, len(items), chunk_size))
 
-    def run_threaded(self, method: Any, list_data: List) -> List[str]:
+    def run_threaded(self, method: Any, list_data: List, sizes: Dict[Any, int] = None) -> List[Any]:
         """This method accepts a method and a list of data to run multi-threaded.
 
-        The provided list_data will be chunked into equal part lists per thread.
+        Items are queued one at a time and each worker pulls the next item as soon as it
+        finishes its current one, so a worker that draws a large zone never holds a backlog
+        of other zones hostage.
 
-        TODO: Add ability to configure number of threads by environmental variable and
-              via input paramater.
+        When sizes are provided, items are queued largest first (longest processing time
+        first scheduling). This starts the biggest zones, like `.com` and `.net`, immediately
+        so that the total wall-clock time approaches the time for the largest single zone
+        instead of the sum of whatever ended up in the unluckiest chunk.
 
-        The current configuration for how many threads are used is based on the following
-            `os.cpu_count() * 5`
-
-        We use the value from the above multiplication by calculating the value to chunk
-        the list data by.
-
-        This means, that we take the total count of items in the provided list and divide
-        it by the value from `os.cpu_count() * 5` which equates to 60 on my system.
-
-        For example, using a MacBook Pro 2018 15-inch with 2.6 GHz 6-Core Intel Core i7 and
-        16 GB 2400 MHz DDR4 results in 60 threads being created.
+        The number of worker threads is `THREAD_COUNT`, which defaults to `os.cpu_count() * 5`,
+        but never more threads than there are items.
 
         Args:
-            method (Any): The method to pass each chunk. This method should accept a List (but a smaller list).
-            list_data (List): The list data to chunk. Each chunk is passed to the provided method in it's own thread.
+            method (Any): The method to pass each item of list_data to.
+            list_data (List): The list data to process. Each item is passed to the provided method on its own.
+            sizes (Dict[Any, int]): An optional mapping of item to its expected size used to order the queue.
+                Items missing from the mapping are queued last. Defaults to None.
 
         Returns:
-            List[str]: A list of results.
+            List[Any]: A flat list with one result per item, in completion order.
         """
         from concurrent.futures import ThreadPoolExecutor
         from concurrent.futures import as_completed
 
-        threads = []
+        if sizes:
+            list_data = sorted(list_data, key=lambda item: sizes.get(item, -1), reverse=True)
         return_list = []
-        self.__logger.info(f"Chunking data and running {self.THREAD_COUNT} threads.")
-        zone_chunks = self._chunk(list_data, int(len(list_data) / self.THREAD_COUNT))
-        with ThreadPoolExecutor(max_workers=self.THREAD_COUNT) as executor:
-            for chunk in zone_chunks:
-                threads.append(executor.submit(method, chunk))
-            count = 0
-            for task in as_completed(threads):
+        if not list_data:
+            return return_list
+        worker_count = max(1, min(self.THREAD_COUNT, len(list_data)))
+        if Base.METRICS is not None:
+            method = Base.METRICS.queued(method, len(list_data))
+        self.__logger.info("Queueing %d items across %d threads.", len(list_data), worker_count)
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            tasks = [executor.submit(method, item) for item in list_data]
+            for count, task in enumerate(as_completed(tasks), start=1):
                 return_list.append(task.result())
-                count += 1
-                self.__logger.info(f"Retrieved results from {count} threads.")
+                self.__logger.debug("Retrieved results for %d of %d items.", count, len(tasks))
         return return_list
 
-    def log(self, message: AnyStr, level: AnyStr = "info") -> None:
+    def log(self, message: AnyStr, level: AnyStr = "info", *args: Any) -> None:
         """Used to centralize logging across components.
 
-        We identify the source of the logging class by inspecting the calling stack.
+        The message is logged by the logger of the instance's class, which the LoggingBase
+        metaclass bound when the class was created.
 
         Args:
-            message (AnyStr): The log value string to output.
+            message (AnyStr): The log message, with `%` placeholders for any args.
             level (AnyStr): The log level. Defaults to "info".
+            *args (Any): Values for the placeholders, only formatted when the level is enabled.
         """
-        component = None
-        parent = inspect.stack()[1][0].f_locals.get("self", None)
-        component = parent.__class__.__name__
-        try:
-            getattr(getattr(parent, f"_{component}__logger"), level)(message)
-        except AttributeError as ae:
-            getattr(self.__logger, level)(message + ae)
+        logger = getattr(self, f"_{type(self).__name__}__logger", self.__logger)
+        getattr(logger, level)(message, *args)
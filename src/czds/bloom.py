@@ -0,0 +1,415 @@
+"""Compact per-zone membership filters.
+
+Checking whether millions of candidate domains exist does not need a full index: a Bloom
+filter answers "definitely not registered" or "probably registered" in a few bytes per name.
+A filter is built for each zone as its file streams in and saved next to it as
+`<zone>.bloom`; `contains_many` then routes each candidate to the filter of its TLD.
+
+Filters hold lowercase owner names without the trailing dot. Each name is hashed once with
+128-bit BLAKE2b: one half of the digest picks a 64-bit word of the filter and the other
+picks which bits of that word the name sets, so a lookup is one hash and one word test.
+
+A filter is sized up front from the compressed size of the zone, because the number of
+names is only known once the whole zone was read. When a zone holds more names than
+estimated, the false positive rate rises above the target and a warning is logged.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import AnyStr
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from .base import Base
+from .stream import LineAssembler
+from .stream import is_compressed
+from .stream import zone_name_from_path
+
+
+def filter_path(directory: AnyStr, zone_name: AnyStr) -> AnyStr:
+    """Returns where the filter of a zone is saved.
+
+    Args:
+        directory (AnyStr): The directory zone files are saved to.
+        zone_name (AnyStr): The zone name.
+
+    Returns:
+        AnyStr: The path `<directory>/<zone>.bloom`.
+    """
+    return os.path.join(directory, zone_name + BloomFilter.EXTENSION)
+
+
+class BloomFilter(Base):
+    """A register-blocked Bloom filter over domain names.
+
+    Every name maps to a single 64-bit word and sets a fixed pattern of `hashes` bits in it,
+    taken from a table of 65536 precomputed masks. A lookup is then one hash, one word load
+    and one comparison instead of a bit test per hash function, which matters when the
+    loop runs in Python. Blocking costs a few more bits per name than a classic Bloom filter
+    for the same false positive rate; the filter is sized for that.
+    """
+
+    EXTENSION: AnyStr = ".bloom"
+    MAGIC: bytes = b"CZDSBLK1"
+    # Magic, number of words, number of bits per mask and number of names added.
+    HEADER = struct.Struct("<8sQIQ")
+
+    _masks: Dict[int, List[int]] = {}
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """Creates an empty filter sized for capacity names at the target false positive rate.
+
+        Args:
+            capacity (int): The number of names the filter is sized for.
+            error_rate (float): The target false positive rate. Defaults to 0.001.
+        """
+        capacity = max(1, capacity)
+        words, hashes = self._size(capacity, error_rate)
+        self._setup(words, hashes, count=0)
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+    def _setup(self, words: int, hashes: int, count: int, data: bytes = None) -> None:
+        """Allocates the words of the filter and looks up its mask table.
+
+        Args:
+            words (int): The number of 64-bit words.
+            hashes (int): The number of bits set per name.
+            count (int): The number of names already added.
+            data (bytes): The little-endian words to load. Defaults to all zero.
+        """
+        self.words = array("Q", data if data is not None else bytes(8 * words))
+        if data is not None and sys.byteorder == "big":
+            self.words.byteswap()
+        self.hashes = hashes
+        self.count = count
+        self.masks = self._mask_table(hashes)
+
+    @classmethod
+    def _mask_table(cls, hashes: int) -> List[int]:
+        """Returns the 65536 word masks with hashes bits set, derived deterministically.
+
+        Args:
+            hashes (int): The number of bits set per mask.
+
+        Returns:
+            List[int]: The masks.
+        """
+        if hashes not in cls._masks:
+            masks = []
+            for index in range(1 << 16):
+                mask = 0
+                digest = hashlib.blake2b(index.to_bytes(2, "little"), digest_size=64, person=b"czds-bloom").digest()
+                for byte in digest:
+                    mask |= 1 << (byte & 63)
+                    if bin(mask).count("1") == hashes:
+                        break
+                masks.append(mask)
+            cls._masks[hashes] = masks
+        return cls._masks[hashes]
+
+    @staticmethod
+    def _false_positive_rate(names_per_word: float, hashes: int) -> float:
+        """Returns the false positive rate of a blocked filter with a given average load.
+
+        The number of names per word follows a Poisson distribution, so the rate is averaged
+        over word loads rather than computed from the mean fill.
+
+        Args:
+            names_per_word (float): The average number of names per word.
+            hashes (int): The number of bits set per name.
+
+        Returns:
+            float: The expected false positive rate.
+        """
+        rate = 0.0
+        probability = math.exp(-names_per_word)
+        for load in range(int(names_per_word + 10 * math.sqrt(names_per_word) + 20)):
+            if load:
+                probability *= names_per_word / load
+            rate += probability * (1 - (1 - hashes / 64) ** load) ** hashes
+        return rate
+
+    @classmethod
+    def _size(cls, capacity: int, error_rate: float) -> tuple:
+        """Finds the fewest words, and the bits per name for them, that meet the target rate.
+
+        Args:
+            capacity (int): The number of names the filter is sized for.
+            error_rate (float): The target false positive rate.
+
+        Returns:
+            tuple: The number of words and the number of bits set per name.
+        """
+        hashes = 16
+        for bits_per_name in range(4, 65):
+            rates = {k: cls._false_positive_rate(64 / bits_per_name, k) for k in range(1, 17)}
+            hashes = min(rates, key=rates.get)
+            if rates[hashes] <= error_rate:
+                break
+        return max(1, math.ceil(capacity * bits_per_name / 64)), hashes
+
+    @staticmethod
+    def _key(name: AnyStr) -> int:
+        """Hashes a name to the 128-bit integer its word and mask are derived from.
+
+        Args:
+            name (AnyStr): The domain name.
+
+        Returns:
+            int: The hash.
+        """
+        digest = hashlib.blake2b(name.rstrip(".").lower().encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest, "little")
+
+    def add(self, name: AnyStr) -> None:
+        """Adds a name to the filter.
+
+        Args:
+            name (AnyStr): The domain name.
+        """
+        key = self._key(name)
+        self.words[key % len(self.words)] |= self.masks[(key >> 64) & 0xFFFF]
+        self.count += 1
+
+    def add_many(self, names: Iterable[AnyStr]) -> None:
+        """Adds many names to the filter.
+
+        Args:
+            names (Iterable[AnyStr]): The domain names.
+        """
+        for name in names:
+            self.add(name)
+
+    def contains_many(self, names: Iterable[AnyStr]) -> List[bool]:
+        """Checks many names against the filter.
+
+        Args:
+            names (Iterable[AnyStr]): The domain names.
+
+        Returns:
+            List[bool]: For each name, False when it is definitely absent and True when it is probably present.
+        """
+        key_of = self._key
+        words, masks, size = self.words, self.masks, len(self.words)
+        results = []
+        append = results.append
+        for name in names:
+            key = key_of(name)
+            mask = masks[(key >> 64) & 0xFFFF]
+            append(words[key % size] & mask == mask)
+        return results
+
+    def __contains__(self, name: AnyStr) -> bool:
+        """Checks a name against the filter.
+
+        Args:
+            name (AnyStr): The domain name.
+
+        Returns:
+            bool: False when the name is definitely absent, True when it is probably present.
+        """
+        return self.contains_many([name])[0]
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the filter's words.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return 8 * len(self.words)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """The false positive rate expected for the number of names added so far.
+
+        Returns:
+            float: The probability that an absent name is reported as present.
+        """
+        return self._false_positive_rate(self.count / len(self.words), self.hashes)
+
+    def save(self, path: AnyStr) -> None:
+        """Atomically writes the filter to a file.
+
+        Args:
+            path (AnyStr): The destination file.
+        """
+        words = self.words
+        if sys.byteorder == "big":
+            words = array("Q", words)
+            words.byteswap()
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, len(words), self.hashes, self.count))
+            f.write(words.tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: AnyStr) -> "BloomFilter":
+        """Reads a filter written by `save`.
+
+        Args:
+            path (AnyStr): The filter file.
+
+        Raises:
+            ValueError: Raises when the file is not a filter.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        with open(path, "rb") as f:
+            magic, words, hashes, count = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            if magic != cls.MAGIC:
+                raise ValueError(f"'{path}' is not a czds Bloom filter.")
+            bloom = cls.__new__(cls)
+            bloom._setup(words, hashes, count=count, data=f.read(8 * words))
+        bloom.capacity = count
+        bloom.error_rate = bloom.estimated_error_rate
+        return bloom
+
+
+class ZoneFilterBuilder(Base):
+    """Builds the filter of a zone from its gzip compressed bytes as they are downloaded."""
+
+    # Roughly how many compressed zone file bytes each distinct owner name takes. Used to
+    # size the filter before the zone has been read; erring low over-provisions the filter.
+    BYTES_PER_NAME: int = 24
+    # The same estimate for uncompressed zone files.
+    TEXT_BYTES_PER_NAME: int = 120
+
+    def __init__(self, zone_name: AnyStr, size: int = None, compressed: bool = True, error_rate: float = 0.001) -> None:
+        """Creates an empty filter sized from the size of the zone file.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+            size (int): The size of the zone file in bytes, when known. Defaults to None.
+            compressed (bool): Whether the bytes fed in are gzip compressed. Defaults to True.
+            error_rate (float): The target false positive rate. Defaults to 0.001.
+        """
+        self.zone_name = zone_name
+        self.compressed = compressed
+        per_name = self.BYTES_PER_NAME if compressed else self.TEXT_BYTES_PER_NAME
+        self.filter = BloomFilter(max(1024, (size or 0) // per_name), error_rate=error_rate)
+        self._decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self._lines = LineAssembler()
+        self._last_name = None
+
+    def _decompress(self, data: bytes) -> bytes:
+        """Decompresses the next block of the zone, following concatenated gzip members.
+
+        Args:
+            data (bytes): The next compressed block.
+
+        Returns:
+            bytes: The decompressed data.
+        """
+        output = [self._decompressor.decompress(data)]
+        while self._decompressor.eof:
+            unused = self._decompressor.unused_data
+            if not unused.strip(b"\x00"):
+                break
+            self._decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            output.append(self._decompressor.decompress(unused))
+        return b"".join(output)
+
+    def _add_lines(self, lines: List[AnyStr]) -> None:
+        """Adds the owner name of each record line, once per run of records of the same name.
+
+        Args:
+            lines (List[AnyStr]): Complete zone file lines.
+        """
+        add = self.filter.add
+        last_name = self._last_name
+        for line in lines:
+            if line[0] in ";$":
+                continue
+            name = line.split(None, 1)[0]
+            if name != last_name:
+                add(name)
+                last_name = name
+        self._last_name = last_name
+
+    def feed(self, data: bytes) -> None:
+        """Adds the names in the next block of the zone file.
+
+        Args:
+            data (bytes): The next block, as written to disk.
+        """
+        if self.compressed:
+            data = self._decompress(data)
+        self.feed_text(data)
+
+    def feed_text(self, data: bytes) -> None:
+        """Adds the names in the next block of the zone file after it was decompressed elsewhere.
+
+        Args:
+            data (bytes): The next block of uncompressed zone file text.
+        """
+        self._add_lines(self._lines.feed(data))
+
+    def finish(self) -> BloomFilter:
+        """Adds the names left in the final partial line and returns the filter.
+
+        Returns:
+            BloomFilter: The filter.
+        """
+        self._add_lines(self._lines.flush())
+        if self.filter.count > self.filter.capacity:
+            self.__logger.warning(
+                "Zone '%s' held %d names, more than the %d its filter was sized for. "
+                "Its false positive rate is about %.4f.",
+                self.zone_name,
+                self.filter.count,
+                self.filter.capacity,
+                self.filter.estimated_error_rate,
+            )
+        return self.filter
+
+    def save(self, directory: AnyStr) -> AnyStr:
+        """Finishes the filter and saves it next to the zone file.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+
+        Returns:
+            AnyStr: The path of the filter.
+        """
+        path = filter_path(directory, self.zone_name)
+        self.finish().save(path)
+        self.__logger.info("Saved a filter of %d names for zone '%s' to '%s'.", self.filter.count, self.zone_name, path)
+        return path
+
+    def feed_file(self, fileobj: BinaryIO) -> None:
+        """Adds every name in a zone file.
+
+        Args:
+            fileobj (BinaryIO): The zone file, opened in binary mode.
+        """
+        for block in iter(lambda: fileobj.read(Base.CHUNK_SIZE), b""):
+            self.feed(block)
+
+
+def build_zone_filter(path: AnyStr, error_rate: float = 0.001) -> AnyStr:
+    """Builds and saves the filter of a zone file that is already on disk.
+
+    Args:
+        path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+        error_rate (float): The target false positive rate. Defaults to 0.001.
+
+    Returns:
+        AnyStr: The path of the filter.
+    """
+    with open(path, "rb") as f:
+        builder = ZoneFilterBuilder(
+            zone_name_from_path(path), size=os.path.getsize(path), compressed=is_compressed(f), error_rate=error_rate
+        )
+        builder.feed_file(f)
+    return builder.save(os.path.dirname(path))
@@ -0,0 +1,152 @@
+"""Cached catalog of the zone file links available to an account.
+
+Listing links and checking the size and age of ~1,100 zones costs one request per zone.
+`LinkCatalog` fetches the link list once, enriches every link with the size, Last-Modified
+and ETag from a concurrent HEAD request, and keeps the result in `.czds-links.json` next to
+the zone files for `Base.LINK_CACHE_TTL` seconds. Planning a sync, scheduling zones largest
+first or skipping zones that have not changed since a given date, is then one file read.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from .base import Base
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Converts a timestamp, ISO 8601 string, HTTP date or datetime to an aware datetime.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Optional[datetime]: The datetime in UTC, or None when value is empty or cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            parsed = datetime.fromtimestamp(value, tz=timezone.utc)
+        elif isinstance(value, datetime):
+            parsed = value
+        else:
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                from email.utils import parsedate_to_datetime
+
+                parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class LinkCatalog(Base):
+    """Zone file links with their HEAD metadata, cached on disk with a TTL."""
+
+    FILENAME: AnyStr = ".czds-links.json"
+
+    def __init__(self, directory: AnyStr = None) -> None:
+        """Loads the catalog saved in a directory.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to. Defaults to keeping the catalog in memory.
+        """
+        self.path = os.path.join(directory, self.FILENAME) if directory else None
+        self._lock = threading.Lock()
+        self.fetched_at: float = 0.0
+        self.entries: Dict[AnyStr, Dict[str, Any]] = {}
+        self._read_from_disk()
+
+    def _read_from_disk(self) -> None:
+        """Reads the catalog file, leaving the catalog empty when it is missing or unreadable."""
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self.fetched_at, self.entries = data["fetched_at"], data["links"]
+        except (OSError, ValueError, KeyError) as e:
+            self.__logger.warning("Ignoring unreadable link catalog '%s'. %s", self.path, e)
+
+    def _save_to_disk(self) -> None:
+        """Atomically writes the catalog file."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"fetched_at": self.fetched_at, "links": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the catalog was fetched within the last `Base.LINK_CACHE_TTL` seconds.
+
+        Returns:
+            bool: True when the catalog can be used without refreshing it.
+        """
+        return bool(self.entries) and time.time() - self.fetched_at < Base.LINK_CACHE_TTL
+
+    def refresh(self, connector: Any, metadata: bool = True) -> None:
+        """Fetches the link list and, concurrently, the HEAD metadata of every link.
+
+        Args:
+            connector (Any): An authenticated CZDSConnector.
+            metadata (bool): Whether to send a HEAD request per link. Defaults to True.
+        """
+        links = connector._get_zone_links()
+        entries = {link: {"zone": connector._zone_name(link)} for link in links}
+        if metadata and links:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max(1, min(Base.THREAD_COUNT, len(links)))) as executor:
+                for link, zone_metadata in zip(links, executor.map(connector.get_zone_metadata, links)):
+                    entries[link].update(zone_metadata)
+        with self._lock:
+            self.entries = entries
+            self.fetched_at = time.time()
+            self._save_to_disk()
+        self.__logger.info("Cached %d zone file links.", len(links))
+
+    def links(self, tlds: Iterable[AnyStr] = None, modified_since: Any = None) -> List[AnyStr]:
+        """Returns the cached links, optionally filtered.
+
+        Args:
+            tlds (Iterable[AnyStr]): Only return links of these zones, such as ['com', 'net']. Defaults to all zones.
+            modified_since (Any): Only return zones whose Last-Modified is after this datetime, timestamp or
+                ISO 8601 string. Zones with an unknown Last-Modified are always returned. Defaults to None.
+
+        Returns:
+            List[AnyStr]: The matching links, in catalog order.
+        """
+        wanted = {tld.lower().strip(".") for tld in tlds} if tlds else None
+        since = _as_datetime(modified_since)
+        links = []
+        for link, entry in self.entries.items():
+            if wanted is not None and entry["zone"].lower() not in wanted:
+                continue
+            if since is not None:
+                last_modified = _as_datetime(entry.get("last_modified"))
+                if last_modified is not None and last_modified <= since:
+                    continue
+            links.append(link)
+        return links
+
+    def sizes(self) -> Dict[AnyStr, int]:
+        """Returns the size of each cached link, for largest first scheduling.
+
+        Returns:
+            Dict[AnyStr, int]: The size in bytes keyed by link, -1 when unknown.
+        """
+        return {link: entry.get("size", -1) for link, entry in self.entries.items()}
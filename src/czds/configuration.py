@@ -3,15 +3,14 @@
 import json
 import os
 from string import Template
+from typing import Any
 from typing import AnyStr
 from typing import Dict
 
-import yaml
 from attrs import asdict
 from attrs import define
 from attrs import field
 from attrs import fields
-from prompt_toolkit import PromptSession
 
 from .base import Base
 
@@ -37,23 +36,36 @@ class Authorization:
     api_version: AnyStr = "2022-11-01"
 
 
+@define
+class RateLimit:
+    """Contains settings for rate limiting CZDS API calls. Unset values fall back to the defaults on Base."""
+
+    requests_per_second: float = None
+    burst: int = None
+    max_concurrency: int = None
+    min_concurrency: int = None
+
+
 @define
 class Configuration:
     """The main configuration data model."""
 
     authorization: Authorization = field(factory=Authorization)
+    rate_limit: RateLimit = field(factory=RateLimit)
 
     def __attrs_post_init__(self):
         """Casting data objects to their correct type during initialization."""
         if self.authorization:
             self.authorization = Authorization(**self.authorization)
+        if isinstance(self.rate_limit, dict):
+            self.rate_limit = RateLimit(**self.rate_limit)
 
 
 class ConfigurationManager(Base):
     """The main class used to manage retreiving and saving configuration files from disk."""
 
     CONFIG_PATH = "~/.config/czds.yml"
-    session = PromptSession()
+    _session = None
 
     def __init__(self) -> None:
         """Determines if configuration file exists or not."""
@@ -61,6 +73,19 @@ class ConfigurationManager(Base):
         if not os.path.exists(self.config_path):
             self._save_to_disk(path=self.config_path, data=self._prompt())
 
+    @property
+    def session(self) -> Any:
+        """The prompt session used to ask for configuration values, created on first use.
+
+        Returns:
+            Any: The prompt_toolkit PromptSession.
+        """
+        if ConfigurationManager._session is None:
+            from prompt_toolkit import PromptSession
+
+            ConfigurationManager._session = PromptSession()
+        return ConfigurationManager._session
+
     def _prompt(self) -> Dict[str, str]:
         """Prompts the user to enter values for the defined services in our Configuration data model.
 
@@ -104,11 +129,13 @@ class ConfigurationManager(Base):
                     if path.endswith(".json"):
                         return json.load(f)
                     elif path.endswith(".yml") or path.endswith(".yaml"):
+                        import yaml
+
                         return yaml.load(f, Loader=yaml.SafeLoader)
                     else:
                         raise FileNotFoundError(f"The provided path value '{path}' is not one of '.yml'.")
             except Exception as e:
-                self.__logger.warning(f"The provided config file {path} is not in the correct format. {e}")
+                self.__logger.warning("The provided config file %s is not in the correct format. %s", path, e)
         elif os.path.isdir(path):
             raise IsADirectoryError(f"The provided path is a directory and must be a file: {path}")
 
@@ -136,6 +163,8 @@ class ConfigurationManager(Base):
                 if path.endswith(".json"):
                     json.dump(data, f)
                 elif path.endswith(".yml") or path.endswith(".yaml"):
+                    import yaml
+
                     yaml.dump(data, f)
                 else:
                     raise FileNotFoundError(f"The provided path value '{path}' is not one of '.yml'.")
@@ -1,67 +1,142 @@
 """Main connector class."""
 
-import cgi
 import json
 import os
-import zlib
+import threading
+import time
+from email.message import Message
 from typing import Any
 from typing import AnyStr
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 
 from requests import Response
 from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import HTTPError
+from requests.exceptions import Timeout
+from urllib3.exceptions import ProtocolError
 
+from .auth import TokenCache
 from .base import Base
+from .bloom import ZoneFilterBuilder
+from .bloom import build_zone_filter
+from .bloom import filter_path
 from .exceptions import CZDSConnectionError
+from .exceptions import IncompleteDownloadError
 from .exceptions import UnsupportedTypeError
+from .export import ROW_GROUP_SIZE
+from .export import WRITERS
+from .export import export_batches
+from .export import export_path
+from .filtering import RecordFilter
+from .manifest import Manifest
+from .models import ZoneBatch
+from .parser import parse_line
+from .ratelimit import RateLimiter
+from .ratelimit import parse_retry_after
+from .resume import PartialDownload
+from .stream import TeeReader
+from .stream import iter_batches
+from .stream import iter_lines
+from .stream import iter_zone_data
 
 
 class CZDSConnector(Base):
     """Main CZDS connection classself.
 
     All API Calls go through this class.
+
+    Every connector instance shares a single pooled `requests.Session` so that the
+    authentication POST and all zone downloads reuse keep-alive connections to
+    czds-api.icann.org and account-api.icann.org instead of paying for a new TCP and
+    TLS handshake on every request.
     """
 
+    # One pool each for the CZDS and account APIs, with headroom for redirect targets.
+    POOL_CONNECTIONS: int = 4
+    RETRY_STATUS_CODES: tuple = (429, 500, 502, 503, 504)
+
+    _session: Session = None
+    _session_pool_size: int = 0
+    _session_lock = threading.Lock()
+
+    # When the access token should be refreshed, or None when it was set by hand.
+    token_refresh_at: float = None
+
     def __init__(self) -> None:
-        """Creates a credential property and retrieves our access token from authenticationself."""
+        """Creates a credential property and retrieves our access token, reusing a cached one when possible."""
         self.credential: dict = {"username": Base.USERNAME, "password": Base.PASSWORD}
         self.token = self.get_token()
 
-    def _parse_line(self, line: AnyStr) -> Dict[str, str]:
+    @classmethod
+    def get_session(cls) -> Session:
+        """Returns the shared, thread-safe pooled session used for all HTTP requests.
+
+        The session is created lazily on first use. The connection pool size follows
+        `Base.THREAD_COUNT` so that every worker in `Base.run_threaded` can hold its own
+        keep-alive connection; if `THREAD_COUNT` changes the adapter is remounted.
+
+        Returns:
+            Session: The shared requests Session.
+        """
+        if cls._session is None or cls._session_pool_size != Base.THREAD_COUNT:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = Session()
+                if cls._session_pool_size != Base.THREAD_COUNT:
+                    adapter = HTTPAdapter(pool_connections=cls.POOL_CONNECTIONS, pool_maxsize=Base.THREAD_COUNT)
+                    cls._session.mount("https://", adapter)
+                    cls._session.mount("http://", adapter)
+                    cls._session_pool_size = Base.THREAD_COUNT
+        return cls._session
+
+    @classmethod
+    def close_session(cls) -> None:
+        """Closes the shared session and all of its pooled connections."""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+            cls._session_pool_size = 0
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Dict[str, int]]:
+        """Returns connection reuse counters for each host in the shared connection pool.
+
+        Returns:
+            Dict[str, Dict[str, int]]: A dictionary keyed by host containing the number of
+                requests made, new connections opened and connections reused.
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        if cls._session is None:
+            return stats
+        adapters = {id(adapter): adapter for adapter in cls._session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                host = stats.setdefault(pool.host, {"requests": 0, "new_connections": 0, "reused_connections": 0})
+                host["requests"] += pool.num_requests
+                host["new_connections"] += pool.num_connections
+                host["reused_connections"] += max(0, pool.num_requests - pool.num_connections)
+        return stats
+
+    @staticmethod
+    def _parse_line(line: AnyStr) -> Optional[Dict[str, str]]:
         """Parses a line from a zone file into a dictionary.
 
         Args:
             line (AnyStr): A line from a zone file.
 
         Returns:
-            Dict[str, str]: A dictionary of the line.
-        """
-        count = 1
-        zone_dict = {}
-        record_data_list = []
-        for item in line.split():
-            if count == 1:
-                zone_dict["dns_record"] = item.rstrip(".")
-            elif count == 2:
-                try:
-                    int(item)
-                    zone_dict["ttl"] = item
-                except Exception as e:
-                    zone_dict["record_class"] = item
-            elif count == 3:
-                if zone_dict.get("record_class"):
-                    zone_dict["ttl"] = item
-                else:
-                    zone_dict["record_class"] = item
-            elif count == 4:
-                zone_dict["record_type"] = item
-            else:
-                record_data_list.append(item)
-            count += 1
-        zone_dict["record_data"] = " ".join(record_data_list)
-        return zone_dict
+            Optional[Dict[str, str]]: A dictionary of the line, or None for comments and directives.
+        """
+        return parse_line(line)
 
     def _request(
         self,
@@ -73,6 +148,12 @@ class CZDSConnector(Base):
     ) -> Response:
         """Main method to make all HTTP requests.
 
+        Connection errors and 429/5xx responses are retried up to `Base.MAX_RETRIES` times
+        with exponential backoff, honouring any Retry-After header the server sends.
+
+        Every attempt first waits its turn on the shared `RateLimiter`, and reports the
+        response status back to it so concurrency shrinks when the server pushes back.
+
         Args:
             url (AnyStr): The URL to send the request to.
             method (AnyStr): The HTTP method to use. Defaults to "GET".
@@ -86,7 +167,47 @@ class CZDSConnector(Base):
         Returns:
             Response: The requests Response object.
         """
-        response = Session().request(method=method, url=url, headers=headers, data=data, stream=stream)
+        limiter = RateLimiter.shared()
+        metrics = Base.METRICS
+        attempt = 0
+        while True:
+            limiter.wait()
+            start = time.perf_counter()
+            try:
+                response = self.get_session().request(method=method, url=url, headers=headers, data=data, stream=stream)
+            except (RequestsConnectionError, Timeout) as error:
+                attempt += 1
+                if attempt > Base.MAX_RETRIES:
+                    raise
+                self._wait_before_retry(attempt=attempt, url=url, reason=str(error))
+                continue
+            limiter.feedback(response.status_code, retry_after=response.headers.get("retry-after"))
+            if metrics is not None:
+                metrics.set("time_to_first_byte_seconds", time.perf_counter() - start)
+                metrics.set("status", response.status_code)
+            if response.status_code in self.RETRY_STATUS_CODES and attempt < Base.MAX_RETRIES:
+                attempt += 1
+                response.close()
+                self._wait_before_retry(
+                    attempt=attempt,
+                    url=url,
+                    reason=f"HTTP {response.status_code}",
+                    retry_after=response.headers.get("retry-after"),
+                )
+                continue
+            break
+        self._raise_for_status(response)
+        return response
+
+    def _raise_for_status(self, response: Response) -> None:
+        """Maps HTTP error responses onto our CZDSConnectionError.
+
+        Args:
+            response (Response): The requests Response object.
+
+        Raises:
+            CZDSConnectionError: Raises when a connection error occurs.
+        """
         try:
             response.raise_for_status()
         except HTTPError as error:
@@ -94,35 +215,98 @@ class CZDSConnector(Base):
                 raise CZDSConnectionError(status_code=error.response.status_code, name="InvalidURL", http_error=error)
             elif error.response.status_code == 401:
                 raise CZDSConnectionError(status_code=401, name="InvalidAuthentication", http_error=error)
+            elif error.response.status_code == 429:
+                raise CZDSConnectionError(status_code=429, name="TooManyRequests", http_error=error)
             elif error.response.status_code == 500:
                 raise CZDSConnectionError(status_code=500, name="InternalServerError", http_error=error)
             else:
                 raise CZDSConnectionError(status_code=error.response.status_code, name="UnknownError", http_error=error)
-        return response
 
-    def get_token(self) -> AnyStr:
-        """Authenticates and retrieves access token for all other API calls.
+    def _wait_before_retry(self, attempt: int, url: AnyStr, reason: AnyStr, retry_after: AnyStr = None) -> None:
+        """Sleeps before retrying a request using exponential backoff or the server's Retry-After.
+
+        Args:
+            attempt (int): The number of the retry about to be made, starting at 1.
+            url (AnyStr): The URL being retried.
+            reason (AnyStr): Why the request is being retried.
+            retry_after (AnyStr): The Retry-After header sent by the server. Defaults to None.
+        """
+        delay = min(Base.BACKOFF_MAX, Base.BACKOFF_FACTOR * 2 ** (attempt - 1))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            delay = min(Base.BACKOFF_MAX, server_delay)
+        self.__logger.warning(
+            "Request to '%s' failed (%s), retry %d of %d in %.1fs.", url, reason, attempt, Base.MAX_RETRIES, delay
+        )
+        if Base.METRICS is not None:
+            Base.METRICS.add("retries", 1)
+        time.sleep(delay)
+
+    def _authenticate(self) -> AnyStr:
+        """Authenticates against the account API.
 
         Returns:
-            AnyStr: An access token.
+            AnyStr: A new access token.
         """
         return self._request(
             method="POST", url=self.AUTH_URL, data=json.dumps(self.credential), headers=self.BASE_HEADERS
         ).json()["accessToken"]
 
-    def _get(self, url: AnyStr) -> Response:
+    def get_token(self, stale_token: AnyStr = None) -> AnyStr:
+        """Retrieves the access token for all other API calls.
+
+        Tokens are shared through the TokenCache, so only the first connector for a username
+        authenticates and later ones reuse its token until shortly before it expires.
+
+        Args:
+            stale_token (AnyStr): A token the server rejected, forcing a new one. Defaults to None.
+
+        Returns:
+            AnyStr: An access token.
+        """
+        token, self.token_refresh_at = TokenCache.get(
+            self.credential["username"], self._authenticate, stale_token=stale_token
+        )
+        return token
+
+    def _get(self, url: AnyStr, headers: Dict[str, str] = None) -> Response:
         """This method is used to make all calls to CZDS.
 
+        The token is refreshed ahead of its expiry, and a request rejected with 401 is retried
+        once with a new token.
+
         Args:
             url (AnyStr): The URL to make the request against.
+            headers (Dict[str, str], optional): Additional headers to send with the request. Defaults to None.
+
+        Raises:
+            CZDSConnectionError: Raises when the request fails, or is rejected again after re-authenticating.
 
         Returns:
             Response: A requests.Response object.
         """
-        headers = Base.BASE_HEADERS
-        headers.update({"Authorization": f"Bearer {self.token}"})
-        self.__logger.debug(f"Making request to '{url}'.")
-        return self._request(url=url, headers=headers, stream=True)
+        if self.token_refresh_at is not None and time.time() >= self.token_refresh_at:
+            self.token = self.get_token()
+        self.__logger.debug("Making request to '%s'.", url)
+        try:
+            return self._request(url=url, headers=self._headers(headers), stream=True)
+        except CZDSConnectionError as error:
+            if error.status_code != 401 or self.token_refresh_at is None:
+                raise
+        self.__logger.info("Access token was rejected, re-authenticating.")
+        self.token = self.get_token(stale_token=self.token)
+        return self._request(url=url, headers=self._headers(headers), stream=True)
+
+    def _headers(self, headers: Dict[str, str] = None) -> Dict[str, str]:
+        """Returns the headers of an authenticated request.
+
+        Args:
+            headers (Dict[str, str], optional): Additional headers to send with the request. Defaults to None.
+
+        Returns:
+            Dict[str, str]: The base headers, the authorization header and the additional headers.
+        """
+        return {**Base.BASE_HEADERS, "Authorization": f"Bearer {self.token}", **(headers or {})}
 
     def _get_zone_links(self) -> List[str]:
         """Retrieves all available CZDS zone file links.
@@ -133,66 +317,356 @@ class CZDSConnector(Base):
         links_url = self.BASE_URL + "/czds/downloads/links"
         return self._get(links_url).json()
 
-    def _output_to_disk(self, response: Response, file_path: AnyStr) -> None:
+    def _zone_name(self, zone_file_link: AnyStr) -> AnyStr:
+        """Returns the TLD a zone file link refers to.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file link like `.../czds/downloads/<tld>.zone`.
+
+        Returns:
+            AnyStr: The zone name.
+        """
+        return zone_file_link.rsplit("/", 1)[-1].rsplit(".")[-2]
+
+    def get_zone_metadata(self, zone_file_link: AnyStr) -> Dict[str, Any]:
+        """Retrieves the size and validators of a zone file with a HEAD request.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file link.
+
+        Returns:
+            Dict[str, Any]: The `size` in bytes (-1 when unknown), `last_modified` and `etag` of the zone file.
+        """
+        try:
+            response = self._request(url=zone_file_link, method="HEAD", headers=self._headers())
+        except CZDSConnectionError:
+            return {"size": -1, "last_modified": None, "etag": None}
+        return {
+            "size": int(response.headers.get("content-length", -1)),
+            "last_modified": response.headers.get("last-modified"),
+            "etag": response.headers.get("etag"),
+        }
+
+    def _record_output(self, response: Response, **values: float) -> None:
+        """Reports the bytes a response transferred, and any other values, to `Base.METRICS`.
+
+        Args:
+            response (Response): The response whose body was read.
+            **values (float): Amounts to add to other per-zone counters, such as `records`.
+        """
+        metrics = Base.METRICS
+        if metrics is not None:
+            metrics.add("bytes", response.raw.tell())
+            for name, value in values.items():
+                metrics.add(name, value)
+
+    def _output_to_disk(self, response: Response, partial: PartialDownload, builder: ZoneFilterBuilder = None) -> None:
         """Writes the response content to disk.
 
+        The body is read in `Base.CHUNK_SIZE` blocks into a single reused buffer, so a
+        multi-gigabyte zone costs a few thousand loop iterations and writes rather than
+        millions. The part file hashes and, for gzip zones, validates each block as it is
+        written. When `Base.PREALLOCATE` is set and the size is known, the file's blocks are
+        reserved up front to reduce fragmentation.
+
         Args:
             response (Response): The response object to write to disk.
-            file_path (AnyStr): The path to write the response content to.
+            partial (PartialDownload): The part file to append the response content to.
+            builder (ZoneFilterBuilder): Fed every block written, to build the zone's filter. Defaults to None.
         """
-        with open(file_path, "wb") as f:
-            for chunk in response.raw.stream(1024, decode_content=False):
-                if chunk:
-                    f.write(chunk)
-
-    def _output_to_text_stream(self, response: Response, file_path: AnyStr) -> List[AnyStr]:
-        """Writes the response content to stdout.
+        if Base.PREALLOCATE:
+            partial.preallocate()
+        buffer = bytearray(max(1, Base.CHUNK_SIZE))
+        view = memoryview(buffer)
+        read = response.raw.readinto
+        write = partial.write
+        feed = builder.feed if builder is not None else None
+        if feed is not None and partial.checker is not None:
+            # The part file's gzip check already inflates every block, so the filter reuses its output.
+            partial.checker.sink, feed = builder.feed_text, None
+        while True:
+            size = read(buffer)
+            if not size:
+                break
+            write(view[:size])
+            if feed is not None:
+                feed(view[:size])
+
+    def _output_to_text_stream(self, response: Response, file_path: AnyStr) -> int:
+        """Writes the response content to disk and each line of the zone file to stdout.
 
         Args:
             response (Response): The response object to write to stdout.
             file_path (AnyStr): The path to write the response content to.
 
         Returns:
-            List[AnyStr]: A list of lines from the response content.
+            int: The number of lines written to stdout.
         """
-        return_list: List[AnyStr] = []
+        count = 0
         with open(file_path, "wb") as f:
-            dec = zlib.decompressobj(32 + zlib.MAX_WBITS)
-            for chunk in response.raw.stream(1024, decode_content=False):
-                if chunk:
-                    rv = dec.decompress(chunk)
-                    data = rv.decode("utf-8", errors="ignore")
-                    for line in data.split("\n"):
-                        return_list.append(line)
-                        print(line)
-        return return_list
+            for line in iter_lines(TeeReader(response.raw, f), record_filter=Base.RECORD_FILTER):
+                print(line)
+                count += 1
+        return count
 
-    def _output_to_json_stream(self, response: Response, file_path: AnyStr) -> List[Dict[str, Any]]:
-        """Writes the response content to stdout.
+    def _output_to_json_stream(self, response: Response, file_path: AnyStr) -> int:
+        """Writes the response content to disk and each parsed record of the zone file to stdout.
 
         Args:
             response (Response): The response object to write to stdout.
             file_path (AnyStr): The path to write the response content to.
 
         Returns:
-            List[Dict[str, Any]]: A list of lines from the response content in dictionary format.
+            int: The number of records written to stdout.
         """
-        return_list: List[Dict[str, Any]] = []
+        count = 0
         with open(file_path, "wb") as f:
-            dec = zlib.decompressobj(32 + zlib.MAX_WBITS)
-            for chunk in response.raw.stream(1024, decode_content=False):
-                if chunk:
-                    rv = dec.decompress(chunk)
-                    data = rv.decode("utf-8", errors="ignore")
-                    for line in data.split("\n"):
-                        parsed_dict: Dict[str, Any] = self._parse_line(line=line)
-                        return_list.append(parsed_dict)
-                        print(parsed_dict)
-        return return_list
+            for line in iter_lines(TeeReader(response.raw, f), record_filter=Base.RECORD_FILTER):
+                parsed_dict = self._parse_line(line=line)
+                if parsed_dict is not None:
+                    print(parsed_dict)
+                    count += 1
+        return count
+
+    def _output_to_export(self, response: Response, zone_name: AnyStr) -> AnyStr:
+        """Parses the response content and writes it to an export file as it streams in.
+
+        Args:
+            response (Response): The response object to parse.
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            AnyStr: The path of the export file.
+        """
+        path = export_path(Base.SAVE_PATH, zone_name, Base.OUTPUT_FORMAT)
+        start = time.perf_counter()
+        try:
+            batches = iter_batches(
+                response.raw, zone_name=zone_name, batch_size=ROW_GROUP_SIZE, record_filter=Base.RECORD_FILTER
+            )
+            count = export_batches(batches, path, Base.OUTPUT_FORMAT)
+        finally:
+            response.close()
+        self._record_output(response, records=count, parse_seconds=time.perf_counter() - start)
+        self.__logger.info("Exported %d records of '%s' to '%s'.", count, zone_name, path)
+        return path
+
+    def iter_records(
+        self, zone_file_link: AnyStr, parse: bool = True, record_filter: RecordFilter = None
+    ) -> Iterator[Any]:
+        """Streams a zone file and yields its records as they are decompressed.
+
+        Nothing is written to disk and only one read buffer of the zone is held in memory.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file link.
+            parse (bool): Whether to parse each line into a ZoneData record. Defaults to True.
+            record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+        Yields:
+            Any: Each record as a ZoneData, or as a line of text when parse is False.
+        """
+        response = self._get(zone_file_link)
+        try:
+            if parse:
+                yield from iter_zone_data(
+                    response.raw, zone_name=self._zone_name(zone_file_link), record_filter=record_filter
+                )
+            else:
+                yield from iter_lines(response.raw, record_filter=record_filter)
+        finally:
+            response.close()
+
+    def iter_batches(
+        self, zone_file_link: AnyStr, batch_size: int = 65536, record_filter: RecordFilter = None
+    ) -> Iterator[ZoneBatch]:
+        """Streams a zone file and yields its records as columnar batches.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file link.
+            batch_size (int): The maximum number of records per batch. Defaults to 65536.
+            record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+        Yields:
+            ZoneBatch: Each batch of records.
+        """
+        response = self._get(zone_file_link)
+        try:
+            yield from iter_batches(
+                response.raw,
+                zone_name=self._zone_name(zone_file_link),
+                batch_size=batch_size,
+                record_filter=record_filter,
+            )
+        finally:
+            response.close()
+
+    def _filename(self, response: Response, zone_name: AnyStr) -> AnyStr:
+        """Returns the filename to save a zone file response as.
+
+        Args:
+            response (Response): The zone file response.
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            AnyStr: The filename.
+        """
+        # Try to get the filename from the header
+        header = Message()
+        header["content-disposition"] = response.headers.get("content-disposition", "")
+        filename = header.get_param("filename", header="content-disposition")
+
+        # If could get a filename from the header, then makeup one like [tld].txt.gz
+        if not filename:
+            filename = zone_name + ".txt.gz"
+        return filename
+
+    def _download_to_disk(self, zone_file_link: AnyStr, zone_name: AnyStr) -> AnyStr:
+        """Downloads a zone file to SAVE_PATH, resuming after dropped connections.
+
+        If the stream breaks partway through, the download is retried up to `Base.MAX_RETRIES`
+        times with exponential backoff and each retry resumes from the last committed byte.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file to download from.
+            zone_name (AnyStr): The zone name.
+
+        Raises:
+            IncompleteDownloadError: Raises when the download cannot be completed after all retries.
+
+        Returns:
+            AnyStr: The path of the zone file on disk.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._fetch_to_disk(zone_file_link=zone_file_link, zone_name=zone_name)
+            except (ChunkedEncodingError, RequestsConnectionError, ProtocolError, IncompleteDownloadError) as error:
+                attempt += 1
+                if attempt > Base.MAX_RETRIES:
+                    raise IncompleteDownloadError(
+                        f"Unable to download zone '{zone_name}' after {Base.MAX_RETRIES} retries. {error}"
+                    )
+                self._wait_before_retry(attempt=attempt, url=zone_file_link, reason=str(error))
+
+    def _fetch_to_disk(self, zone_file_link: AnyStr, zone_name: AnyStr) -> AnyStr:
+        """Makes a single attempt at downloading a zone file to SAVE_PATH.
+
+        The manifest in SAVE_PATH supplies If-None-Match/If-Modified-Since headers for zones
+        we already have. A 304 response, or a 200 response carrying the same validators we
+        recorded, is closed before the body is read so unchanged zones cost neither transfer
+        nor disk writes.
+
+        When a previous attempt left a part file behind, a Range request resumes it instead.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file to download from.
+            zone_name (AnyStr): The zone name.
+
+        Raises:
+            IncompleteDownloadError: Raises when the server resumes from a different byte than requested.
+
+        Returns:
+            AnyStr: The path of the zone file on disk.
+        """
+        manifest = Manifest.for_directory(Base.SAVE_PATH)
+        partial = PartialDownload(directory=Base.SAVE_PATH, zone_name=zone_name)
+        request_headers = partial.resume_headers()
+        conditional = not request_headers and not Base.FORCE_DOWNLOAD
+        if conditional:
+            request_headers = manifest.conditional_headers(zone_name)
+        response = self._get(zone_file_link, headers=request_headers)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if (conditional and request_headers) and (
+            response.status_code == 304 or manifest.is_unchanged(zone_name, etag=etag, last_modified=last_modified)
+        ):
+            response.close()
+            self.__logger.info("Zone '%s' has not changed, skipping download.", zone_name)
+            path = os.path.join(Base.SAVE_PATH, manifest.get(zone_name)["filename"])
+            if Base.BUILD_FILTERS and not os.path.isfile(filter_path(Base.SAVE_PATH, zone_name)):
+                build_zone_filter(path)
+            return path
+        if response.status_code == 206:
+            if not partial.resume(offset=self._content_range_start(response)):
+                response.close()
+                partial.discard()
+                raise IncompleteDownloadError(f"Server resumed zone '{zone_name}' from an unexpected offset.")
+        else:
+            length = response.headers.get("content-length")
+            partial.start(
+                filename=self._filename(response=response, zone_name=zone_name),
+                etag=etag,
+                last_modified=last_modified,
+                total=int(length) if length is not None else None,
+            )
+        # A resumed download only streams the tail of the zone, so its filter is built from the file afterwards.
+        builder = None
+        if Base.BUILD_FILTERS and partial.size == 0:
+            builder = ZoneFilterBuilder(zone_name, size=partial.state.get("total"))
+        try:
+            self._output_to_disk(response=response, partial=partial, builder=builder)
+        finally:
+            partial.close()
+            response.close()
+            if partial.checker is not None:
+                self._record_output(response, decompress_seconds=partial.checker.seconds)
+            else:
+                self._record_output(response)
+        result = partial.finish()
+        if builder is not None:
+            builder.save(Base.SAVE_PATH)
+        elif Base.BUILD_FILTERS:
+            build_zone_filter(result["path"])
+        manifest.update(
+            zone_name,
+            filename=partial.state["filename"],
+            etag=partial.state["etag"],
+            last_modified=partial.state["last_modified"],
+            size=result["size"],
+            sha256=result["sha256"],
+            crc32=result.get("crc32"),
+            uncompressed_size=result.get("uncompressed_size"),
+        )
+        return result["path"]
+
+    def _content_range_start(self, response: Response) -> int:
+        """Returns the first byte position of a 206 response from its Content-Range header.
+
+        Args:
+            response (Response): The partial content response.
+
+        Returns:
+            int: The first byte position, or -1 when the header is missing or malformed.
+        """
+        try:
+            return int(response.headers["content-range"].split()[1].split("-")[0])
+        except (KeyError, IndexError, ValueError):
+            return -1
 
     def _download_single_zone_file(self, zone_file_link: AnyStr) -> AnyStr:
         """Downloas the zone file from the provided URL.
 
+        The download holds one of the shared `RateLimiter`'s concurrency slots from the first
+        request until the file is written, so however many threads are running, only as many
+        zones as the server currently tolerates are in flight.
+
+        Args:
+            zone_file_link (AnyStr): A CZDS Zone file to download from.
+
+        Returns:
+            AnyStr: The path that the zone file was downloaded to.
+        """
+        metrics = Base.METRICS
+        with RateLimiter.shared().slot():
+            if metrics is None:
+                return self._download_zone_file(zone_file_link)
+            with metrics.track(self._zone_name(zone_file_link)):
+                return self._download_zone_file(zone_file_link)
+
+    def _download_zone_file(self, zone_file_link: AnyStr) -> AnyStr:
+        """Downloads the zone file from the provided URL in the configured output format.
+
         Args:
             zone_file_link (AnyStr): A CZDS Zone file to download from.
 
@@ -202,27 +676,25 @@ class CZDSConnector(Base):
         Returns:
             AnyStr: The path that the zone file was downloaded to.
         """
-        response = self._get(zone_file_link)
-        zone_name = zone_file_link.rsplit("/", 1)[-1].rsplit(".")[-2]
-
-        # Try to get the filename from the header
-        _, option = cgi.parse_header(response.headers["content-disposition"])
-        filename = option["filename"]
-
-        # If could get a filename from the header, then makeup one like [tld].txt.gz
-        if not filename:
-            filename = zone_name + ".txt"
-        path = os.path.join(Base.SAVE_PATH, filename)
+        zone_name = self._zone_name(zone_file_link)
         if not Base.OUTPUT_FORMAT:
-            self._output_to_disk(response=response, file_path=path)
-        elif Base.OUTPUT_FORMAT == "text":
-            self._output_to_text_stream(response=response, file_path=path)
+            return self._download_to_disk(zone_file_link=zone_file_link, zone_name=zone_name)
+
+        response = self._get(zone_file_link)
+        if Base.OUTPUT_FORMAT in WRITERS:
+            return self._output_to_export(response=response, zone_name=zone_name)
+        path = os.path.join(Base.SAVE_PATH, self._filename(response=response, zone_name=zone_name))
+        start = time.perf_counter()
+        if Base.OUTPUT_FORMAT == "text":
+            count = self._output_to_text_stream(response=response, file_path=path)
         elif Base.OUTPUT_FORMAT == "json":
-            self._output_to_json_stream(response=response, file_path=path)
+            count = self._output_to_json_stream(response=response, file_path=path)
         else:
             raise UnsupportedTypeError(
-                f"Unsupported output format '{Base.OUTPUT_FORMAT}'. Supported formats are 'none', 'text', or 'json'."
+                f"Unsupported output format '{Base.OUTPUT_FORMAT}'. "
+                f"Supported formats are 'none', 'text', 'json', {', '.join(repr(f) for f in WRITERS)}."
             )
+        self._record_output(response, records=count, parse_seconds=time.perf_counter() - start)
         return path
 
     def download(self, zone_file_list: AnyStr or List[AnyStr]) -> AnyStr:
@@ -246,6 +718,6 @@ class CZDSConnector(Base):
             return self._download_single_zone_file(zone_file_link=zone_file_list)
         else:
             self.__logger.critical(
-                f"Unable to download. Unknown data structure provided to this method. {zone_file_list}"
+                "Unable to download. Unknown data structure provided to this method. %s", zone_file_list
             )
             raise UnsupportedTypeError("""Unknown data type. Should be 'list' or 'str'.""")
@@ -1,50 +1,163 @@
 """Main entrypoint for czds."""
 
+import json
+import os
+from typing import Any
 from typing import AnyStr
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Optional
+
+from attrs import asdict
 
 from .base import Base
-from .connector import CZDSConnector
-from .exceptions import CZDSConnectionError
+from .bloom import BloomFilter
+from .bloom import build_zone_filter
+from .bloom import filter_path
+from .catalog import LinkCatalog
+from .exceptions import UnsupportedTypeError
+from .export import ROW_GROUP_SIZE
+from .export import export_batches
+from .export import export_path
+from .filtering import make_filter
+from .gzindex import GzipIndex
+from .integrity import expected_values
+from .integrity import verify_file
+from .logger import configure_logging
+from .logger import start_queue_logging
+from .metrics import Metrics
+from .models import ZoneBatch
+from .models import ZoneChange
+from .models import ZoneData
+from .ratelimit import RateLimiter
+from .stream import iter_file_batches
+from .stream import iter_file_records
+from .stream import iter_file_zone_data
+from .stream import zone_name_from_path
 
 
 class CZDS(Base):
     """Main class for ICAAN CZDS."""
 
     links: List[str] = []
+    _domain_index: Any = None
+    _catalog: LinkCatalog = None
+    _catalog_directory: AnyStr = None
+    _filters: Dict[str, Optional[BloomFilter]] = None
 
-    def __init__(self, username: AnyStr, password: AnyStr, save_directory: AnyStr) -> None:
+    def __init__(
+        self,
+        username: AnyStr = None,
+        password: AnyStr = None,
+        save_directory: AnyStr = None,
+        token_cache: AnyStr = None,
+        rate_limit: float = None,
+        max_concurrency: int = None,
+        queue_logging: bool = False,
+        metrics: Any = None,
+    ) -> None:
         """Sets the username and password for API authentication.
 
+        Credentials are only needed by methods that talk to CZDS; methods that work on zone
+        files already on disk, like `diff`, can be used without them.
+
         Args:
-            username (AnyStr): The username to access CZDS.
-            password (AnyStr): The password to access CZDS.
-            save_directory (AnyStr): The directory to save zone files to.
+            username (AnyStr): The username to access CZDS. Defaults to None.
+            password (AnyStr): The password to access CZDS. Defaults to None.
+            save_directory (AnyStr): The directory to save zone files to. Defaults to None.
+            token_cache (AnyStr): A file to cache access tokens in, so separate runs within a token's
+                                  lifetime do not authenticate again. Defaults to caching in memory only.
+            rate_limit (float): The most CZDS API requests per second, 0 for unlimited. Defaults to the
+                                `CZDS_RATE_LIMIT` environment variable, the config file or `Base.RATE_LIMIT`.
+            max_concurrency (int): The most concurrent zone downloads. The limit adapts downwards when the
+                                   server answers 429 or 503 and recovers as requests succeed. Defaults to the
+                                   `CZDS_MAX_CONCURRENCY` environment variable, the config file or
+                                   `Base.MAX_CONCURRENCY`.
+            queue_logging (bool): Write log records from a background thread, so download threads only
+                                  queue them. Defaults to False.
+            metrics (Any): Record per-zone transfer, timing and parsing metrics. True collects them in a
+                           Metrics, whose JSON summary `get_zone` writes to the save directory; a Metrics
+                           subclass can be passed to forward them elsewhere. Defaults to None.
         """
         Base.USERNAME = username
         Base.PASSWORD = password
         Base.SAVE_PATH = save_directory
+        Base.TOKEN_CACHE_PATH = os.path.expanduser(token_cache) if token_cache else None
+        if rate_limit is not None or max_concurrency is not None:
+            RateLimiter.configure(requests_per_second=rate_limit, max_concurrency=max_concurrency)
+        configure_logging()
+        Base.METRICS = (Metrics() if metrics is True else metrics) if metrics else None
+        if queue_logging:
+            start_queue_logging()
 
-    def list_links(self) -> List[str]:
-        """Returns a list of all CZDS Zone Link urls.
+    def _connect(self) -> Any:
+        """Authenticates a new connector, importing the HTTP stack on first use.
 
         Raises:
-            CZDSConnectionError: Raises connection errors.
+            CZDSConnectionError: Raises when authentication fails.
 
         Returns:
-            List[str]: A list CZDS Zone Link urls.
+            Any: The CZDSConnector, also kept as `self.connection`.
         """
+        from .connector import CZDSConnector
+        from .exceptions import CZDSConnectionError
+
         try:
             self.connection = CZDSConnector()
         except CZDSConnectionError as cze:
             raise cze
-        if not self.links:
-            self.links = self.connection._get_zone_links()
+        return self.connection
+
+    def _get_catalog(self) -> LinkCatalog:
+        """Returns the link catalog of the save directory, loading it on first use.
+
+        Returns:
+            LinkCatalog: The catalog.
+        """
+        if self._catalog is None or self._catalog_directory != Base.SAVE_PATH:
+            self._catalog = LinkCatalog(Base.SAVE_PATH)
+            self._catalog_directory = Base.SAVE_PATH
+        return self._catalog
+
+    def list_links(self, tlds: List[str] = None, modified_since: Any = None, refresh: bool = False) -> List[str]:
+        """Returns a list of all CZDS Zone Link urls.
+
+        Links are served from the link catalog in the save directory while it is younger than
+        `Base.LINK_CACHE_TTL`. Refreshing the catalog also fetches every zone's size and
+        Last-Modified with concurrent HEAD requests.
+
+        Args:
+            tlds (List[str]): Only return links of these zones, such as ['com', 'net']. Defaults to all zones.
+            modified_since (Any): Only return zones modified after this datetime, timestamp or ISO 8601
+                                  string. Defaults to None.
+            refresh (bool): Fetch the links from CZDS even when the catalog is fresh. Defaults to False.
+
+        Raises:
+            CZDSConnectionError: Raises connection errors.
+
+        Returns:
+            List[str]: A list CZDS Zone Link urls.
+        """
+        catalog = self._get_catalog()
+        if refresh or not catalog.is_fresh:
+            self._connect()
+            catalog.refresh(self.connection)
+        self.links = catalog.links(tlds=tlds, modified_since=modified_since)
         return self.links
 
     def get_zone(
-        self, link: AnyStr = None, threaded: bool = False, output_format: AnyStr = None
+        self,
+        link: AnyStr = None,
+        threaded: bool = False,
+        output_format: AnyStr = None,
+        force: bool = False,
+        build_filters: bool = False,
+        tlds: List[str] = None,
+        modified_since: Any = None,
+        record_types: Any = None,
+        name_filter: Any = None,
     ) -> AnyStr or List[Dict[str, str]]:
         """Retrieves all or a single CZDS Zone File.
 
@@ -52,9 +165,23 @@ class CZDS(Base):
 
         Args:
             link (AnyStr): A CZDS Zone Link URL. Defaults to None.
-            threaded (bool): Whether or not to run multi-threaded.
+            threaded (bool): Whether or not to run multi-threaded. Zones are scheduled largest first.
             output_format (AnyStr): The output format for the parsed zone file.
-                                    Accepts 'none','text' and 'json' at this time. Defaults to None.
+                                    Accepts 'none', 'text', 'json', 'ndjson', 'parquet' and 'arrow'.
+                                    Defaults to None.
+            force (bool): Download zone files even when the copy in the save directory is unchanged.
+                          Defaults to False.
+            build_filters (bool): Build each zone's membership filter for `contains_many` while it
+                                  downloads. Only applies when saving zone files. Defaults to False.
+            tlds (List[str]): Without a link, only retrieve these zones. Defaults to all zones.
+            modified_since (Any): Without a link, only retrieve zones modified after this datetime,
+                                  timestamp or ISO 8601 string. Defaults to None.
+            record_types (Any): With the 'text', 'json', 'ndjson', 'parquet' or 'arrow' output formats, only
+                                output records of these types, as a list or a comma separated string such
+                                as 'NS,DS'. Lines are filtered before they are parsed. Defaults to all types.
+            name_filter (Any): With the same output formats, only output records owned by this name, these
+                               names or names matching this compiled regular expression. Names starting with
+                               '.' or '*.' also match every name below them. Defaults to all names.
 
         Raises:
             CZDSConnectionError: Raises connection errors.
@@ -63,18 +190,393 @@ class CZDS(Base):
             AnyStr or List[Dict[str, str]]: _description_
         """
         Base.OUTPUT_FORMAT = output_format
+        Base.FORCE_DOWNLOAD = force
+        Base.BUILD_FILTERS = build_filters
+        Base.RECORD_FILTER = make_filter(record_types=record_types, name_filter=name_filter)
         return_list: List[Dict[str, str]] = []
-        try:
-            self.connection = CZDSConnector()
-        except CZDSConnectionError as cze:
-            raise cze
+        self._connect()
         if link:
             return_list.append(self.connection.download(zone_file_list=link))
         else:
+            links = self.list_links(tlds=tlds, modified_since=modified_since)
             if threaded:
-                return self.run_threaded(method=self.connection.download, list_data=self.list_links())
+                return_list = self.run_threaded(
+                    method=self.connection.download, list_data=links, sizes=self._get_catalog().sizes()
+                )
             else:
-                for link in self.list_links():
-                    self.__logger.info(f"Downloading zone file from '{link}'.")
+                for link in links:
+                    self.__logger.info("Downloading zone file from '%s'.", link)
                     return_list.append(self.connection.download(zone_file_list=link))
+        if Base.METRICS is not None and Base.SAVE_PATH:
+            self._save_metrics()
         return return_list
+
+    def _save_metrics(self) -> None:
+        """Writes the JSON metrics summary to the save directory and logs the totals."""
+        path = Base.METRICS.save(Base.SAVE_PATH)
+        totals = Base.METRICS.summary()["totals"]
+        self.__logger.info(
+            "Transferred %d bytes in %.1fs with %d retries. Metrics written to '%s'.",
+            totals["bytes"],
+            totals["download_seconds"],
+            totals["retries"],
+            path,
+        )
+
+    def metrics_report(self, output_format: AnyStr = "json") -> AnyStr:
+        """Returns the metrics recorded so far.
+
+        Args:
+            output_format (AnyStr): 'json' for the summary, 'prometheus' for the Prometheus text format
+                                    or 'openmetrics'. Defaults to "json".
+
+        Raises:
+            RuntimeError: Raises when metrics are disabled.
+            UnsupportedTypeError: Raises when the format is not supported.
+
+        Returns:
+            AnyStr: The report.
+        """
+        if Base.METRICS is None:
+            raise RuntimeError("Metrics are disabled, create the client with CZDS(metrics=True).")
+        if output_format == "json":
+            return Base.METRICS.to_json()
+        if output_format in ("prometheus", "openmetrics"):
+            return Base.METRICS.to_prometheus(openmetrics=output_format == "openmetrics")
+        raise UnsupportedTypeError(
+            f"Unsupported metrics format '{output_format}'. Use 'json', 'prometheus' or 'openmetrics'."
+        )
+
+    def iter_records(
+        self, link: AnyStr, parse: bool = True, record_types: Any = None, name_filter: Any = None
+    ) -> Iterator[Any]:
+        """Streams a single CZDS Zone File and yields its records lazily.
+
+        Records are yielded as the download is decompressed, so memory use does not grow with
+        the size of the zone. Record type and name filters are applied to the decompressed bytes,
+        so unwanted lines are never decoded or parsed.
+
+        Args:
+            link (AnyStr): A CZDS Zone Link URL.
+            parse (bool): Whether to parse each line into a ZoneData record. Defaults to True.
+            record_types (Any): Only keep records of these types, as a list or a comma separated string such
+                                as 'NS,DS'. Defaults to all types.
+            name_filter (Any): Only keep records owned by this name, these names or names matching this
+                               compiled regular expression. Names starting with '.' or '*.' also match every
+                               name below them. Defaults to all names.
+
+        Raises:
+            CZDSConnectionError: Raises connection errors.
+
+        Yields:
+            Any: Each record as a ZoneData, or as a line of text when parse is False.
+        """
+        self._connect()
+        record_filter = make_filter(record_types=record_types, name_filter=name_filter)
+        yield from self.connection.iter_records(zone_file_link=link, parse=parse, record_filter=record_filter)
+
+    def iter_batches(
+        self, link: AnyStr, batch_size: int = 65536, record_types: Any = None, name_filter: Any = None
+    ) -> Iterator[ZoneBatch]:
+        """Streams a single CZDS Zone File and yields its records as columnar batches.
+
+        Args:
+            link (AnyStr): A CZDS Zone Link URL.
+            batch_size (int): The maximum number of records per batch. Defaults to 65536.
+            record_types (Any): Only keep records of these types, as a list or a comma separated string such
+                                as 'NS,DS'. Defaults to all types.
+            name_filter (Any): Only keep records owned by this name, these names or names matching this
+                               compiled regular expression. Names starting with '.' or '*.' also match every
+                               name below them. Defaults to all names.
+
+        Raises:
+            CZDSConnectionError: Raises connection errors.
+
+        Yields:
+            ZoneBatch: Each batch of records.
+        """
+        self._connect()
+        record_filter = make_filter(record_types=record_types, name_filter=name_filter)
+        yield from self.connection.iter_batches(zone_file_link=link, batch_size=batch_size, record_filter=record_filter)
+
+    def iter_file_records(
+        self, path: AnyStr, parse: bool = True, record_types: Any = None, name_filter: Any = None
+    ) -> Iterator[Any]:
+        """Yields the records of a zone file that was already downloaded.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            parse (bool): Whether to parse each line into a ZoneData record. Defaults to True.
+            record_types (Any): Only keep records of these types, as a list or a comma separated string such
+                                as 'NS,DS'. Defaults to all types.
+            name_filter (Any): Only keep records owned by this name, these names or names matching this
+                               compiled regular expression. Names starting with '.' or '*.' also match every
+                               name below them. Defaults to all names.
+
+        Yields:
+            Any: Each record as a ZoneData, or as a line of text when parse is False.
+        """
+        record_filter = make_filter(record_types=record_types, name_filter=name_filter)
+        if parse:
+            yield from iter_file_zone_data(path, record_filter=record_filter)
+        else:
+            yield from iter_file_records(path, record_filter=record_filter)
+
+    def iter_file_batches(
+        self,
+        path: AnyStr,
+        batch_size: int = 65536,
+        workers: int = 1,
+        record_types: Any = None,
+        name_filter: Any = None,
+    ) -> Iterator[ZoneBatch]:
+        """Yields the records of a zone file that was already downloaded as columnar batches.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            batch_size (int): The maximum number of records per batch. Defaults to 65536.
+            workers (int): The number of processes to parse with. Values above 1 use a
+                           ParallelParser. Defaults to 1.
+            record_types (Any): Only keep records of these types, as a list or a comma separated string such
+                                as 'NS,DS'. Defaults to all types.
+            name_filter (Any): Only keep records owned by this name, these names or names matching this
+                               compiled regular expression. Names starting with '.' or '*.' also match every
+                               name below them. Defaults to all names.
+
+        Yields:
+            ZoneBatch: Each batch of records.
+        """
+        record_filter = make_filter(record_types=record_types, name_filter=name_filter)
+        if workers > 1:
+            from .pipeline import ParallelParser
+
+            parser = ParallelParser(workers=workers)
+            yield from parser.iter_batches(path, batch_size=batch_size, record_filter=record_filter)
+        else:
+            yield from iter_file_batches(path, batch_size=batch_size, record_filter=record_filter)
+
+    def index_file(self, path: AnyStr, force: bool = False) -> Dict[str, Any]:
+        """Builds a seekable index next to a downloaded `.txt.gz` zone file.
+
+        Indexed files can be read from any line with `GzipIndex.iter_lines` and are decompressed
+        in parallel by `iter_file_batches` when more than one worker is used. Requires
+        `pip install czds[indexed]`.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` zone file.
+            force (bool): Rebuild the index even when it is current. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The uncompressed size, line count and line checkpoints of the file.
+        """
+        return GzipIndex(path).build(force=force).metadata
+
+    def verify(self, path: AnyStr) -> Dict[str, Any]:
+        """Checks the integrity of a downloaded zone file.
+
+        Gzip zone files are inflated to check the CRC32 and ISIZE in their trailer. When the
+        directory's manifest has an entry for the file, its size, SHA-256, CRC32 and uncompressed
+        size must also match the values recorded as it was downloaded.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+
+        Returns:
+            Dict[str, Any]: The size and checksums of the file, whether it is `valid` and the `errors` found.
+        """
+        result = verify_file(path, expected=expected_values(path))
+        if not result["valid"]:
+            self.__logger.warning("Zone file '%s' failed verification. %s", path, " ".join(result["errors"]))
+        return result
+
+    def export_file(self, path: AnyStr, output_format: AnyStr = "parquet", destination: AnyStr = None) -> AnyStr:
+        """Converts a zone file that was already downloaded to NDJSON, Parquet or Arrow IPC.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            output_format (AnyStr): One of 'ndjson', 'parquet' or 'arrow'. Defaults to 'parquet'.
+            destination (AnyStr): The directory to write to. Defaults to the directory of the zone file.
+
+        Returns:
+            AnyStr: The path of the export file.
+        """
+        zone_name = zone_name_from_path(path)
+        output_path = export_path(destination or os.path.dirname(path), zone_name, output_format)
+        batches = iter_file_batches(path, zone_name=zone_name, batch_size=ROW_GROUP_SIZE)
+        count = export_batches(batches, output_path, output_format)
+        self.__logger.info("Exported %d records of '%s' to '%s'.", count, zone_name, output_path)
+        return output_path
+
+    def iter_diff(
+        self, old: AnyStr, new: AnyStr, partitions: int = None, ignore_ttl: bool = True
+    ) -> Iterator[ZoneChange]:
+        """Yields the delegations added, removed or changed between two snapshots of a zone.
+
+        Both snapshots are hash-partitioned by name into temporary files and compared one
+        partition at a time, so memory stays bounded even for the largest zones.
+
+        Args:
+            old (AnyStr): The path to the older `.txt.gz` or plain text snapshot.
+            new (AnyStr): The path to the newer snapshot of the same zone.
+            partitions (int): The number of hash partitions. Defaults to an estimate from the file sizes.
+            ignore_ttl (bool): Whether a record whose TTL alone changed counts as unchanged. Defaults to True.
+
+        Yields:
+            ZoneChange: Each name that was added, removed or changed.
+        """
+        from .diff import ZoneDiff
+
+        yield from ZoneDiff(old, new, partitions=partitions, ignore_ttl=ignore_ttl)
+
+    def diff(
+        self, old: AnyStr, new: AnyStr, output: AnyStr = None, partitions: int = None, ignore_ttl: bool = True
+    ) -> Dict[str, int]:
+        """Writes the changes between two snapshots of a zone as NDJSON and returns how many there were.
+
+        This backs the `czds diff <old> <new>` command.
+
+        Args:
+            old (AnyStr): The path to the older `.txt.gz` or plain text snapshot.
+            new (AnyStr): The path to the newer snapshot of the same zone.
+            output (AnyStr): The file to write changes to. Defaults to printing them to stdout.
+            partitions (int): The number of hash partitions. Defaults to an estimate from the file sizes.
+            ignore_ttl (bool): Whether a record whose TTL alone changed counts as unchanged. Defaults to True.
+
+        Returns:
+            Dict[str, int]: The number of added, removed and changed names.
+        """
+        from .diff import ZoneDiff
+
+        zone_diff = ZoneDiff(old, new, partitions=partitions, ignore_ttl=ignore_ttl)
+        f = open(output, "w", encoding="utf-8") if output else None
+        try:
+            for change in zone_diff:
+                print(json.dumps(asdict(change), ensure_ascii=False), file=f)
+        finally:
+            if f is not None:
+                f.close()
+        return zone_diff.counts
+
+    def _get_domain_index(self) -> Any:
+        """Returns the domain index of the save directory, importing sqlite3 and opening it on first use.
+
+        Returns:
+            Any: The DomainIndex.
+        """
+        from .index import DomainIndex
+
+        if self._domain_index is None or self._domain_index.directory != Base.SAVE_PATH:
+            self._domain_index = DomainIndex(Base.SAVE_PATH)
+        return self._domain_index
+
+    def build_index(self, force: bool = False) -> Dict[str, int]:
+        """Indexes the zone files in the save directory by owner name.
+
+        Only zones that are new or changed since the last call are loaded, and zones whose
+        file was removed are dropped from the index.
+
+        Args:
+            force (bool): Reload every zone even when its file has not changed. Defaults to False.
+
+        Returns:
+            Dict[str, int]: The number of records loaded, keyed by the zones that were (re)loaded.
+        """
+        return self._get_domain_index().update(force=force)
+
+    def lookup(self, name: AnyStr, record_type: AnyStr = None) -> List[ZoneData]:
+        """Returns the indexed records of a domain name. Run `build_index` first.
+
+        Args:
+            name (AnyStr): The domain name, such as 'example.com'.
+            record_type (AnyStr): Only return records of this type, such as 'NS'. Defaults to all types.
+
+        Returns:
+            List[ZoneData]: The records of the name.
+        """
+        return self._get_domain_index().lookup(name, record_type=record_type)
+
+    def scan(self, prefix: AnyStr = None, suffix: AnyStr = None, limit: int = 1000) -> List[ZoneData]:
+        """Returns the indexed records of names starting with prefix or ending with suffix.
+
+        Args:
+            prefix (AnyStr): The start of the names, such as 'paypal'. Defaults to None.
+            suffix (AnyStr): The end of the names, such as '-paypal.com'. Defaults to None.
+            limit (int): The maximum number of records to return. Defaults to 1000.
+
+        Raises:
+            ValueError: Raises when neither or both of prefix and suffix are provided.
+
+        Returns:
+            List[ZoneData]: The matching records.
+        """
+        if bool(prefix) == bool(suffix):
+            raise ValueError("Provide either a prefix or a suffix to scan.")
+        index = self._get_domain_index()
+        if prefix:
+            return list(index.scan_prefix(prefix, limit=limit))
+        return list(index.scan_suffix(suffix, limit=limit))
+
+    def build_filters(self, force: bool = False) -> List[AnyStr]:
+        """Builds the membership filter of each zone file in the save directory that lacks a current one.
+
+        Args:
+            force (bool): Rebuild filters even when they are newer than their zone file. Defaults to False.
+
+        Returns:
+            List[AnyStr]: The paths of the filters that were built.
+        """
+        built = []
+        for name in sorted(os.listdir(Base.SAVE_PATH)):
+            if not name.endswith(".txt.gz"):
+                continue
+            path = os.path.join(Base.SAVE_PATH, name)
+            bloom_path = filter_path(Base.SAVE_PATH, zone_name_from_path(path))
+            if force or not os.path.isfile(bloom_path) or os.path.getmtime(bloom_path) < os.path.getmtime(path):
+                built.append(build_zone_filter(path))
+        self._filters = None
+        return built
+
+    def _get_filter(self, zone_name: AnyStr) -> Optional[BloomFilter]:
+        """Returns the membership filter of a zone, loading it on first use.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            Optional[BloomFilter]: The filter, or None when the zone has none.
+        """
+        if self._filters is None:
+            self._filters = {}
+        if zone_name not in self._filters:
+            path = filter_path(Base.SAVE_PATH, zone_name)
+            self._filters[zone_name] = BloomFilter.load(path) if os.path.isfile(path) else None
+            if self._filters[zone_name] is None:
+                self.__logger.warning("No filter for zone '%s', names in it are reported as absent.", zone_name)
+        return self._filters[zone_name]
+
+    def contains_many(self, names: Iterable[AnyStr]) -> List[bool]:
+        """Checks which names exist in the zones downloaded to the save directory.
+
+        Each name is checked against the membership filter of its TLD. A False result means
+        the name is definitely not in the zone; a True result means it almost certainly is,
+        with a false positive rate of about 0.1%. Names in zones without a filter are
+        reported as absent. Run `build_filters` or `get_zone(build_filters=True)` first.
+
+        Args:
+            names (Iterable[AnyStr]): The domain names to check, such as 'example.com'.
+
+        Returns:
+            List[bool]: Whether each name is probably present, in the order the names were given.
+        """
+        names = list(names)
+        results = [False] * len(names)
+        by_zone: Dict[str, List[int]] = {}
+        for position, name in enumerate(names):
+            by_zone.setdefault(name.rstrip(".").rsplit(".", 1)[-1].lower(), []).append(position)
+        for zone_name, positions in by_zone.items():
+            bloom = self._get_filter(zone_name)
+            if bloom is None:
+                continue
+            for position, present in zip(positions, bloom.contains_many(names[p] for p in positions)):
+                results[position] = present
+        return results
@@ -0,0 +1,183 @@
+"""Differences between two snapshots of the same zone.
+
+Loading two snapshots of `.com` into Python sets takes tens of gigabytes. `ZoneDiff` instead
+makes one streaming pass over each snapshot and scatters its records into partition files
+by a hash of the owner name, so every record of a name lands in the same partition of both
+snapshots. Partitions are then compared one pair at a time, which bounds memory to the size
+of a single partition regardless of the size of the zone.
+
+Names are compared case-insensitively. Changes are yielded partition by partition and
+sorted by name within each partition.
+"""
+
+import math
+import os
+import tempfile
+from typing import AnyStr
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import List
+from typing import Set
+
+from .base import Base
+from .models import ZoneChange
+from .parser import parse_records
+from .stream import iter_file_records
+from .stream import zone_name_from_path
+
+
+class ZoneDiff(Base):
+    """Streams the added, removed and changed delegations between two snapshots of a zone."""
+
+    # Signatures and the SOA serial change with every publication without any delegation changing.
+    IGNORED_TYPES: FrozenSet[AnyStr] = frozenset(("SOA", "RRSIG", "NSEC", "NSEC3", "NSEC3PARAM"))
+    # The approximate amount of uncompressed zone text per partition.
+    PARTITION_SIZE: int = 64 * 1024 * 1024
+    # Typical gzip compression ratio of a zone file, used to estimate its uncompressed size.
+    COMPRESSION_RATIO: int = 6
+    MAX_PARTITIONS: int = 512
+
+    def __init__(
+        self,
+        old_path: AnyStr,
+        new_path: AnyStr,
+        partitions: int = None,
+        work_directory: AnyStr = None,
+        ignore_ttl: bool = True,
+    ) -> None:
+        """Configures the diff.
+
+        Args:
+            old_path (AnyStr): The older `.txt.gz` or plain text snapshot.
+            new_path (AnyStr): The newer snapshot of the same zone.
+            partitions (int): The number of hash partitions. Defaults to an estimate from the file sizes.
+            work_directory (AnyStr): Where partition files are written. Defaults to the system temp directory.
+            ignore_ttl (bool): Whether a record whose TTL alone changed counts as unchanged. Defaults to True.
+        """
+        self.old_path = old_path
+        self.new_path = new_path
+        self.zone_name = zone_name_from_path(new_path)
+        self.partitions = max(1, partitions or self._estimate_partitions())
+        self.work_directory = work_directory
+        self.ignore_ttl = ignore_ttl
+        self.counts: Dict[str, int] = {"added": 0, "removed": 0, "changed": 0}
+
+    def _estimate_partitions(self) -> int:
+        """Estimates how many partitions keep each one near PARTITION_SIZE.
+
+        Returns:
+            int: The number of partitions.
+        """
+        size = 0
+        for path in (self.old_path, self.new_path):
+            ratio = self.COMPRESSION_RATIO if path.endswith(".gz") else 1
+            size = max(size, os.path.getsize(path) * ratio)
+        return min(self.MAX_PARTITIONS, math.ceil(size / self.PARTITION_SIZE))
+
+    def _partition(self, path: AnyStr, directory: AnyStr, prefix: AnyStr) -> List[AnyStr]:
+        """Scatters the records of a snapshot into partition files by owner name.
+
+        Each partition line is `name<TAB>record`, where record is `TYPE rdata`, prefixed with the
+        TTL unless TTLs are ignored.
+
+        Args:
+            path (AnyStr): The snapshot.
+            directory (AnyStr): The directory to write partitions to.
+            prefix (AnyStr): The partition file name prefix.
+
+        Returns:
+            List[AnyStr]: The partition file paths, indexed by partition number.
+        """
+        paths = [os.path.join(directory, f"{prefix}.{number}") for number in range(self.partitions)]
+        files = [open(p, "w", encoding="utf-8", newline="\n", buffering=256 * 1024) for p in paths]
+        try:
+            writes = [f.write for f in files]
+            partitions = self.partitions
+            ignored = self.IGNORED_TYPES
+            ignore_ttl = self.ignore_ttl
+            for name, ttl, _, record_type, record_data in parse_records(iter_file_records(path)):
+                record_type = record_type.upper()
+                if record_type in ignored:
+                    continue
+                name = name.lower()
+                if ignore_ttl:
+                    writes[hash(name) % partitions](f"{name}\t{record_type} {record_data}\n")
+                else:
+                    writes[hash(name) % partitions](f"{name}\t{ttl or ''} {record_type} {record_data}\n")
+        finally:
+            for f in files:
+                f.close()
+        return paths
+
+    @staticmethod
+    def _load(path: AnyStr) -> Dict[AnyStr, Set[AnyStr]]:
+        """Loads a partition file, grouping records by name, and removes it.
+
+        Args:
+            path (AnyStr): The partition file.
+
+        Returns:
+            Dict[AnyStr, Set[AnyStr]]: The records of each name.
+        """
+        records: Dict[AnyStr, Set[AnyStr]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                name, record = line.rstrip("\n").split("\t", 1)
+                name_records = records.get(name)
+                if name_records is None:
+                    name_records = records[name] = set()
+                name_records.add(record)
+        os.remove(path)
+        return records
+
+    def _compare(self, old: Dict[AnyStr, Set[AnyStr]], new: Dict[AnyStr, Set[AnyStr]]) -> Iterator[ZoneChange]:
+        """Compares one pair of partitions.
+
+        Args:
+            old (Dict[AnyStr, Set[AnyStr]]): The records of each name in the old snapshot.
+            new (Dict[AnyStr, Set[AnyStr]]): The records of each name in the new snapshot.
+
+        Yields:
+            ZoneChange: Each name that was added, removed or changed.
+        """
+        for name in sorted(old.keys() | new.keys()):
+            old_records = old.get(name)
+            new_records = new.get(name)
+            if old_records is None:
+                change = ZoneChange(self.zone_name, name, "added", added=sorted(new_records))
+            elif new_records is None:
+                change = ZoneChange(self.zone_name, name, "removed", removed=sorted(old_records))
+            elif old_records != new_records:
+                change = ZoneChange(
+                    self.zone_name,
+                    name,
+                    "changed",
+                    added=sorted(new_records - old_records),
+                    removed=sorted(old_records - new_records),
+                )
+            else:
+                continue
+            self.counts[change.change] += 1
+            yield change
+
+    def __iter__(self) -> Iterator[ZoneChange]:
+        """Partitions both snapshots and yields the changes between them.
+
+        Yields:
+            ZoneChange: Each name that was added, removed or changed.
+        """
+        self.counts = dict.fromkeys(self.counts, 0)
+        with tempfile.TemporaryDirectory(prefix="czds-diff-", dir=self.work_directory) as directory:
+            old_partitions = self._partition(self.old_path, directory, "old")
+            new_partitions = self._partition(self.new_path, directory, "new")
+            for old_partition, new_partition in zip(old_partitions, new_partitions):
+                yield from self._compare(self._load(old_partition), self._load(new_partition))
+        self.__logger.info(
+            "Diffed '%s' across %d partitions: %d added, %d removed, %d changed.",
+            self.zone_name,
+            self.partitions,
+            self.counts["added"],
+            self.counts["removed"],
+            self.counts["changed"],
+        )
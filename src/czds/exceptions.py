@@ -1,22 +1,52 @@
 """czds.utils.exceptions."""
 
-from requests.exceptions import HTTPError
+from typing import Any
 
 
-class CZDSConnectionError(HTTPError):
-    """Base class for all requests HTTPErrors."""
+class CZDSConnectionError(IOError):
+    """Base class for all HTTP errors returned by CZDS.
 
-    def __init__(self, status_code: int, name: str, http_error: HTTPError) -> None:
+    Like the requests `HTTPError` it wraps, this is an `IOError`, and it carries the failed
+    `response`. It does not subclass `HTTPError`, so importing it does not import requests.
+    """
+
+    def __init__(self, status_code: int, name: str, http_error: Any) -> None:
         """Base exception for CZDS HTTP requests.
 
         Args:
             status_code (int): The status code received from the request.
             name (str): The name of the error.
-            http_error (HTTPError): The HTTP Error from the requests response.
+            http_error (Any): The HTTP error raised by requests or aiohttp.
         """
         from .base import Base
 
-        Base().log(message=f"\n{name} Error Occurred.\nStatus Code: {status_code}\nError: {http_error}\n")
+        super().__init__(f"{name} Error Occurred. Status Code: {status_code}")
+        self.status_code = status_code
+        self.name = name
+        self.http_error = http_error
+        self.response = getattr(http_error, "response", None)
+
+        Base().log("\n%s Error Occurred.\nStatus Code: %s\nError: %s\n", "info", name, status_code, http_error)
+
+
+class IncompleteDownloadError(IOError):
+    """Raised when a zone file download ends before all expected bytes were received."""
+
+    def __init__(self, message: str, received: int = None, total: int = None) -> None:
+        """Wrapper for IOError which records how many bytes were received.
+
+        Args:
+            message (str): The error message.
+            received (int): The number of bytes received. Defaults to None.
+            total (int): The number of bytes expected. Defaults to None.
+        """
+        super().__init__(message)
+        self.received = received
+        self.total = total
+
+
+class CorruptDownloadError(IncompleteDownloadError):
+    """Raised when a zone file is not a valid gzip stream or fails its CRC32/ISIZE check."""
 
 
 class UnsupportedTypeError(TypeError):
@@ -0,0 +1,376 @@
+"""Columnar and line delimited exports of parsed zone files.
+
+Zones are written as they stream in: every `ZoneBatch` coming off the parser becomes one
+Parquet row group, one Arrow IPC record batch or one block of NDJSON lines, so memory
+stays bounded by the row group size no matter how large the zone is.
+
+Every format carries the same columns: `zone_name`, `dns_record`, `ttl`, `record_class`,
+`record_type` and `record_data`. The Parquet and Arrow formats dictionary-encode the class
+and type columns and store `ttl` as a nullable 64-bit integer. Rows are sorted by name
+within each row group, which keeps Parquet min/max statistics tight enough to skip row
+groups when filtering by name.
+
+Parquet and Arrow IPC output require the optional `pyarrow` package, installable with
+`pip install czds[columnar]`. NDJSON output has no extra dependencies.
+"""
+
+import json
+import os
+from abc import ABC
+from abc import ABCMeta
+from abc import abstractmethod
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from .base import Base
+from .exceptions import UnsupportedTypeError
+from .logger import LoggingBase
+from .models import ZoneBatch
+
+
+def _import_pyarrow() -> Any:
+    """Imports pyarrow on first use so it stays an optional dependency.
+
+    Raises:
+        ImportError: Raises when pyarrow is not installed.
+
+    Returns:
+        Any: The pyarrow module.
+    """
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401
+    except ImportError as ie:
+        raise ImportError(
+            "Parquet and Arrow output require pyarrow. Install it with 'pip install czds[columnar]'."
+        ) from ie
+    return pyarrow
+
+
+class AbstractLoggingBase(LoggingBase, ABCMeta):
+    """Metaclass of abstract classes that log like every other Base subclass."""
+
+
+class ZoneWriter(Base, ABC, metaclass=AbstractLoggingBase):
+    """Writes batches of zone records to a file, replacing the file atomically when closed.
+
+    Subclasses implement `write_batch` and `_close`; one missing either cannot be instantiated.
+    """
+
+    EXTENSION: AnyStr = None
+
+    def __init__(self, path: AnyStr) -> None:
+        """Opens a temporary file next to the destination.
+
+        Args:
+            path (AnyStr): The destination file.
+        """
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.count = 0
+
+    @abstractmethod
+    def write_batch(self, batch: ZoneBatch) -> None:
+        """Writes a batch of records.
+
+        Args:
+            batch (ZoneBatch): The records to write.
+        """
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Flushes and closes the temporary file."""
+
+    def close(self) -> None:
+        """Closes the temporary file and moves it into place."""
+        self._close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self) -> None:
+        """Closes and removes the temporary file, leaving any existing destination untouched."""
+        try:
+            self._close()
+        finally:
+            if os.path.isfile(self.temp_path):
+                os.remove(self.temp_path)
+
+    def __enter__(self) -> "ZoneWriter":
+        """Returns the writer.
+
+        Returns:
+            ZoneWriter: This writer.
+        """
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Moves the file into place, or removes it when the block raised.
+
+        Args:
+            exc_type (Any): The exception type raised in the block, if any.
+            exc_value (Any): The exception raised in the block, if any.
+            traceback (Any): The traceback of the exception, if any.
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class NDJSONWriter(ZoneWriter):
+    """Writes one JSON object per record per line."""
+
+    EXTENSION: AnyStr = ".ndjson"
+
+    def __init__(self, path: AnyStr) -> None:
+        """Opens a temporary file next to the destination.
+
+        Args:
+            path (AnyStr): The destination file.
+        """
+        super().__init__(path)
+        self._file = open(self.temp_path, "w", encoding="utf-8")
+
+    def write_batch(self, batch: ZoneBatch) -> None:
+        """Writes a batch of records, sorted by name.
+
+        Args:
+            batch (ZoneBatch): The records to write.
+        """
+        dumps = json.dumps
+        names = batch.names
+        lines = []
+        for index in sorted(range(len(batch)), key=names.__getitem__):
+            record = batch[index]
+            lines.append(
+                dumps(
+                    {
+                        "zone_name": record.zone_name,
+                        "dns_record": record.dns_record,
+                        "ttl": record.ttl,
+                        "record_class": record.record_class,
+                        "record_type": record.record_type,
+                        "record_data": record.record_data,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+        self.count += len(lines)
+
+    def _close(self) -> None:
+        """Closes the temporary file."""
+        self._file.close()
+
+
+class ArrowZoneWriter(ZoneWriter):
+    """Base class for writers that convert batches to Arrow record batches."""
+
+    def __init__(self, path: AnyStr) -> None:
+        """Builds the Arrow schema shared by every batch.
+
+        Args:
+            path (AnyStr): The destination file.
+        """
+        super().__init__(path)
+        pa = self.pa = _import_pyarrow()
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        self.schema = pa.schema(
+            [
+                ("zone_name", dictionary),
+                ("dns_record", pa.large_string()),
+                ("ttl", pa.int64()),
+                ("record_class", dictionary),
+                ("record_type", dictionary),
+                ("record_data", pa.large_string()),
+            ]
+        )
+
+    def _dictionary(self, codes: Any, values: List[AnyStr]) -> Any:
+        """Builds a dictionary array from a batch's codes and lookup table.
+
+        Args:
+            codes (Any): The Arrow array of integer codes.
+            values (List[AnyStr]): The lookup table, where None marks a missing value.
+
+        Returns:
+            Any: A dictionary array with int32 indices.
+        """
+        pa = self.pa
+        indices = codes.cast(pa.int32())
+        if None in values:
+            null_code = pa.scalar(values.index(None), pa.int32())
+            indices = pa.compute.if_else(pa.compute.equal(indices, null_code), None, indices)
+        dictionary = pa.array([value if value is not None else "" for value in values], pa.string())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    def to_record_batch(self, batch: ZoneBatch) -> Any:
+        """Converts a batch to an Arrow record batch sorted by name.
+
+        The name, record data and TTL columns wrap the batch's buffers without copying.
+
+        Args:
+            batch (ZoneBatch): The records to convert.
+
+        Returns:
+            Any: The pyarrow RecordBatch.
+        """
+        pa = self.pa
+        length = len(batch)
+
+        def strings(column: Any) -> Any:
+            return pa.LargeStringArray.from_buffers(length, pa.py_buffer(column.offsets), pa.py_buffer(column.data))
+
+        def numbers(values: Any, type: Any) -> Any:
+            return pa.Array.from_buffers(type, length, [None, pa.py_buffer(values)])
+
+        ttls = numbers(batch.ttls, pa.int64())
+        ttls = pa.compute.if_else(pa.compute.equal(ttls, -1), None, ttls)
+        zone_names = pa.DictionaryArray.from_arrays(
+            pa.array([0] * length, pa.int32()), pa.array([batch.zone_name], pa.string())
+        )
+        record_batch = pa.RecordBatch.from_arrays(
+            [
+                zone_names,
+                strings(batch.names),
+                ttls,
+                self._dictionary(numbers(batch.class_codes, pa.uint8()), batch.classes),
+                self._dictionary(numbers(batch.type_codes, pa.uint16()), batch.types),
+                strings(batch.record_data),
+            ],
+            schema=self.schema,
+        )
+        return record_batch.take(pa.compute.sort_indices(record_batch.column(1)))
+
+
+class ParquetWriter(ArrowZoneWriter):
+    """Writes each batch as a Parquet row group."""
+
+    EXTENSION: AnyStr = ".parquet"
+
+    def __init__(self, path: AnyStr, compression: AnyStr = "zstd") -> None:
+        """Opens a Parquet writer on a temporary file next to the destination.
+
+        Args:
+            path (AnyStr): The destination file.
+            compression (AnyStr): The Parquet compression codec. Defaults to 'zstd'.
+        """
+        super().__init__(path)
+        import pyarrow.parquet
+
+        self._writer = pyarrow.parquet.ParquetWriter(
+            self.temp_path,
+            self.schema,
+            compression=compression,
+            use_dictionary=["zone_name", "record_class", "record_type"],
+        )
+
+    def write_batch(self, batch: ZoneBatch) -> None:
+        """Writes a batch of records as one row group.
+
+        Args:
+            batch (ZoneBatch): The records to write.
+        """
+        if len(batch):
+            self._writer.write_batch(self.to_record_batch(batch))
+            self.count += len(batch)
+
+    def _close(self) -> None:
+        """Writes the Parquet footer and closes the temporary file."""
+        self._writer.close()
+
+
+class ArrowWriter(ArrowZoneWriter):
+    """Writes each batch as a record batch in an Arrow IPC stream.
+
+    The IPC stream format is used rather than the file format because each batch carries
+    its own class and type dictionaries, and only streams allow a dictionary to be replaced
+    between batches. Read the output with `pyarrow.ipc.open_stream`.
+    """
+
+    EXTENSION: AnyStr = ".arrows"
+
+    def __init__(self, path: AnyStr) -> None:
+        """Opens an Arrow IPC stream on a temporary file next to the destination.
+
+        Args:
+            path (AnyStr): The destination file.
+        """
+        super().__init__(path)
+        self._sink = self.pa.OSFile(self.temp_path, "wb")
+        self._writer = self.pa.ipc.new_stream(self._sink, self.schema)
+
+    def write_batch(self, batch: ZoneBatch) -> None:
+        """Writes a batch of records as one record batch.
+
+        Args:
+            batch (ZoneBatch): The records to write.
+        """
+        if len(batch):
+            self._writer.write_batch(self.to_record_batch(batch))
+            self.count += len(batch)
+
+    def _close(self) -> None:
+        """Writes the end of stream marker and closes the temporary file."""
+        self._writer.close()
+        self._sink.close()
+
+
+WRITERS: Dict[AnyStr, type] = {"ndjson": NDJSONWriter, "parquet": ParquetWriter, "arrow": ArrowWriter}
+
+# The number of records per row group.
+ROW_GROUP_SIZE: int = 131072
+
+
+def get_writer(output_format: AnyStr) -> type:
+    """Returns the writer class for an export format.
+
+    Args:
+        output_format (AnyStr): One of 'ndjson', 'parquet' or 'arrow'.
+
+    Raises:
+        UnsupportedTypeError: Raises when the format is not an export format.
+
+    Returns:
+        type: The ZoneWriter subclass.
+    """
+    try:
+        return WRITERS[output_format]
+    except KeyError:
+        raise UnsupportedTypeError(
+            f"Unsupported export format '{output_format}'. Supported formats are {', '.join(WRITERS)}."
+        ) from None
+
+
+def export_path(directory: AnyStr, zone_name: AnyStr, output_format: AnyStr) -> AnyStr:
+    """Returns where a zone is exported to in a directory.
+
+    Args:
+        directory (AnyStr): The output directory.
+        zone_name (AnyStr): The zone name.
+        output_format (AnyStr): One of 'ndjson', 'parquet' or 'arrow'.
+
+    Returns:
+        AnyStr: The path `<directory>/<zone><extension>`.
+    """
+    return os.path.join(directory, zone_name + get_writer(output_format).EXTENSION)
+
+
+def export_batches(batches: Iterable[ZoneBatch], path: AnyStr, output_format: AnyStr) -> int:
+    """Writes batches of zone records to a file as they are produced.
+
+    Args:
+        batches (Iterable[ZoneBatch]): The records to write, one row group per batch.
+        path (AnyStr): The destination file. It is only replaced once every batch is written.
+        output_format (AnyStr): One of 'ndjson', 'parquet' or 'arrow'.
+
+    Returns:
+        int: The number of records written.
+    """
+    with get_writer(output_format)(path) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return writer.count
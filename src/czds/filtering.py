@@ -0,0 +1,224 @@
+"""Record filters pushed down to the raw bytes of a zone file.
+
+Most consumers of a zone only want a few record types, such as NS and DS, or the names
+under a handful of domains. Decoding, splitting and parsing every line just to throw most of
+them away dominates the cost of streaming a zone, so a `RecordFilter` selects lines from
+each decompressed block while it is still bytes.
+
+Regular expressions compiled from the wanted names and types find candidate lines in the
+block in C. Only those lines are checked in full against the filter, and only the lines that
+pass are decoded and parsed. When a filter discards most of the zone, streaming runs close
+to the speed of decompression.
+
+Sets of names and suffixes are compiled into a trie shaped pattern, the regular expression
+equivalent of an Aho-Corasick automaton, so matching cost does not grow with the set size
+the way trying each name in turn would.
+"""
+
+import re
+from typing import Any
+from typing import AnyStr
+from typing import Iterable
+from typing import Optional
+
+from .base import Base
+
+
+# A type is preceded by the owner name and up to two TTL or class fields.
+TTL_OR_CLASS = rb"(?:\d+|in|ch|hs|cs)[ \t]+"
+
+
+def _trie_pattern(words: Iterable[bytes]) -> bytes:
+    """Compiles words into a regular expression alternation shaped like a trie.
+
+    Args:
+        words (Iterable[bytes]): The words to match.
+
+    Returns:
+        bytes: The pattern source.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[None] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict) -> bytes:
+    """Returns the pattern matching every word below a trie node.
+
+    Args:
+        node (dict): The trie node, whose `None` key marks the end of a word.
+
+    Returns:
+        bytes: The pattern source.
+    """
+    branches = [re.escape(bytes([byte])) + _node_pattern(child) for byte, child in node.items() if byte is not None]
+    if not branches:
+        return b""
+    if len(branches) == 1 and None not in node:
+        return branches[0]
+    return b"(?:" + b"|".join(sorted(branches)) + b")" + (b"?" if None in node else b"")
+
+
+def _names(values: Iterable[AnyStr]) -> list:
+    """Normalizes names to lower case bytes without a trailing dot.
+
+    Args:
+        values (Iterable[AnyStr]): The names.
+
+    Returns:
+        list: The normalized names.
+    """
+    return [value.lower().rstrip(".").encode("utf-8") for value in values]
+
+
+class RecordFilter(Base):
+    """Selects the lines of a zone file by record type and owner name before they are parsed."""
+
+    def __init__(
+        self,
+        record_types: Iterable[AnyStr] = None,
+        names: Iterable[AnyStr] = None,
+        suffixes: Iterable[AnyStr] = None,
+        pattern: Any = None,
+    ) -> None:
+        """Compiles a filter. A record must pass every criterion given.
+
+        Args:
+            record_types (Iterable[AnyStr]): Keep records of these types, such as ['NS', 'DS']. Defaults to all types.
+            names (Iterable[AnyStr]): Keep records owned by exactly these names. Defaults to None.
+            suffixes (Iterable[AnyStr]): Keep records owned by these names or any name below them. Defaults to None.
+            pattern (Any): Keep records whose owner name matches this regular expression, as a string, bytes
+                or compiled pattern. It is searched for in the name without its trailing dot. Defaults to None.
+        """
+        self.record_types = sorted({record_type.upper() for record_type in record_types or ()})
+        self.names = _names(names or ())
+        self.suffixes = _names(suffixes or ())
+        if isinstance(pattern, (str, bytes)):
+            pattern = re.compile(pattern, re.IGNORECASE)
+        self.pattern = pattern
+        self._decode_name = pattern is not None and isinstance(pattern.pattern, str)
+
+        name = rb"[^\s;$]\S*"
+        scans = []
+        if self.names or self.suffixes:
+            alternatives = []
+            if self.suffixes:
+                suffixes = _trie_pattern(self.suffixes)
+                alternatives.append(rb"(?:\S*\.)?" + suffixes)
+                scans.append(rb"\." + suffixes + rb"\.?[ \t]")
+            names = _trie_pattern(self.names + self.suffixes)
+            alternatives.append(_trie_pattern(self.names))
+            name = rb"(?:" + rb"|".join(alternative for alternative in alternatives if alternative) + rb")\.?"
+            scans.append(rb"\n" + names + rb"\.?[ \t]")
+        types = b""
+        if self.record_types:
+            type_pattern = _trie_pattern(record_type.lower().encode() for record_type in self.record_types)
+            types = rb"[ \t]+(?:" + TTL_OR_CLASS + rb"){0,2}" + type_pattern + rb"(?=[ \t])"
+            if not scans:
+                scans = [rb"\t" + type_pattern + rb"[ \t]", rb" " + type_pattern + rb"[ \t]"]
+        self._line = re.compile(rb"(?P<name>" + name + rb")(?=[ \t])" + types, re.IGNORECASE)
+        # Finds every wanted line of a block, preceded by its newline, in a single call.
+        self._finder = re.compile(rb"\n(?:" + name + rb")(?=[ \t])" + types + rb"[^\n]*", re.IGNORECASE)
+        # Each scan starts with a literal byte, which lets the regex engine skip ahead in C.
+        self._scans = [re.compile(scan, re.IGNORECASE) for scan in scans]
+        # Whether the last block kept so many lines that finding them beats scanning for them.
+        self._dense = False
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter keeps every record.
+
+        Returns:
+            bool: True when no criteria were given.
+        """
+        return not (self.record_types or self.names or self.suffixes or self.pattern is not None)
+
+    def accepts(self, line: bytes) -> bool:
+        """Checks a single line against every criterion of the filter.
+
+        Args:
+            line (bytes): A zone file line without its line ending.
+
+        Returns:
+            bool: True when the line holds a wanted record.
+        """
+        match = self._line.match(line)
+        if match is None:
+            return False
+        if self.pattern is None:
+            return True
+        name = match.group("name").rstrip(b".")
+        return self.pattern.search(name.decode("utf-8", errors="ignore") if self._decode_name else name) is not None
+
+    def select(self, data: bytes) -> bytes:
+        """Returns the wanted lines of a run of complete lines.
+
+        Candidate lines are found by scanning for the wanted names or types and only those
+        lines are checked in full. When more than a quarter of the previous block was kept,
+        the wanted lines are found with a single regular expression call instead, which is
+        cheaper than checking nearly every line one by one.
+
+        Args:
+            data (bytes): One or more complete lines separated by newlines.
+
+        Returns:
+            bytes: The wanted lines separated by newlines.
+        """
+        if self.pattern is None and self._dense:
+            found = self._finder.findall(b"\n" + data.replace(b"\r", b"") if b"\r" in data else b"\n" + data)
+            self._dense = len(found) * 4 > data.count(b"\n")
+            return b"".join(found)[1:]
+        accepts = self.accepts
+        if not self._scans:
+            return b"\n".join(line for line in data.split(b"\n") if accepts(line))
+        # Scans anchored on a newline cannot see the first line, so it is always checked.
+        starts = {0}
+        rfind = data.rfind
+        for scan in self._scans:
+            for match in scan.finditer(data):
+                starts.add(rfind(b"\n", 0, match.end() - 1) + 1)
+        selected = []
+        find = data.find
+        for start in sorted(starts):
+            end = find(b"\n", start)
+            line = data[start:] if end == -1 else data[start:end]
+            if accepts(line.rstrip(b"\r")):
+                selected.append(line)
+        if self.pattern is None:
+            self._dense = len(selected) * 4 > data.count(b"\n")
+        return b"\n".join(selected)
+
+
+def make_filter(record_types: Any = None, name_filter: Any = None) -> Optional[RecordFilter]:
+    """Builds a RecordFilter from the `record_types` and `name_filter` options of the public API.
+
+    Args:
+        record_types (Any): Record types as a list or a comma separated string, such as 'NS,DS'. Defaults to None.
+        name_filter (Any): A name, a list of names, or a compiled regular expression. Names starting with
+            '.' or '*.' match that name and every name below it, other names match exactly. A RecordFilter
+            is returned as is. Defaults to None.
+
+    Returns:
+        Optional[RecordFilter]: The filter, or None when neither option is given.
+    """
+    if isinstance(name_filter, RecordFilter):
+        return name_filter
+    if isinstance(record_types, str):
+        record_types = [record_type.strip() for record_type in record_types.split(",") if record_type.strip()]
+    names, suffixes, pattern = [], [], None
+    if isinstance(name_filter, re.Pattern):
+        pattern = name_filter
+    elif name_filter:
+        for name in [name_filter] if isinstance(name_filter, str) else name_filter:
+            if name.startswith("."):
+                suffixes.append(name[1:])
+            elif name.startswith("*."):
+                suffixes.append(name[2:])
+            else:
+                names.append(name)
+    record_filter = RecordFilter(record_types=record_types, names=names, suffixes=suffixes, pattern=pattern)
+    return None if record_filter.is_empty else record_filter
@@ -0,0 +1,244 @@
+"""Indexed random access into gzip compressed zone files.
+
+A stored `<tld>.txt.gz` is a single deflate stream, so normally every reader has to inflate
+it from the first byte. `GzipIndex` makes one sequential pass over the file that records
+deflate restart points (a zran style access point every `spacing` bytes, each carrying the
+32 KiB window needed to resume inflating there) and, alongside them, line-aligned
+checkpoints mapping line numbers to uncompressed offsets. Both are saved next to the zone:
+
+    <tld>.txt.gz.gzidx       deflate access points
+    <tld>.txt.gz.gzidx.json  line checkpoints and the size/mtime of the indexed file
+
+With the index, a reader can seek straight to any line range, and the file can be split
+into line-aligned segments that separate processes decompress in parallel.
+
+Python's `zlib` cannot prime an inflater at an arbitrary bit offset, so access points are
+created and used through the optional `indexed_gzip` package, installable with
+`pip install czds[indexed]`.
+"""
+
+import json
+import os
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from .base import Base
+
+
+def _import_indexed_gzip() -> Any:
+    """Imports indexed_gzip on first use so it stays an optional dependency.
+
+    Raises:
+        ImportError: Raises when indexed_gzip is not installed.
+
+    Returns:
+        Any: The indexed_gzip module.
+    """
+    try:
+        import indexed_gzip
+    except ImportError as ie:
+        raise ImportError("GzipIndex requires indexed_gzip. Install it with 'pip install czds[indexed]'.") from ie
+    return indexed_gzip
+
+
+def read_segment(path: AnyStr, index_path: AnyStr, start: int, end: int) -> bytes:
+    """Decompresses the uncompressed byte range [start, end) of an indexed gzip file.
+
+    This is a module level function so it can run in a worker process.
+
+    Args:
+        path (AnyStr): The gzip file.
+        index_path (AnyStr): The deflate access point index of the file.
+        start (int): The first uncompressed byte to return.
+        end (int): The uncompressed byte to stop before.
+
+    Returns:
+        bytes: The uncompressed data.
+    """
+    indexed_gzip = _import_indexed_gzip()
+    with indexed_gzip.IndexedGzipFile(path, index_file=index_path) as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+class GzipIndex(Base):
+    """Builds and reads the access point index of a gzip compressed zone file."""
+
+    INDEX_SUFFIX: AnyStr = ".gzidx"
+
+    def __init__(
+        self, path: AnyStr, spacing: int = 4 * 1024 * 1024, checkpoint_interval: int = 4 * 1024 * 1024
+    ) -> None:
+        """Loads the index of a zone file if one exists.
+
+        Args:
+            path (AnyStr): The path to the `.txt.gz` zone file.
+            spacing (int): Uncompressed bytes between deflate access points. Defaults to 4 MiB.
+            checkpoint_interval (int): Uncompressed bytes between line checkpoints. Defaults to 4 MiB.
+        """
+        self.path = path
+        self.index_path = path + self.INDEX_SUFFIX
+        self.metadata_path = self.index_path + ".json"
+        self.spacing = spacing
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.metadata: Dict[str, Any] = self._read_metadata()
+
+    def _read_metadata(self) -> Dict[str, Any]:
+        """Reads the line checkpoint sidecar.
+
+        Returns:
+            Dict[str, Any]: The sidecar contents, or an empty dictionary when it is missing or unreadable.
+        """
+        if not os.path.isfile(self.metadata_path):
+            return {}
+        try:
+            with open(self.metadata_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _source_stat(self) -> Dict[str, int]:
+        """Returns the size and modification time of the zone file.
+
+        Returns:
+            Dict[str, int]: The size and mtime in nanoseconds.
+        """
+        stat = os.stat(self.path)
+        return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+    @property
+    def is_current(self) -> bool:
+        """Whether the saved index was built from the zone file as it is on disk now.
+
+        Returns:
+            bool: True when the index exists and matches the zone file.
+        """
+        if not self.metadata or not os.path.isfile(self.index_path):
+            return False
+        stat = self._source_stat()
+        return all(self.metadata.get(key) == value for key, value in stat.items())
+
+    @property
+    def size(self) -> int:
+        """The uncompressed size of the zone file.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return self.metadata["size"]
+
+    @property
+    def lines(self) -> int:
+        """The number of lines in the zone file.
+
+        Returns:
+            int: The number of newline terminated lines.
+        """
+        return self.metadata["lines"]
+
+    @property
+    def checkpoints(self) -> List[Tuple[int, int]]:
+        """The line checkpoints of the zone file.
+
+        Returns:
+            List[Tuple[int, int]]: `(line number, uncompressed offset)` pairs, each offset at the start of a line.
+        """
+        return [tuple(checkpoint) for checkpoint in self.metadata["checkpoints"]]
+
+    def build(self, force: bool = False) -> "GzipIndex":
+        """Makes one sequential pass over the zone file and saves its index next to it.
+
+        Args:
+            force (bool): Rebuild the index even when the saved one is current. Defaults to False.
+
+        Returns:
+            GzipIndex: This index.
+        """
+        if self.is_current and not force:
+            return self
+        indexed_gzip = _import_indexed_gzip()
+        stat = self._source_stat()
+        checkpoints = [(0, 0)]
+        offset = lines = 0
+        next_checkpoint = self.checkpoint_interval
+        with indexed_gzip.IndexedGzipFile(self.path, spacing=self.spacing) as f:
+            while True:
+                block = f.read(Base.CHUNK_SIZE)
+                if not block:
+                    break
+                while offset + len(block) > next_checkpoint:
+                    position = block.find(b"\n", max(0, next_checkpoint - offset))
+                    if position == -1:
+                        next_checkpoint = offset + len(block)
+                        break
+                    line_start = offset + position + 1
+                    checkpoints.append((lines + block.count(b"\n", 0, position + 1), line_start))
+                    next_checkpoint = line_start + self.checkpoint_interval
+                lines += block.count(b"\n")
+                offset += len(block)
+            f.build_full_index()
+            temp_index_path = self.index_path + ".tmp"
+            f.export_index(temp_index_path)
+        os.replace(temp_index_path, self.index_path)
+        if checkpoints[-1][1] >= offset and len(checkpoints) > 1:
+            checkpoints.pop()
+        self.metadata = {**stat, "size": offset, "lines": lines, "checkpoints": checkpoints}
+        temp_metadata_path = self.metadata_path + ".tmp"
+        with open(temp_metadata_path, "w") as f:
+            json.dump(self.metadata, f)
+        os.replace(temp_metadata_path, self.metadata_path)
+        self.__logger.info("Indexed '%s': %d lines, %d checkpoints.", self.path, lines, len(checkpoints))
+        return self
+
+    def segments(self, count: int) -> List[Tuple[int, int]]:
+        """Splits the zone file into up to count line-aligned uncompressed byte ranges of similar size.
+
+        Args:
+            count (int): The number of segments wanted.
+
+        Returns:
+            List[Tuple[int, int]]: `(start, end)` uncompressed offsets covering the whole file.
+        """
+        offsets = [offset for _, offset in self.checkpoints]
+        count = max(1, min(count, len(offsets)))
+        starts = sorted({offsets[(len(offsets) * i) // count] for i in range(count)})
+        return list(zip(starts, starts[1:] + [self.size]))
+
+    def read(self, start: int, end: int) -> bytes:
+        """Decompresses an uncompressed byte range of the zone file.
+
+        Args:
+            start (int): The first uncompressed byte to return.
+            end (int): The uncompressed byte to stop before.
+
+        Returns:
+            bytes: The uncompressed data.
+        """
+        return read_segment(self.path, self.index_path, start, end)
+
+    def iter_lines(self, start_line: int = 0, stop_line: int = None) -> Iterator[AnyStr]:
+        """Yields the lines numbered [start_line, stop_line) without inflating the file from its start.
+
+        Args:
+            start_line (int): The first line number, counting from 0. Defaults to 0.
+            stop_line (int): The line number to stop before. Defaults to the end of the file.
+
+        Yields:
+            AnyStr: Each line without its trailing newline.
+        """
+        indexed_gzip = _import_indexed_gzip()
+        stop_line = self.lines if stop_line is None else min(stop_line, self.lines)
+        line, offset = max((c for c in self.checkpoints if c[0] <= start_line), default=(0, 0))
+        with indexed_gzip.IndexedGzipFile(self.path, index_file=self.index_path) as f:
+            f.seek(offset)
+            while line < stop_line:
+                data = f.readline()
+                if not data:
+                    break
+                if line >= start_line:
+                    yield data.rstrip(b"\r\n").decode("utf-8", errors="ignore")
+                line += 1
@@ -0,0 +1,270 @@
+"""Persistent domain index over the zone files in a directory.
+
+Answering "which NS records does example.tld have?" from a `.txt.gz` means inflating and
+scanning the whole zone. `DomainIndex` loads downloaded zones into an SQLite database next
+to them (`.czds-index.sqlite`), keyed by owner name, so a lookup is a single B-tree probe
+against a memory-mapped file.
+
+Each record is also stored under its reversed name, which turns suffix queries such as
+"every name ending in `paypal.com`" into the same kind of range scan as prefix queries.
+
+The index is maintained per zone: `update` only reloads zones whose file changed size or
+modification time since they were last indexed, replacing that zone's rows in one
+transaction so readers never see a half-loaded zone.
+"""
+
+import os
+import sqlite3
+from typing import AnyStr
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from .base import Base
+from .models import ZoneData
+from .parser import parse_records
+from .stream import iter_file_records
+from .stream import zone_name_from_path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS zones (
+    zone TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    source_size INTEGER NOT NULL,
+    source_mtime_ns INTEGER NOT NULL,
+    records INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    name TEXT NOT NULL,
+    reversed_name TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    ttl INTEGER,
+    record_class TEXT,
+    record_type TEXT NOT NULL,
+    record_data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (name);
+CREATE INDEX IF NOT EXISTS records_reversed_name ON records (reversed_name);
+CREATE INDEX IF NOT EXISTS records_zone ON records (zone);
+"""
+
+COLUMNS = "zone, name, ttl, record_class, record_type, record_data"
+
+
+def _prefix_range(prefix: AnyStr) -> tuple:
+    """Returns the half-open key range holding every string that starts with prefix.
+
+    Args:
+        prefix (AnyStr): A non-empty prefix.
+
+    Returns:
+        tuple: The inclusive lower and exclusive upper bounds.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class DomainIndex(Base):
+    """SQLite index of the records of every zone file in a directory."""
+
+    FILENAME: AnyStr = ".czds-index.sqlite"
+    # How much of the database file SQLite may memory-map.
+    MMAP_SIZE: int = 1024 * 1024 * 1024
+    INSERT_BATCH_SIZE: int = 65536
+
+    def __init__(self, directory: AnyStr) -> None:
+        """Opens, creating if needed, the index of a directory.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database."""
+        self.connection.close()
+
+    def __enter__(self) -> "DomainIndex":
+        """Returns the index.
+
+        Returns:
+            DomainIndex: This index.
+        """
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Closes the database.
+
+        Args:
+            *args (object): The exception details, if any.
+        """
+        self.close()
+
+    def zones(self) -> Dict[AnyStr, int]:
+        """Returns the indexed zones and how many records each holds.
+
+        Returns:
+            Dict[AnyStr, int]: The number of records keyed by zone name.
+        """
+        return dict(self.connection.execute("SELECT zone, records FROM zones ORDER BY zone"))
+
+    def is_current(self, path: AnyStr) -> bool:
+        """Whether a zone file is indexed as it is on disk now.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+
+        Returns:
+            bool: True when the file has not changed since it was indexed.
+        """
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT source_size, source_mtime_ns FROM zones WHERE zone = ?", (zone_name_from_path(path),)
+        ).fetchone()
+        return row == (stat.st_size, stat.st_mtime_ns)
+
+    def add_zone(self, path: AnyStr, force: bool = False) -> int:
+        """Replaces the indexed records of a zone with the records in its file.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            force (bool): Reload the zone even when the file has not changed. Defaults to False.
+
+        Returns:
+            int: The number of records loaded, or 0 when the zone was already current.
+        """
+        if not force and self.is_current(path):
+            return 0
+        zone_name = zone_name_from_path(path)
+        stat = os.stat(path)
+        count = 0
+        with self.connection:
+            self.connection.execute("DELETE FROM records WHERE zone = ?", (zone_name,))
+            rows = []
+            for name, ttl, record_class, record_type, record_data in parse_records(iter_file_records(path)):
+                name = name.lower()
+                rows.append(
+                    (name, name[::-1], zone_name, int(ttl) if ttl else None, record_class, record_type, record_data)
+                )
+                if len(rows) >= self.INSERT_BATCH_SIZE:
+                    count += self._insert(rows)
+                    rows = []
+            count += self._insert(rows)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO zones VALUES (?, ?, ?, ?, ?)",
+                (zone_name, path, stat.st_size, stat.st_mtime_ns, count),
+            )
+        self.__logger.info("Indexed %d records of '%s'.", count, zone_name)
+        return count
+
+    def _insert(self, rows: List[tuple]) -> int:
+        """Inserts a batch of record rows.
+
+        Args:
+            rows (List[tuple]): The rows to insert.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        self.connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def remove_zone(self, zone_name: AnyStr) -> None:
+        """Removes a zone from the index.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM records WHERE zone = ?", (zone_name,))
+            self.connection.execute("DELETE FROM zones WHERE zone = ?", (zone_name,))
+
+    def update(self, force: bool = False) -> Dict[AnyStr, int]:
+        """Brings the index in line with the `.txt.gz` zone files in the directory.
+
+        New and changed zones are (re)loaded and zones whose file is gone are removed.
+
+        Args:
+            force (bool): Reload every zone even when its file has not changed. Defaults to False.
+
+        Returns:
+            Dict[AnyStr, int]: The number of records loaded, keyed by the zones that were (re)loaded.
+        """
+        paths = {
+            zone_name_from_path(name): os.path.join(self.directory, name)
+            for name in sorted(os.listdir(self.directory))
+            if name.endswith(".txt.gz")
+        }
+        for zone_name in self.zones().keys() - paths.keys():
+            self.remove_zone(zone_name)
+        loaded = {}
+        for zone_name, path in paths.items():
+            count = self.add_zone(path, force=force)
+            if count:
+                loaded[zone_name] = count
+        return loaded
+
+    def _query(self, where: AnyStr, parameters: tuple, limit: int = None) -> Iterator[ZoneData]:
+        """Yields the records matching a condition.
+
+        Args:
+            where (AnyStr): The SQL condition.
+            parameters (tuple): The condition's parameters.
+            limit (int): The maximum number of records to yield. Defaults to no limit.
+
+        Yields:
+            ZoneData: Each matching record.
+        """
+        sql = f"SELECT {COLUMNS} FROM records WHERE {where}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        for row in self.connection.execute(sql, parameters):
+            yield ZoneData(*row)
+
+    def lookup(self, name: AnyStr, record_type: AnyStr = None) -> List[ZoneData]:
+        """Returns the records of an owner name.
+
+        Args:
+            name (AnyStr): The owner name, with or without a trailing dot.
+            record_type (AnyStr): Only return records of this type, such as 'NS'. Defaults to all types.
+
+        Returns:
+            List[ZoneData]: The records of the name.
+        """
+        name = name.rstrip(".").lower()
+        if record_type:
+            return list(self._query("name = ? AND record_type = ? COLLATE NOCASE", (name, record_type)))
+        return list(self._query("name = ?", (name,)))
+
+    def scan_prefix(self, prefix: AnyStr, limit: int = None) -> Iterator[ZoneData]:
+        """Yields the records of every name starting with prefix, in name order.
+
+        Args:
+            prefix (AnyStr): The start of the owner names.
+            limit (int): The maximum number of records to yield. Defaults to no limit.
+
+        Yields:
+            ZoneData: Each matching record.
+        """
+        low, high = _prefix_range(prefix.lower())
+        yield from self._query("name >= ? AND name < ? ORDER BY name", (low, high), limit=limit)
+
+    def scan_suffix(self, suffix: AnyStr, limit: int = None) -> Iterator[ZoneData]:
+        """Yields the records of every name ending with suffix.
+
+        Args:
+            suffix (AnyStr): The end of the owner names, such as 'paypal.com' or '-login.com'.
+            limit (int): The maximum number of records to yield. Defaults to no limit.
+
+        Yields:
+            ZoneData: Each matching record.
+        """
+        low, high = _prefix_range(suffix.rstrip(".").lower()[::-1])
+        yield from self._query(
+            "reversed_name >= ? AND reversed_name < ? ORDER BY reversed_name", (low, high), limit=limit
+        )
@@ -0,0 +1,198 @@
+"""Integrity checks for zone files.
+
+A `.txt.gz` zone ends with a gzip trailer holding the CRC32 and length (ISIZE) of the
+uncompressed data. `GzipChecker` inflates each block as it is written, which has zlib
+check every member's trailer, so a truncated or corrupt stream fails the download during
+the transfer instead of costing a second read of a multi-gigabyte file. The CRC32 recorded
+is read from the trailers zlib has just verified rather than computed a second time.
+
+`verify_file` runs the same checks over a file on disk. It compares the result with the size,
+SHA-256, CRC32 and uncompressed size recorded in the manifest when the zone was downloaded.
+"""
+
+import hashlib
+import os
+import struct
+import time
+import zlib
+from typing import Any
+from typing import AnyStr
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from .base import Base
+from .exceptions import CorruptDownloadError
+from .manifest import Manifest
+from .stream import zone_name_from_path
+
+
+# A gzip member ends with the CRC32 and the length modulo 2**32 of its uncompressed data.
+TRAILER = struct.Struct("<II")
+# The integrity values recorded in the manifest that `verify_file` compares against.
+CHECKED_FIELDS = ("size", "sha256", "crc32", "uncompressed_size")
+
+
+class GzipChecker(Base):
+    """Validates a gzip stream, including each member's CRC32 and ISIZE trailer, as it is fed in."""
+
+    def __init__(self, sink: Callable[[bytes], None] = None) -> None:
+        """Creates a checker for a new stream.
+
+        Args:
+            sink (Callable[[bytes], None]): Called with each block of decompressed data, so other consumers
+                can reuse it instead of inflating the stream again. Defaults to None.
+        """
+        self.sink = sink
+        self.uncompressed_size = 0
+        self.trailers: List[Tuple[int, int]] = []
+        self.error: AnyStr = None
+        # Seconds spent inflating, reported as the zone's decompression time.
+        self.seconds = 0.0
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        # The last bytes fed to the current member, which hold its trailer once it ends.
+        self._tail = b""
+
+    @property
+    def members(self) -> int:
+        """The number of complete gzip members checked so far.
+
+        Returns:
+            int: The number of members.
+        """
+        return len(self.trailers)
+
+    def _end_member(self, data: bytes) -> bytes:
+        """Records the trailer of the member that just ended and returns the bytes that follow it.
+
+        Args:
+            data (bytes): The block the member ended in.
+
+        Returns:
+            bytes: The bytes after the member's trailer.
+        """
+        unused = self._decompressor.unused_data
+        end = len(data) - len(unused)
+        self._tail = (self._tail + bytes(data[max(0, end - TRAILER.size) : end]))[-TRAILER.size :]
+        self.trailers.append(TRAILER.unpack(self._tail))
+        self._tail = b""
+        return unused
+
+    def _inflate(self, data: bytes) -> list:
+        """Decompresses the next block, following concatenated gzip members.
+
+        Args:
+            data (bytes): The next compressed block.
+
+        Returns:
+            list: The decompressed blocks.
+        """
+        output = []
+        while data:
+            if self._decompressor.eof:
+                # Some writers pad the stream with zeros after the last member.
+                if not bytes(data).strip(b"\x00"):
+                    break
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output.append(self._decompressor.decompress(data))
+            if self._decompressor.eof:
+                data = self._end_member(data)
+            else:
+                self._tail = (self._tail + bytes(data[-TRAILER.size :]))[-TRAILER.size :]
+                data = b""
+        return output
+
+    def feed(self, data: bytes) -> None:
+        """Checks the next block of the stream.
+
+        A corrupt stream is remembered rather than raised, so the caller can finish writing
+        and `finish` reports it.
+
+        Args:
+            data (bytes): The next block, as written to disk. A memoryview over a reused buffer is accepted.
+        """
+        if self.error is not None:
+            return
+        start = time.perf_counter()
+        try:
+            blocks = self._inflate(data)
+        except zlib.error as e:
+            self.error = str(e)
+            return
+        finally:
+            self.seconds += time.perf_counter() - start
+        sink = self.sink
+        for block in blocks:
+            self.uncompressed_size += len(block)
+            if sink is not None:
+                sink(block)
+
+    def finish(self) -> Dict[str, Any]:
+        """Checks that the stream ended on a complete, valid gzip member.
+
+        Raises:
+            CorruptDownloadError: Raises when the stream is corrupt or ends before its gzip trailer.
+
+        Returns:
+            Dict[str, Any]: The CRC32 from each member's trailer, as eight hex digits joined by commas,
+                and the size of the uncompressed data.
+        """
+        if self.error is None and not (self.members and self._decompressor.eof):
+            self.error = "the stream ends before its gzip trailer"
+        if self.error is not None:
+            raise CorruptDownloadError(f"Invalid gzip stream, {self.error}.")
+        return {
+            "crc32": ",".join(f"{crc32:08x}" for crc32, _ in self.trailers),
+            "uncompressed_size": self.uncompressed_size,
+        }
+
+
+def verify_file(path: AnyStr, expected: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Checks a zone file on disk, and that it matches the values recorded when it was downloaded.
+
+    Args:
+        path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+        expected (Dict[str, Any]): The recorded size, sha256, crc32 and uncompressed_size. Values that are
+            missing are not compared. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: The path, size, sha256 and, for gzip files, crc32 and uncompressed_size of the file,
+            whether it is `valid` and the `errors` found.
+    """
+    digest = hashlib.sha256()
+    checker = GzipChecker() if path.endswith(".gz") else None
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(Base.CHUNK_SIZE), b""):
+            digest.update(block)
+            size += len(block)
+            if checker is not None:
+                checker.feed(block)
+    result = {"path": path, "size": size, "sha256": digest.hexdigest(), "errors": []}
+    if checker is not None:
+        try:
+            result.update(checker.finish())
+        except CorruptDownloadError as e:
+            result["errors"].append(str(e))
+    for name in CHECKED_FIELDS:
+        if (expected or {}).get(name) is not None and name in result and result[name] != expected[name]:
+            result["errors"].append(f"{name} is {result[name]}, expected {expected[name]}.")
+    result["valid"] = not result["errors"]
+    return result
+
+
+def expected_values(path: AnyStr) -> Dict[str, Any]:
+    """Returns the integrity values recorded in the manifest for a zone file.
+
+    Args:
+        path (AnyStr): The path to a zone file.
+
+    Returns:
+        Dict[str, Any]: The recorded values, or an empty dictionary when the file is not in its directory's manifest.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    entry = Manifest.for_directory(directory).get(zone_name_from_path(path))
+    if entry.get("filename") != os.path.basename(path):
+        return {}
+    return {name: entry[name] for name in CHECKED_FIELDS if name in entry}
@@ -0,0 +1,153 @@
+"""Local download manifest.
+
+The manifest lives next to the zone files in SAVE_PATH and records, per zone, the
+validators the server sent (ETag and Last-Modified) along with the size and checksum
+of the file we wrote. The connector uses it to make conditional requests and skip
+zones that have not changed since the last run.
+"""
+
+import json
+import os
+import threading
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+
+from .base import Base
+
+
+class Manifest(Base):
+    """Thread-safe, per-directory record of downloaded zone files."""
+
+    FILENAME: AnyStr = ".czds-manifest.json"
+
+    _instances: Dict[AnyStr, "Manifest"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: AnyStr) -> None:
+        """Loads the manifest for the provided directory.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self._lock = threading.Lock()
+        self.entries: Dict[AnyStr, Dict[str, Any]] = self._read_from_disk()
+
+    @classmethod
+    def for_directory(cls, directory: AnyStr) -> "Manifest":
+        """Returns the shared manifest for a directory so all threads update the same instance.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+
+        Returns:
+            Manifest: The manifest for the directory.
+        """
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(directory)
+            return cls._instances[key]
+
+    def _read_from_disk(self) -> Dict[AnyStr, Dict[str, Any]]:
+        """Reads the manifest file, returning an empty manifest when it is missing or unreadable.
+
+        Returns:
+            Dict[AnyStr, Dict[str, Any]]: The manifest entries keyed by zone name.
+        """
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.__logger.warning("Ignoring unreadable manifest '%s'. %s", self.path, e)
+            return {}
+
+    def _save_to_disk(self) -> None:
+        """Atomically writes the manifest so a crash never leaves a half written file."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def get(self, zone_name: AnyStr) -> Dict[str, Any]:
+        """Returns the manifest entry for a zone.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            Dict[str, Any]: The entry, or an empty dictionary when the zone has not been downloaded.
+        """
+        with self._lock:
+            return dict(self.entries.get(zone_name, {}))
+
+    def update(self, zone_name: AnyStr, **entry: Any) -> None:
+        """Records a completed download and saves the manifest.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+            **entry (Any): The values to record such as filename, etag, last_modified, size and sha256.
+        """
+        with self._lock:
+            self.entries[zone_name] = {**self.entries.get(zone_name, {}), **entry}
+            self._save_to_disk()
+
+    def is_current(self, zone_name: AnyStr) -> bool:
+        """Returns whether the file recorded for a zone is still on disk with the recorded size.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            bool: True when the local copy matches the manifest entry.
+        """
+        entry = self.get(zone_name)
+        if not entry.get("filename"):
+            return False
+        path = os.path.join(self.directory, entry["filename"])
+        return os.path.isfile(path) and os.path.getsize(path) == entry.get("size")
+
+    def conditional_headers(self, zone_name: AnyStr) -> Dict[str, str]:
+        """Returns If-None-Match/If-Modified-Since headers for a zone whose local copy is current.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+
+        Returns:
+            Dict[str, str]: The conditional request headers, empty when a full download is needed.
+        """
+        if not self.is_current(zone_name):
+            return {}
+        entry = self.get(zone_name)
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, zone_name: AnyStr, etag: AnyStr = None, last_modified: AnyStr = None) -> bool:
+        """Returns whether the validators from a response match a current local copy.
+
+        This catches servers that ignore conditional request headers and answer with a 200.
+
+        Args:
+            zone_name (AnyStr): The zone name.
+            etag (AnyStr): The ETag header from the response. Defaults to None.
+            last_modified (AnyStr): The Last-Modified header from the response. Defaults to None.
+
+        Returns:
+            bool: True when the zone does not need to be downloaded again.
+        """
+        if not self.is_current(zone_name):
+            return False
+        entry = self.get(zone_name)
+        if etag and entry.get("etag"):
+            return etag == entry["etag"]
+        if last_modified and entry.get("last_modified"):
+            return last_modified == entry["last_modified"]
+        return False
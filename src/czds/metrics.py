@@ -0,0 +1,245 @@
+"""Download and parsing metrics.
+
+Setting `Base.METRICS`, or passing `metrics=True` to `CZDS`, makes the connector report what
+it does for each zone: bytes transferred, time to first byte, download, decompression and
+parse time, records parsed, retries and the last HTTP status. Pool-wide gauges track the
+downloads in flight and the zones still queued for a worker.
+
+`Metrics` keeps these in memory and renders them as a JSON summary or in the Prometheus
+text format. It is also the hook interface: a subclass can override `add`, `set` and `gauge`
+to forward values to another system. With `Base.METRICS` unset, each instrumented point
+costs a single attribute check.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+from typing import AnyStr
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+
+from .base import Base
+
+
+# Per-zone values, their Prometheus type and help text. Counters are summed, the others keep the last value.
+ZONE_METRICS: Dict[str, tuple] = {
+    "bytes": ("counter", "Compressed bytes transferred."),
+    "time_to_first_byte_seconds": ("gauge", "Seconds from sending the request to receiving the response headers."),
+    "download_seconds": (
+        "counter",
+        "Seconds from starting a zone download to finishing it, containing the other timers.",
+    ),
+    "decompress_seconds": (
+        "counter",
+        "Seconds inflating a raw gzip download to validate it, excluding network reads. Does not overlap parse_seconds.",
+    ),
+    "parse_seconds": (
+        "counter",
+        "Seconds streaming a download into text, JSON or an export file: its reads, inflation, parsing and writes.",
+    ),
+    "records": ("counter", "Records parsed."),
+    "retries": ("counter", "Requests and downloads retried."),
+    "status": ("gauge", "HTTP status of the last response."),
+}
+GAUGES: Dict[str, AnyStr] = {
+    "in_flight": "Zone downloads in progress.",
+    "queue_depth": "Zones waiting for a worker.",
+}
+
+
+class Metrics(Base):
+    """Collects per-zone metrics and pool-wide gauges, safely across threads."""
+
+    FILENAME: AnyStr = ".czds-metrics.json"
+    PREFIX: AnyStr = "czds"
+
+    def __init__(self) -> None:
+        """Starts with no recorded zones."""
+        self.zones: Dict[AnyStr, Dict[str, Any]] = {}
+        self.gauges: Dict[str, float] = dict.fromkeys(GAUGES, 0)
+        self.responses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    def _zone(self, zone_name: AnyStr = None) -> Dict[str, Any]:
+        """Returns the values of a zone, or of the zone the calling thread is tracking.
+
+        Args:
+            zone_name (AnyStr): The zone. Defaults to the zone tracked by the calling thread.
+
+        Returns:
+            Dict[str, Any]: The zone's values, or a throwaway dictionary when no zone is known.
+        """
+        zone_name = zone_name or getattr(self._current, "zone_name", None)
+        if zone_name is None:
+            return {}
+        return self.zones.setdefault(zone_name, {})
+
+    def add(self, name: str, value: float, zone_name: AnyStr = None) -> None:
+        """Adds to a per-zone counter.
+
+        Args:
+            name (str): The counter, one of ZONE_METRICS.
+            value (float): The amount to add.
+            zone_name (AnyStr): The zone. Defaults to the zone tracked by the calling thread.
+        """
+        with self._lock:
+            values = self._zone(zone_name)
+            values[name] = values.get(name, 0) + value
+
+    def set(self, name: str, value: Any, zone_name: AnyStr = None) -> None:
+        """Sets a per-zone value.
+
+        Args:
+            name (str): The value, one of ZONE_METRICS.
+            value (Any): The new value.
+            zone_name (AnyStr): The zone. Defaults to the zone tracked by the calling thread.
+        """
+        with self._lock:
+            self._zone(zone_name)[name] = value
+            if name == "status":
+                self.responses[value] = self.responses.get(value, 0) + 1
+
+    def gauge(self, name: str, delta: float) -> None:
+        """Moves a pool-wide gauge.
+
+        Args:
+            name (str): The gauge, one of GAUGES.
+            delta (float): The amount to move it by.
+        """
+        with self._lock:
+            self.gauges[name] = self.gauges.get(name, 0) + delta
+
+    @contextmanager
+    def track(self, zone_name: AnyStr) -> Iterator[None]:
+        """Attributes everything the calling thread reports inside a with block to a zone.
+
+        The block counts as an in flight download and its duration as download time.
+
+        Args:
+            zone_name (AnyStr): The zone being downloaded.
+
+        Yields:
+            None: Control to the with block.
+        """
+        self._current.zone_name = zone_name
+        self.gauge("in_flight", 1)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add("download_seconds", time.perf_counter() - start, zone_name=zone_name)
+            self.gauge("in_flight", -1)
+            self._current.zone_name = None
+
+    def queued(self, method: Callable, count: int) -> Callable:
+        """Counts items as queued until a worker calls method with them.
+
+        Args:
+            method (Callable): The method workers call with each item.
+            count (int): The number of items queued.
+
+        Returns:
+            Callable: A wrapper around method that takes its item off the queue depth.
+        """
+        self.gauge("queue_depth", count)
+
+        def dequeue(item: Any) -> Any:
+            self.gauge("queue_depth", -1)
+            return method(item)
+
+        return dequeue
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns every recorded value, with the throughput of each zone.
+
+        Returns:
+            Dict[str, Any]: The `zones`, with `throughput` in bytes per second, the `gauges`, the count of
+                `responses` by HTTP status and the `totals` of the per-zone counters.
+        """
+        with self._lock:
+            zones = {zone_name: dict(values) for zone_name, values in sorted(self.zones.items())}
+            summary = {"zones": zones, "gauges": dict(self.gauges), "responses": dict(sorted(self.responses.items()))}
+        for values in zones.values():
+            if values.get("download_seconds"):
+                values["throughput"] = values.get("bytes", 0) / values["download_seconds"]
+        summary["totals"] = {
+            name: sum(values.get(name, 0) for values in zones.values())
+            for name, (kind, _) in ZONE_METRICS.items()
+            if kind == "counter"
+        }
+        return summary
+
+    def to_json(self) -> AnyStr:
+        """Renders the summary as JSON.
+
+        Returns:
+            AnyStr: The JSON document.
+        """
+        return json.dumps(self.summary(), indent=2)
+
+    def save(self, directory: AnyStr) -> AnyStr:
+        """Writes the JSON summary next to the zone files.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+
+        Returns:
+            AnyStr: The path of the summary.
+        """
+        path = os.path.join(directory, self.FILENAME)
+        with open(path, "w") as f:
+            f.write(self.to_json())
+        return path
+
+    @staticmethod
+    def _family(metric: AnyStr, kind: AnyStr, description: AnyStr, openmetrics: bool) -> list:
+        """Returns the HELP and TYPE lines of a metric family.
+
+        OpenMetrics names a counter family without the `_total` suffix its samples carry.
+
+        Args:
+            metric (AnyStr): The sample name.
+            kind (AnyStr): The metric type.
+            description (AnyStr): The help text.
+            openmetrics (bool): Whether to follow the OpenMetrics format.
+
+        Returns:
+            list: The two lines.
+        """
+        if openmetrics and kind == "counter":
+            metric = metric[: -len("_total")]
+        return [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+
+    def to_prometheus(self, openmetrics: bool = False) -> AnyStr:
+        """Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            openmetrics (bool): Follow the OpenMetrics format instead, which ends with `# EOF`. Defaults to False.
+
+        Returns:
+            AnyStr: The exposition text.
+        """
+        summary = self.summary()
+        lines = []
+        for name, (kind, description) in ZONE_METRICS.items():
+            metric = f"{self.PREFIX}_zone_{name}" + ("_total" if kind == "counter" else "")
+            lines += self._family(metric, kind, description, openmetrics)
+            for zone_name, values in summary["zones"].items():
+                if name in values:
+                    lines.append(f'{metric}{{zone="{zone_name}"}} {values[name]}')
+        metric = f"{self.PREFIX}_http_responses_total"
+        lines += self._family(metric, "counter", "HTTP responses by status.", openmetrics)
+        for status, count in summary["responses"].items():
+            lines.append(f'{metric}{{code="{status}"}} {count}')
+        for name, description in GAUGES.items():
+            metric = f"{self.PREFIX}_{name}"
+            lines += self._family(metric, "gauge", description, openmetrics)
+            lines.append(f"{metric} {summary['gauges'][name]}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
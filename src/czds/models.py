@@ -1,17 +1,201 @@
 """Contains data models around CZDS."""
 
+import sys
+from array import array
 from typing import AnyStr
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 from attrs import define
+from attrs import field
 
 
 @define
 class ZoneData:
-    """Data model for each zone data element."""
+    """Data model for each zone data element.
+
+    Instances are slotted, so a record costs a fixed handful of pointers instead of a dict.
+    The TTL is an integer (None when the record omits it) and the class and type are
+    interned strings shared by every record of the same kind.
+    """
 
     zone_name: AnyStr
     dns_record: AnyStr
-    ttl: AnyStr
-    record_class: AnyStr
+    ttl: Optional[int]
+    record_class: Optional[AnyStr]
     record_type: AnyStr
     record_data: AnyStr
+
+    @classmethod
+    def from_record(cls, zone_name: AnyStr, record: Tuple) -> "ZoneData":
+        """Creates a ZoneData from a `(name, ttl, class, type, rdata)` tuple produced by czds.parser.
+
+        Args:
+            zone_name (AnyStr): The zone the record belongs to.
+            record (Tuple): The parsed record.
+
+        Returns:
+            ZoneData: The record.
+        """
+        name, ttl, record_class, record_type, record_data = record
+        return cls(zone_name, name, int(ttl) if ttl is not None else None, record_class, record_type, record_data)
+
+
+class _StringColumn:
+    """Variable length strings stored back to back in one buffer and indexed by offset."""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self) -> None:
+        """Creates an empty column."""
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+
+    def append(self, value: AnyStr) -> None:
+        """Appends a string to the column.
+
+        Args:
+            value (AnyStr): The string to append.
+        """
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, index: int) -> AnyStr:
+        """Returns the string at a position.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            AnyStr: The decoded string.
+        """
+        return self.data[self.offsets[index] : self.offsets[index + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes held by the column.
+
+        Returns:
+            int: The size of the buffer and offsets.
+        """
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+
+@define
+class ZoneBatch:
+    """A columnar batch of zone records.
+
+    TTLs are held in a signed 64-bit array (-1 when the record omits it), classes and types
+    as small integer codes into per-batch lookup tables, and names and record data as
+    UTF-8 string buffers indexed by offset. A batch of a million records costs roughly the
+    size of its text plus a few bytes per record, instead of a Python object graph per record.
+    """
+
+    zone_name: AnyStr
+    ttls: array = field(factory=lambda: array("q"))
+    class_codes: array = field(factory=lambda: array("B"))
+    type_codes: array = field(factory=lambda: array("H"))
+    classes: List[Optional[AnyStr]] = field(factory=list)
+    types: List[AnyStr] = field(factory=list)
+    names: _StringColumn = field(factory=_StringColumn)
+    record_data: _StringColumn = field(factory=_StringColumn)
+    _class_index: Dict[Optional[AnyStr], int] = field(factory=dict, repr=False)
+    _type_index: Dict[AnyStr, int] = field(factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        """Returns the number of records in the batch.
+
+        Returns:
+            int: The number of records.
+        """
+        return len(self.ttls)
+
+    def append(self, record: Tuple) -> None:
+        """Appends a `(name, ttl, class, type, rdata)` tuple produced by czds.parser.
+
+        Args:
+            record (Tuple): The parsed record.
+        """
+        name, ttl, record_class, record_type, record_data = record
+        class_code = self._class_index.get(record_class)
+        if class_code is None:
+            class_code = self._class_index[record_class] = len(self.classes)
+            self.classes.append(record_class)
+        type_code = self._type_index.get(record_type)
+        if type_code is None:
+            type_code = self._type_index[record_type] = len(self.types)
+            self.types.append(sys.intern(record_type))
+        self.ttls.append(int(ttl) if ttl is not None else -1)
+        self.class_codes.append(class_code)
+        self.type_codes.append(type_code)
+        self.names.append(name)
+        self.record_data.append(record_data)
+
+    def extend(self, records: Iterable[Tuple]) -> None:
+        """Appends many parsed records.
+
+        Args:
+            records (Iterable[Tuple]): The parsed records.
+        """
+        for record in records:
+            self.append(record)
+
+    def __getitem__(self, index: int) -> ZoneData:
+        """Materializes a single row as a ZoneData record.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            ZoneData: The record.
+        """
+        if index < 0:
+            index += len(self)
+        ttl = self.ttls[index]
+        return ZoneData(
+            self.zone_name,
+            self.names[index],
+            ttl if ttl >= 0 else None,
+            self.classes[self.class_codes[index]],
+            self.types[self.type_codes[index]],
+            self.record_data[index],
+        )
+
+    def __iter__(self) -> Iterator[ZoneData]:
+        """Iterates over the batch as ZoneData records.
+
+        Yields:
+            ZoneData: Each record.
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate number of bytes held by the batch's columns.
+
+        Returns:
+            int: The size of all columns.
+        """
+        arrays = (self.ttls, self.class_codes, self.type_codes)
+        return sum(a.itemsize * len(a) for a in arrays) + self.names.nbytes + self.record_data.nbytes
+
+
+@define
+class ZoneChange:
+    """The difference in one delegation between two snapshots of a zone.
+
+    `change` is 'added' when the name only exists in the new snapshot, 'removed' when it
+    only exists in the old one and 'changed' when its records differ. Records are compared
+    as `TYPE rdata` strings.
+    """
+
+    zone_name: AnyStr
+    name: AnyStr
+    change: AnyStr
+    added: List[AnyStr] = field(factory=list)
+    removed: List[AnyStr] = field(factory=list)
@@ -0,0 +1,246 @@
+"""Multi-process parsing pipeline for large zone files.
+
+Tokenizing a zone like `.com` on one core is CPU bound under the GIL. `ParallelParser`
+keeps decompression in the calling process, cuts the decompressed stream into line-aligned
+work units of roughly `unit_size` bytes and parses the units across a process pool. Each
+worker either returns compact `ZoneBatch` objects or writes its records straight to its own
+output shard, so only raw bytes, not Python objects, cross process boundaries on the way in.
+
+The number of units in flight is bounded, so memory stays proportional to
+`workers * unit_size` regardless of the size of the zone.
+
+When a `.txt.gz` file has a current `GzipIndex` sidecar, decompression moves into the
+workers too: each one seeks to a line-aligned segment of the file and inflates only that.
+"""
+
+import os
+from collections import deque
+from typing import AnyStr
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from .base import Base
+from .filtering import RecordFilter
+from .gzindex import GzipIndex
+from .gzindex import read_segment
+from .models import ZoneBatch
+from .parser import parse_batches
+from .parser import parse_records
+from .stream import is_compressed
+from .stream import iter_blocks
+from .stream import zone_name_from_path
+
+
+def _lines(data: bytes) -> List[AnyStr]:
+    """Decodes a line-aligned work unit into its lines.
+
+    Args:
+        data (bytes): The work unit.
+
+    Returns:
+        List[AnyStr]: The lines of the unit.
+    """
+    text = data.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r", "")
+    return text.split("\n")
+
+
+def _parse_unit(data: bytes, zone_name: AnyStr, batch_size: int, record_filter: RecordFilter = None) -> List[ZoneBatch]:
+    """Parses a work unit into batches. Runs in a worker process.
+
+    Args:
+        data (bytes): The work unit.
+        zone_name (AnyStr): The zone the unit belongs to.
+        batch_size (int): The maximum number of records per batch.
+        record_filter (RecordFilter): Only parse the lines this filter selects. Defaults to None.
+
+    Returns:
+        List[ZoneBatch]: The parsed batches.
+    """
+    if record_filter is not None:
+        data = record_filter.select(data)
+    return list(parse_batches(_lines(data), zone_name=zone_name, batch_size=batch_size))
+
+
+def _write_unit(data: bytes, shard_prefix: AnyStr) -> Tuple[AnyStr, int]:
+    """Parses a work unit and appends its records to this worker's shard. Runs in a worker process.
+
+    Records are written as tab separated `name ttl class type rdata` lines, with empty fields
+    for an omitted TTL or class.
+
+    Args:
+        data (bytes): The work unit.
+        shard_prefix (AnyStr): The shard path prefix; the worker's process id and `.tsv` are appended.
+
+    Returns:
+        Tuple[AnyStr, int]: The path of the shard and the number of records written to it.
+    """
+    count = 0
+    shard_path = f"{shard_prefix}.{os.getpid()}.tsv"
+    with open(shard_path, "a", encoding="utf-8") as f:
+        write = f.write
+        for name, ttl, record_class, record_type, record_data in parse_records(_lines(data)):
+            write(f"{name}\t{ttl or ''}\t{record_class or ''}\t{record_type}\t{record_data}\n")
+            count += 1
+    return shard_path, count
+
+
+def _count_unit(data: bytes) -> int:
+    """Parses a work unit and returns how many records it holds. Runs in a worker process.
+
+    Args:
+        data (bytes): The work unit.
+
+    Returns:
+        int: The number of records parsed.
+    """
+    return sum(1 for _ in parse_records(_lines(data)))
+
+
+def _indexed_unit(function: object, path: AnyStr, index_path: AnyStr, start: int, end: int, *args: object) -> object:
+    """Decompresses one segment of an indexed gzip file and runs a unit function on it. Runs in a worker process.
+
+    Args:
+        function (object): The unit function to run on the segment.
+        path (AnyStr): The gzip file.
+        index_path (AnyStr): The deflate access point index of the file.
+        start (int): The first uncompressed byte of the segment.
+        end (int): The uncompressed byte to stop before.
+        *args (object): Additional arguments passed to the function after the segment.
+
+    Returns:
+        object: The result of the function.
+    """
+    return function(read_segment(path, index_path, start, end), *args)
+
+
+class ParallelParser(Base):
+    """Parses zone files across a pool of worker processes."""
+
+    def __init__(self, workers: int = None, unit_size: int = 8 * 1024 * 1024) -> None:
+        """Configures the pool.
+
+        Args:
+            workers (int): The number of worker processes. Defaults to `os.cpu_count()`.
+            unit_size (int): The approximate size in bytes of each work unit. Defaults to 8 MiB.
+        """
+        self.workers = max(1, workers or os.cpu_count())
+        self.unit_size = max(1, unit_size)
+
+    def iter_units(self, path: AnyStr) -> Iterator[bytes]:
+        """Yields line-aligned units of the decompressed zone file.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+
+        Yields:
+            bytes: Each unit, ending just before a newline.
+        """
+        pending: List[bytes] = []
+        pending_size = 0
+        with open(path, "rb") as f:
+            for block in iter_blocks(f, compressed=is_compressed(f), block_size=min(Base.CHUNK_SIZE, self.unit_size)):
+                pending.append(block)
+                pending_size += len(block)
+                if pending_size < self.unit_size:
+                    continue
+                data = b"".join(pending)
+                end = data.rfind(b"\n")
+                if end == -1:
+                    pending, pending_size = [data], len(data)
+                    continue
+                yield data[:end]
+                pending = [data[end + 1 :]]
+                pending_size = len(pending[0])
+        if pending_size:
+            yield b"".join(pending)
+
+    def _map(self, function: object, path: AnyStr, *args: object) -> Iterator[object]:
+        """Submits each unit of a zone file to the pool and yields results in file order.
+
+        Args:
+            function (object): The module level function to run on each unit.
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            *args (object): Additional arguments passed to the function after the unit.
+
+        Yields:
+            object: The result of each unit.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        index = GzipIndex(path)
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if index.is_current:
+                count = max(self.workers, index.size // self.unit_size)
+                tasks = ((_indexed_unit, function, path, index.index_path, *s) for s in index.segments(count))
+            else:
+                tasks = ((function, unit) for unit in self.iter_units(path))
+            for task in tasks:
+                in_flight.append(executor.submit(*task, *args))
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def iter_batches(
+        self, path: AnyStr, zone_name: AnyStr = None, batch_size: int = 65536, record_filter: RecordFilter = None
+    ) -> Iterator[ZoneBatch]:
+        """Parses a zone file in parallel and yields its records as batches, in file order.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            zone_name (AnyStr): The zone the file belongs to. Defaults to the file name up to its first dot.
+            batch_size (int): The maximum number of records per batch. Defaults to 65536.
+            record_filter (RecordFilter): Only yield the records this filter selects. Lines are selected
+                in the workers before they are decoded. Defaults to None.
+
+        Yields:
+            ZoneBatch: Each batch of records.
+        """
+        zone_name = zone_name or zone_name_from_path(path)
+        for batches in self._map(_parse_unit, path, zone_name, batch_size, record_filter):
+            yield from batches
+
+    def write_shards(self, path: AnyStr, output_directory: AnyStr, zone_name: AnyStr = None) -> List[AnyStr]:
+        """Parses a zone file in parallel, each worker writing its records to its own shard.
+
+        Shards are named `<zone>.<pid>.tsv` in the output directory. Shards of the zone left
+        by an earlier run are removed first, so they are never mixed with this run's records.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+            output_directory (AnyStr): The directory to write shards to.
+            zone_name (AnyStr): The zone the file belongs to. Defaults to the file name up to its first dot.
+
+        Returns:
+            List[AnyStr]: The paths of the shards written.
+        """
+        zone_name = zone_name or zone_name_from_path(path)
+        os.makedirs(output_directory, exist_ok=True)
+        prefix = zone_name + "."
+        for name in os.listdir(output_directory):
+            if name.startswith(prefix) and name.endswith(".tsv") and name[len(prefix) : -4].isdigit():
+                os.remove(os.path.join(output_directory, name))
+        shards = set()
+        count = 0
+        for shard_path, records in self._map(_write_unit, path, os.path.join(output_directory, zone_name)):
+            shards.add(shard_path)
+            count += records
+        self.__logger.info(
+            "Wrote %d records of '%s' to %d shards in '%s'.", count, zone_name, len(shards), output_directory
+        )
+        return sorted(shards)
+
+    def count(self, path: AnyStr) -> int:
+        """Parses a zone file in parallel and returns the number of records it holds.
+
+        Args:
+            path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+
+        Returns:
+            int: The number of records.
+        """
+        return sum(self._map(_count_unit, path))
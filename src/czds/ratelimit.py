@@ -0,0 +1,224 @@
+"""Shared rate limiting and adaptive concurrency for CZDS API calls.
+
+One `RateLimiter` governs every connector in the process:
+
+* A token bucket spaces out requests to `requests_per_second`, allowing bursts of up to
+  `burst` requests.
+* Concurrent zone downloads are capped by a limit that adapts AIMD style, like TCP
+  congestion control: each successful response raises it by `1 / limit`, about one extra
+  download per round of downloads, and a 429 or 503 halves it, at most once per second.
+* A `Retry-After` on a 429 or 503 pauses every request, not only the one that received it.
+
+Settings are resolved in order of precedence from arguments to `configure` (the CLI
+flags), the `CZDS_RATE_LIMIT`, `CZDS_RATE_BURST`, `CZDS_MAX_CONCURRENCY` and
+`CZDS_MIN_CONCURRENCY` environment variables, the `rate_limit` section of the
+configuration file and the defaults on `Base`.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+
+from .base import Base
+
+
+ENVIRONMENT_VARIABLES: Dict[str, str] = {
+    "requests_per_second": "CZDS_RATE_LIMIT",
+    "burst": "CZDS_RATE_BURST",
+    "max_concurrency": "CZDS_MAX_CONCURRENCY",
+    "min_concurrency": "CZDS_MIN_CONCURRENCY",
+}
+
+
+def parse_retry_after(value: AnyStr) -> Optional[float]:
+    """Converts a Retry-After header, in seconds or as an HTTP date, to a delay in seconds.
+
+    Args:
+        value (AnyStr): The header value.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _settings_from_config() -> Dict[str, Any]:
+    """Reads the `rate_limit` section of the configuration file, if there is one.
+
+    Returns:
+        Dict[str, Any]: The configured settings.
+    """
+    from .configuration import ConfigurationManager
+
+    path = os.path.expanduser(ConfigurationManager.CONFIG_PATH)
+    if not os.path.isfile(path):
+        return {}
+    data = ConfigurationManager.__new__(ConfigurationManager)._read_from_disk(path=path) or {}
+    return {key: value for key, value in (data.get("rate_limit") or {}).items() if value is not None}
+
+
+def _settings_from_environment() -> Dict[str, Any]:
+    """Reads rate limit settings from environment variables.
+
+    Returns:
+        Dict[str, Any]: The settings that are set.
+    """
+    return {key: os.environ[name] for key, name in ENVIRONMENT_VARIABLES.items() if os.environ.get(name)}
+
+
+class RateLimiter(Base):
+    """A token bucket and an AIMD concurrency limit shared by all CZDS API calls."""
+
+    # Multiplicative decrease applied to the concurrency limit when the server pushes back.
+    DECREASE_FACTOR: float = 0.5
+    # The minimum time between two decreases, so a burst of 429s counts as one signal.
+    DECREASE_COOLDOWN: float = 1.0
+    BACKOFF_STATUS_CODES: tuple = (429, 503)
+
+    _shared: "RateLimiter" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        requests_per_second: float = None,
+        burst: int = None,
+        max_concurrency: int = None,
+        min_concurrency: int = None,
+    ) -> None:
+        """Creates a limiter.
+
+        Args:
+            requests_per_second (float): The sustained request rate, 0 for unlimited. Defaults to `Base.RATE_LIMIT`.
+            burst (int): How many requests may be sent back to back. Defaults to `Base.RATE_BURST`.
+            max_concurrency (int): The most concurrent downloads. Defaults to `Base.MAX_CONCURRENCY`.
+            min_concurrency (int): The fewest concurrent downloads. Defaults to `Base.MIN_CONCURRENCY`.
+        """
+        self.requests_per_second = float(Base.RATE_LIMIT if requests_per_second is None else requests_per_second)
+        self.burst = max(1, int(Base.RATE_BURST if burst is None else burst))
+        self.max_concurrency = max(1, int(Base.MAX_CONCURRENCY if max_concurrency is None else max_concurrency))
+        self.min_concurrency = max(
+            1, min(self.max_concurrency, int(Base.MIN_CONCURRENCY if min_concurrency is None else min_concurrency))
+        )
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.tokens = float(self.burst)
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+
+    @classmethod
+    def configure(cls, **settings: Any) -> "RateLimiter":
+        """Replaces the shared limiter, resolving each setting from arguments, environment, config and defaults.
+
+        Args:
+            **settings (Any): Explicit `requests_per_second`, `burst`, `max_concurrency` or `min_concurrency`.
+
+        Returns:
+            RateLimiter: The new shared limiter.
+        """
+        resolved = {**_settings_from_config(), **_settings_from_environment()}
+        resolved.update({key: value for key, value in settings.items() if value is not None})
+        limiter = cls(**{key: value for key, value in resolved.items() if key in ENVIRONMENT_VARIABLES})
+        with cls._shared_lock:
+            cls._shared = limiter
+        limiter.__logger.debug(
+            "Rate limit %s/s (burst %d), %d-%d concurrent downloads.",
+            limiter.requests_per_second,
+            limiter.burst,
+            limiter.min_concurrency,
+            limiter.max_concurrency,
+        )
+        return limiter
+
+    @classmethod
+    def shared(cls) -> "RateLimiter":
+        """Returns the limiter shared by every connector, configuring it on first use.
+
+        Returns:
+            RateLimiter: The shared limiter.
+        """
+        if cls._shared is None:
+            return cls.configure()
+        return cls._shared
+
+    def wait(self) -> float:
+        """Blocks until a request may be sent, honouring the token bucket and any Retry-After pause.
+
+        Tokens are reserved under the lock and slept for outside it, so waiting threads are
+        served in arrival order without holding each other up.
+
+        Returns:
+            float: How long the call waited, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self.paused_until - now)
+            if self.requests_per_second > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.requests_per_second)
+                self._updated = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    delay = max(delay, -self.tokens / self.requests_per_second)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def feedback(self, status_code: int, retry_after: AnyStr = None) -> None:
+        """Adjusts the concurrency limit to a response.
+
+        Args:
+            status_code (int): The HTTP status of the response.
+            retry_after (AnyStr): The Retry-After header of the response. Defaults to None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if status_code in self.BACKOFF_STATUS_CODES:
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    self.paused_until = max(self.paused_until, now + delay)
+                if now - self._last_decrease >= self.DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    self.limit = max(self.min_concurrency, self.limit * self.DECREASE_FACTOR)
+                    self.__logger.warning("Server is limiting requests, reducing concurrency to %d.", self.limit)
+            elif status_code < 400:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self._slot_available.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Holds one of the concurrent download slots for the duration of a with block.
+
+        Yields:
+            None: Control to the with block once a slot is free.
+        """
+        with self._slot_available:
+            while self.in_flight >= int(self.limit):
+                self._slot_available.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._slot_available:
+                self.in_flight -= 1
+                self._slot_available.notify()
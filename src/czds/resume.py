@@ -0,0 +1,263 @@
+"""Resumable zone file downloads.
+
+A zone file is streamed into `<filename>.part` and a small JSON progress sidecar,
+`<zone>.part.json`, records the validators the server sent, the expected total size
+and the last committed byte along with the SHA-256 of everything up to it. When a
+stream breaks partway through, the next attempt verifies the committed prefix, asks
+the server for the remaining bytes with a `Range` request and appends to the part file.
+Once the expected number of bytes is on disk the part file is atomically renamed into place.
+
+Gzip zone files are also inflated as they are written, so the CRC32 and ISIZE in their
+trailer are checked during the transfer and a corrupt or truncated stream is never renamed
+into place.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any
+from typing import AnyStr
+from typing import Dict
+
+from .base import Base
+from .exceptions import CorruptDownloadError
+from .exceptions import IncompleteDownloadError
+from .integrity import GzipChecker
+
+
+class PartialDownload(Base):
+    """Tracks the on-disk progress of a single zone file download."""
+
+    # How often, in bytes, the part file is flushed and the progress sidecar is updated.
+    COMMIT_INTERVAL: int = 8 * 1024 * 1024
+
+    def __init__(self, directory: AnyStr, zone_name: AnyStr) -> None:
+        """Loads any progress left behind by a previous attempt.
+
+        Args:
+            directory (AnyStr): The directory zone files are saved to.
+            zone_name (AnyStr): The zone name.
+        """
+        self.directory = directory
+        self.zone_name = zone_name
+        self.sidecar_path = os.path.join(directory, f"{zone_name}.part.json")
+        self.state: Dict[str, Any] = self._read_sidecar()
+        self.digest = hashlib.sha256()
+        self.checker: GzipChecker = None
+        self.size = 0
+        self._file = None
+        self._uncommitted = 0
+
+    @property
+    def part_path(self) -> AnyStr:
+        """The path of the part file being written.
+
+        Returns:
+            AnyStr: The part file path.
+        """
+        return os.path.join(self.directory, self.state["filename"] + ".part")
+
+    @property
+    def file(self) -> Any:
+        """The open part file.
+
+        Returns:
+            Any: The binary file object being written.
+        """
+        return self._file
+
+    def _new_checker(self) -> GzipChecker:
+        """Returns a checker for the part file when the zone file is gzip compressed.
+
+        Returns:
+            GzipChecker: The checker, or None for uncompressed zone files.
+        """
+        return GzipChecker() if (self.state.get("filename") or "").endswith(".gz") else None
+
+    def _read_sidecar(self) -> Dict[str, Any]:
+        """Reads the progress sidecar.
+
+        Returns:
+            Dict[str, Any]: The saved progress, or an empty dictionary when there is none.
+        """
+        if not os.path.isfile(self.sidecar_path):
+            return {}
+        try:
+            with open(self.sidecar_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_sidecar(self) -> None:
+        """Atomically writes the progress sidecar."""
+        temp_path = self.sidecar_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.sidecar_path)
+
+    def resume_headers(self) -> Dict[str, str]:
+        """Returns the Range/If-Range headers needed to resume, after verifying the committed prefix.
+
+        The committed prefix of the part file is re-hashed and compared against the checksum in
+        the sidecar. This both detects a part file that was modified between runs and restores
+        the running digest and gzip check so the final checksums cover the whole file without a
+        second pass.
+
+        Returns:
+            Dict[str, str]: The resume headers, empty when the download has to start from byte 0.
+        """
+        committed = self.state.get("committed", 0)
+        validator = self.state.get("etag") or self.state.get("last_modified")
+        total = self.state.get("total")
+        if not committed or not validator or (total and committed >= total) or not os.path.isfile(self.part_path):
+            self.discard()
+            return {}
+        digest = hashlib.sha256()
+        checker = self._new_checker()
+        remaining = committed
+        with open(self.part_path, "rb") as f:
+            while remaining:
+                block = f.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                digest.update(block)
+                if checker is not None:
+                    checker.feed(block)
+                remaining -= len(block)
+        if remaining or digest.hexdigest() != self.state.get("committed_sha256"):
+            self.__logger.warning("Partial download of '%s' failed verification, restarting.", self.zone_name)
+            self.discard()
+            return {}
+        self.digest = digest
+        self.checker = checker
+        return {"Range": f"bytes={committed}-", "If-Range": validator}
+
+    def start(self, filename: AnyStr, etag: AnyStr = None, last_modified: AnyStr = None, total: int = None) -> None:
+        """Starts writing a part file from byte 0.
+
+        Args:
+            filename (AnyStr): The final filename of the zone file.
+            etag (AnyStr): The ETag header from the response. Defaults to None.
+            last_modified (AnyStr): The Last-Modified header from the response. Defaults to None.
+            total (int): The expected size of the zone file in bytes. Defaults to None.
+        """
+        self.discard()
+        self.state = {
+            "filename": filename,
+            "etag": etag,
+            "last_modified": last_modified,
+            "total": total,
+            "committed": 0,
+            "committed_sha256": hashlib.sha256().hexdigest(),
+        }
+        self.digest = hashlib.sha256()
+        self.checker = self._new_checker()
+        self.size = 0
+        self._file = open(self.part_path, "wb")
+        self._write_sidecar()
+
+    def resume(self, offset: int) -> bool:
+        """Continues writing the part file from a byte offset returned by a 206 response.
+
+        Args:
+            offset (int): The first byte position in the partial response.
+
+        Returns:
+            bool: True when the offset matches the committed prefix and writing can continue.
+        """
+        if offset != self.state.get("committed"):
+            return False
+        self.size = offset
+        self._file = open(self.part_path, "r+b")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        self.__logger.info("Resuming download of '%s' from byte %d.", self.zone_name, offset)
+        return True
+
+    def preallocate(self) -> None:
+        """Reserves disk space for the rest of the zone file where the platform supports it."""
+        total = self.state.get("total")
+        if self._file is None or not total or total <= self.size or not hasattr(os, "posix_fallocate"):
+            return
+        self._file.flush()
+        try:
+            os.posix_fallocate(self._file.fileno(), self.size, total - self.size)
+        except OSError as e:
+            self.__logger.debug("Unable to preallocate '%s'. %s", self.part_path, e)
+
+    def write(self, chunk: bytes) -> None:
+        """Appends a chunk to the part file, committing progress every COMMIT_INTERVAL bytes.
+
+        Args:
+            chunk (bytes): The bytes to write. A memoryview over a reused buffer is accepted.
+        """
+        self._file.write(chunk)
+        self.digest.update(chunk)
+        if self.checker is not None:
+            self.checker.feed(chunk)
+        self.size += len(chunk)
+        self._uncommitted += len(chunk)
+        if self._uncommitted >= self.COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self) -> None:
+        """Flushes the part file and records the committed byte and its checksum in the sidecar."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.state["committed"] = self.size
+        self.state["committed_sha256"] = self.digest.hexdigest()
+        self._uncommitted = 0
+        self._write_sidecar()
+
+    def close(self) -> None:
+        """Commits progress and closes the part file so a later attempt can resume."""
+        if self._file is not None:
+            try:
+                self.commit()
+            finally:
+                self._file.close()
+                self._file = None
+
+    def finish(self) -> Dict[str, Any]:
+        """Verifies the size and gzip trailer of the part file and atomically renames it into place.
+
+        Raises:
+            IncompleteDownloadError: Raises when fewer or more bytes than expected were received.
+            CorruptDownloadError: Raises when a gzip zone file is corrupt or truncated. The part file is discarded.
+
+        Returns:
+            Dict[str, Any]: The final path, size and SHA-256 checksum of the zone file, and for gzip
+                files the CRC32 and size of the uncompressed data.
+        """
+        self.close()
+        total = self.state.get("total")
+        if total is not None and self.size != total:
+            if self.size > total:
+                self.discard()
+            raise IncompleteDownloadError(
+                f"Received {self.size} of {total} bytes for zone '{self.zone_name}'.", received=self.size, total=total
+            )
+        result = {"size": self.size, "sha256": self.digest.hexdigest()}
+        if self.checker is not None:
+            try:
+                result.update(self.checker.finish())
+            except CorruptDownloadError as e:
+                self.discard()
+                raise CorruptDownloadError(f"Zone '{self.zone_name}' failed verification. {e}", received=self.size)
+        path = os.path.join(self.directory, self.state["filename"])
+        os.replace(self.part_path, path)
+        os.remove(self.sidecar_path)
+        return {"path": path, **result}
+
+    def discard(self) -> None:
+        """Removes the part file and progress sidecar."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.state.get("filename") and os.path.isfile(self.part_path):
+            os.remove(self.part_path)
+        if os.path.isfile(self.sidecar_path):
+            os.remove(self.sidecar_path)
+        self.state = {}
@@ -0,0 +1,341 @@
+"""Streaming access to zone file records.
+
+These helpers read a gzip compressed zone file from any binary file object, whether a
+local file or the raw body of a download response, and yield one record at a time as the
+data is decompressed. Memory use stays bounded by the read size regardless of how many
+records the zone holds, so downstream consumers can process `.com` in a pipeline without
+materializing it.
+"""
+
+import os
+import zlib
+from typing import Any
+from typing import AnyStr
+from typing import BinaryIO
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from .base import Base
+from .filtering import RecordFilter
+from .models import ZoneBatch
+from .models import ZoneData
+from .parser import parse_batches
+from .parser import parse_zone_data
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class LineAssembler:
+    """Incrementally splits a stream of byte blocks into complete lines.
+
+    Each block is cut at its last newline. The complete lines before it are returned and the
+    partial line after it is carried over and prepended to the next block, so records that
+    straddle a block boundary come out whole. Only complete lines are decoded, which also
+    keeps multi-byte UTF-8 characters from being split.
+    """
+
+    def __init__(self, select: Callable[[bytes], bytes] = None) -> None:
+        """Starts with no carried over partial line.
+
+        Args:
+            select (Callable[[bytes], bytes]): Called with each run of complete lines, before it is decoded,
+                to pick the lines to keep, such as `RecordFilter.select`. Defaults to keeping every line.
+        """
+        self._tail = b""
+        self._select = select
+
+    def feed(self, data: bytes) -> List[AnyStr]:
+        """Returns the complete, non-empty lines available after appending a block.
+
+        Args:
+            data (bytes): The next block of the stream.
+
+        Returns:
+            List[AnyStr]: The decoded lines, without line endings.
+        """
+        end = data.rfind(b"\n")
+        if end == -1:
+            self._tail += data
+            return []
+        complete = self._tail + data[:end] if self._tail else data[:end]
+        self._tail = data[end + 1 :]
+        return self._decode(complete)
+
+    def flush(self) -> List[AnyStr]:
+        """Returns the final line when the stream does not end with a newline.
+
+        Returns:
+            List[AnyStr]: The decoded line, or an empty list.
+        """
+        tail, self._tail = self._tail, b""
+        return self._decode(tail)
+
+    def _decode(self, data: bytes) -> List[AnyStr]:
+        """Decodes a run of complete lines in a single call and splits it.
+
+        Args:
+            data (bytes): One or more lines separated by newlines.
+
+        Returns:
+            List[AnyStr]: The non-empty lines.
+        """
+        if data and self._select is not None:
+            data = self._select(data)
+        if not data:
+            return []
+        text = data.decode("utf-8", errors="ignore")
+        if "\r" in text:
+            text = text.replace("\r", "")
+        return [line for line in text.split("\n") if line]
+
+
+class TeeReader:
+    """Wraps a binary file object and copies everything read from it to a sink."""
+
+    def __init__(self, fileobj: BinaryIO, sink: BinaryIO) -> None:
+        """Wraps the provided file object.
+
+        Args:
+            fileobj (BinaryIO): The file object to read from.
+            sink (BinaryIO): The file object every read is written to.
+        """
+        self._fileobj = fileobj
+        self._sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads from the wrapped file object and writes the data to the sink.
+
+        Args:
+            size (int): The maximum number of bytes to read. Defaults to -1.
+
+        Returns:
+            bytes: The data read.
+        """
+        data = self._fileobj.read(size)
+        if data:
+            self._sink.write(data)
+        return data
+
+
+def iter_blocks(fileobj: BinaryIO, compressed: bool = True, block_size: int = None) -> Iterator[bytes]:
+    """Yields decompressed blocks of at most block_size bytes from a zone file.
+
+    Concatenated gzip members are decompressed in sequence, like `gzip` does.
+
+    Args:
+        fileobj (BinaryIO): A binary file object positioned at the start of the zone file.
+        compressed (bool): Whether the zone file is gzip compressed. Defaults to True.
+        block_size (int): The read size and maximum decompressed block size. Defaults to `Base.CHUNK_SIZE`.
+
+    Yields:
+        bytes: Each block of the uncompressed zone file.
+    """
+    block_size = block_size or Base.CHUNK_SIZE
+    decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS) if compressed else None
+    while True:
+        data = fileobj.read(block_size)
+        if not data:
+            break
+        if decompressor is None:
+            yield data
+            continue
+        while data:
+            block = decompressor.decompress(data, block_size)
+            if decompressor.eof:
+                data = decompressor.unused_data
+                decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+                if not data.strip(b"\x00"):
+                    data = b""
+            else:
+                data = decompressor.unconsumed_tail
+            if block:
+                yield block
+    if decompressor is not None:
+        block = decompressor.flush()
+        if block:
+            yield block
+
+
+def iter_lines(
+    fileobj: BinaryIO, compressed: bool = True, block_size: int = None, record_filter: RecordFilter = None
+) -> Iterator[AnyStr]:
+    """Yields the non-empty lines of a zone file.
+
+    Args:
+        fileobj (BinaryIO): A binary file object positioned at the start of the zone file.
+        compressed (bool): Whether the zone file is gzip compressed. Defaults to True.
+        block_size (int): The read size and maximum decompressed block size. Defaults to `Base.CHUNK_SIZE`.
+        record_filter (RecordFilter): Only yield the lines this filter selects. Lines are selected
+            before they are decoded. Defaults to None.
+
+    Yields:
+        AnyStr: Each line without its trailing newline.
+    """
+    assembler = LineAssembler(select=record_filter.select if record_filter is not None else None)
+    for block in iter_blocks(fileobj, compressed=compressed, block_size=block_size):
+        yield from assembler.feed(block)
+    yield from assembler.flush()
+
+
+def iter_records(
+    fileobj: BinaryIO,
+    parse: Callable[[AnyStr], Dict[str, Any]] = None,
+    compressed: bool = True,
+    record_filter: RecordFilter = None,
+) -> Iterator[Any]:
+    """Yields the records of a zone file, optionally parsed into dictionaries.
+
+    Args:
+        fileobj (BinaryIO): A binary file object positioned at the start of the zone file.
+        parse (Callable[[AnyStr], Dict[str, Any]]): Called with each line to build a record.
+            Lines for which it returns None are skipped. Lines are yielded as is when not
+            provided. Defaults to None.
+        compressed (bool): Whether the zone file is gzip compressed. Defaults to True.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        Any: Each record.
+    """
+    lines = iter_lines(fileobj, compressed=compressed, record_filter=record_filter)
+    if parse is None:
+        yield from lines
+    else:
+        for line in lines:
+            record = parse(line)
+            if record is not None:
+                yield record
+
+
+def iter_zone_data(
+    fileobj: BinaryIO, zone_name: AnyStr, compressed: bool = True, record_filter: RecordFilter = None
+) -> Iterator[ZoneData]:
+    """Yields the records of a zone file as slotted ZoneData records.
+
+    Args:
+        fileobj (BinaryIO): A binary file object positioned at the start of the zone file.
+        zone_name (AnyStr): The zone the file belongs to.
+        compressed (bool): Whether the zone file is gzip compressed. Defaults to True.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        ZoneData: Each record.
+    """
+    lines = iter_lines(fileobj, compressed=compressed, record_filter=record_filter)
+    yield from parse_zone_data(lines, zone_name=zone_name)
+
+
+def iter_batches(
+    fileobj: BinaryIO,
+    zone_name: AnyStr,
+    batch_size: int = 65536,
+    compressed: bool = True,
+    record_filter: RecordFilter = None,
+) -> Iterator[ZoneBatch]:
+    """Yields the records of a zone file as columnar ZoneBatch objects.
+
+    Args:
+        fileobj (BinaryIO): A binary file object positioned at the start of the zone file.
+        zone_name (AnyStr): The zone the file belongs to.
+        batch_size (int): The maximum number of records per batch. Defaults to 65536.
+        compressed (bool): Whether the zone file is gzip compressed. Defaults to True.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        ZoneBatch: Each batch of records.
+    """
+    lines = iter_lines(fileobj, compressed=compressed, record_filter=record_filter)
+    yield from parse_batches(lines, zone_name=zone_name, batch_size=batch_size)
+
+
+def is_compressed(fileobj: BinaryIO) -> bool:
+    """Returns whether a seekable file object holds gzip data, leaving its position unchanged.
+
+    Args:
+        fileobj (BinaryIO): A seekable binary file object.
+
+    Returns:
+        bool: True when the file starts with the gzip magic number.
+    """
+    position = fileobj.tell()
+    compressed = fileobj.read(2) == GZIP_MAGIC
+    fileobj.seek(position)
+    return compressed
+
+
+def zone_name_from_path(path: AnyStr) -> AnyStr:
+    """Returns the zone name of a zone file path such as `<SAVE_PATH>/com.txt.gz`.
+
+    Args:
+        path (AnyStr): The zone file path.
+
+    Returns:
+        AnyStr: The zone name.
+    """
+    return os.path.basename(path).split(".", 1)[0]
+
+
+def iter_file_records(
+    path: AnyStr, parse: Callable[[AnyStr], Dict[str, Any]] = None, record_filter: RecordFilter = None
+) -> Iterator[Any]:
+    """Yields the records of a zone file on disk, detecting whether it is gzip compressed.
+
+    Args:
+        path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+        parse (Callable[[AnyStr], Dict[str, Any]]): Called with each line to build a record.
+            Lines are yielded as is when not provided. Defaults to None.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        Any: Each record.
+    """
+    with open(path, "rb") as f:
+        yield from iter_records(f, parse=parse, compressed=is_compressed(f), record_filter=record_filter)
+
+
+def iter_file_zone_data(
+    path: AnyStr, zone_name: AnyStr = None, record_filter: RecordFilter = None
+) -> Iterator[ZoneData]:
+    """Yields the records of a zone file on disk as slotted ZoneData records.
+
+    Args:
+        path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+        zone_name (AnyStr): The zone the file belongs to. Defaults to the file name up to its first dot.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        ZoneData: Each record.
+    """
+    with open(path, "rb") as f:
+        yield from iter_zone_data(
+            f,
+            zone_name=zone_name or zone_name_from_path(path),
+            compressed=is_compressed(f),
+            record_filter=record_filter,
+        )
+
+
+def iter_file_batches(
+    path: AnyStr, zone_name: AnyStr = None, batch_size: int = 65536, record_filter: RecordFilter = None
+) -> Iterator[ZoneBatch]:
+    """Yields the records of a zone file on disk as columnar ZoneBatch objects.
+
+    Args:
+        path (AnyStr): The path to a `.txt.gz` or plain text zone file.
+        zone_name (AnyStr): The zone the file belongs to. Defaults to the file name up to its first dot.
+        batch_size (int): The maximum number of records per batch. Defaults to 65536.
+        record_filter (RecordFilter): Only yield the records this filter selects. Defaults to None.
+
+    Yields:
+        ZoneBatch: Each batch of records.
+    """
+    with open(path, "rb") as f:
+        yield from iter_batches(
+            f,
+            zone_name=zone_name or zone_name_from_path(path),
+            batch_size=batch_size,
+            compressed=is_compressed(f),
+            record_filter=record_filter,
+        )
@@ -1,5 +1,10 @@
 """Configuration for the pytest test suite."""
 
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
 import pytest
 
 from czds import CZDS
@@ -8,6 +13,89 @@ from czds import CZDS
 from czds.__main__ import main
 
 
+class ZoneRequestHandler(BaseHTTPRequestHandler):
+    """Serves the files registered on the server with HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        """Silences request logging."""
+
+    def do_POST(self):
+        """Serves the authentication endpoint."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.auth_requests += 1
+        body = b'{"accessToken": "token"}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        """Serves the headers of a registered file."""
+        self._send_file(head=True)
+
+    def do_GET(self):
+        """Serves a registered file."""
+        self._send_file()
+
+    def _send_file(self, head=False):
+        failures = self.server.failures.get(self.path)
+        if failures:
+            self._send_status(failures.pop(0), headers={"Retry-After": "0"})
+            return
+        body = self.server.files.get(self.path)
+        if body is None:
+            self._send_status(404)
+            return
+        etag = f'"{hashlib.md5(body).hexdigest()}"'  # noqa: S324
+        if self.headers.get("If-None-Match") == etag:
+            self._send_status(304)
+            return
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range") in (None, etag):
+            start = int(self.headers["Range"].split("=")[1].split("-")[0])
+        status = 206 if start else 200
+        self.server.hits.append((self.command, self.path, status))
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body) - start))
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("ETag", etag)
+        filename = self.server.filenames.get(self.path, self.path.rsplit("/", 1)[-1])
+        self.send_header("Content-Disposition", f"attachment;filename={filename}")
+        self.end_headers()
+        if head:
+            return
+        drop_after = self.server.drops.pop(self.path, None)
+        if drop_after is not None:
+            self.wfile.write(body[start : start + drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def _send_status(self, status, headers=None):
+        self.server.hits.append((self.command, self.path, status))
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter(monkeypatch):
+    """Keeps the shared RateLimiter of every test away from the developer's config file and environment."""
+    from czds.ratelimit import ENVIRONMENT_VARIABLES
+    from czds.ratelimit import RateLimiter
+
+    monkeypatch.setattr("czds.ratelimit._settings_from_config", lambda: {})
+    for name in ENVIRONMENT_VARIABLES.values():
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(RateLimiter, "_shared", None)
+
+
 @pytest.fixture
 def main_class() -> CZDS:
     """Fixture for the main CZDS class interface."""
@@ -18,3 +106,31 @@ def main_class() -> CZDS:
 def runner():
     """Fixture for invoking command-line interfaces."""
     return main()
+
+
+@pytest.fixture
+def http_server(monkeypatch):
+    """Fixture for a local HTTP server serving the paths registered in `server.files`.
+
+    `server.auth_requests` counts authentication requests. `server.failures` maps a path to a list of status codes returned before the file is served,
+    and `server.drops` maps a path to a byte count after which the next response is cut off.
+    `server.filenames` maps a path to the filename sent in its Content-Disposition header, which defaults to the last path segment.
+    The CZDS and authentication URLs are pointed at the server for the duration of the test.
+    """
+    from czds.base import Base
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ZoneRequestHandler)
+    server.files = {}
+    server.hits = []
+    server.failures = {}
+    server.drops = {}
+    server.filenames = {}
+    server.auth_requests = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(Base, "BASE_URL", server.url)
+    monkeypatch.setattr(Base, "AUTH_URL", server.url + "/api/authenticate")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
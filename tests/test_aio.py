@@ -0,0 +1,66 @@
+"""Tests the czds.aio module classes."""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+
+pytest.importorskip("aiohttp")
+
+
+def test_async_get_zone(main_class, http_server, tmp_path):
+    """Tests that AsyncCZDS downloads every linked zone into SAVE_PATH."""
+    from czds.aio import AsyncCZDS
+
+    links = [http_server.url + f"/czds/downloads/{tld}.zone" for tld in ("abc", "xyz", "net")]
+    http_server.files["/czds/downloads/links"] = json.dumps(links).encode()
+    for tld in ("abc", "xyz", "net"):
+        http_server.files[f"/czds/downloads/{tld}.zone"] = tld.encode() * 1000
+
+    async def run():
+        async with AsyncCZDS("user", "pass", str(tmp_path), max_concurrency=2) as czds:
+            return await czds.get_zone()
+
+    paths = asyncio.run(run())
+    assert sorted(os.path.basename(path) for path in paths) == ["abc.zone", "net.zone", "xyz.zone"]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == os.path.basename(path).split(".")[0].encode() * 1000
+
+
+def test_async_download_missing_zone(main_class, http_server, tmp_path):
+    """Tests that a missing zone surfaces as a CZDSConnectionError."""
+    from czds.aio import AsyncCZDS
+    from czds.exceptions import CZDSConnectionError
+
+    async def run():
+        async with AsyncCZDS("user", "pass", str(tmp_path)) as czds:
+            return await czds.get_zone(link=http_server.url + "/czds/downloads/missing.zone")
+
+    with pytest.raises(CZDSConnectionError) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 404
+
+
+def test_async_failed_download_removes_part_file(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download failing partway through leaves neither the zone nor its part file."""
+    from czds.aio import AsyncCZDS
+    from czds.aio import AsyncCZDSConnector
+
+    http_server.files["/czds/downloads/abc.zone"] = b"abc" * 1000
+    monkeypatch.setattr(AsyncCZDSConnector, "WRITE_SIZE", 1)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    async def run():
+        async with AsyncCZDS("user", "pass", str(tmp_path)) as czds:
+            monkeypatch.setattr(os, "replace", fail)
+            return await czds.get_zone(link=http_server.url + "/czds/downloads/abc.zone")
+
+    with pytest.raises(OSError):
+        asyncio.run(run())
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("abc")]
@@ -0,0 +1,102 @@
+"""Tests the czds.auth module classes."""
+
+import base64
+import json
+import os
+import threading
+import time
+
+import pytest
+
+
+def make_jwt(expires_at):
+    """Returns an unsigned JWT with the provided expiry."""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expires_at}).encode()).rstrip(b"=").decode()
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    """Fixture for an empty in-memory token cache."""
+    from czds.auth import TokenCache
+
+    monkeypatch.setattr(TokenCache, "_entries", {})
+    return TokenCache
+
+
+def test_jwt_expiry(main_class):
+    """Tests reading the expiry of a JWT and tolerating opaque tokens."""
+    from czds.auth import jwt_expiry
+
+    assert jwt_expiry(make_jwt(1700000000)) == 1700000000
+    assert jwt_expiry("token") is None
+
+
+def test_single_flight_and_refresh(main_class, token_cache):
+    """Tests that concurrent callers share one login and tokens near expiry are replaced."""
+    calls = []
+
+    def authenticate():
+        calls.append(1)
+        time.sleep(0.05)
+        return make_jwt(time.time() + 24 * 3600)
+
+    threads = [threading.Thread(target=token_cache.get, args=("user", authenticate)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+    token, refresh_at = token_cache.get("user", authenticate)
+    assert refresh_at == pytest.approx(time.time() + 23 * 3600, abs=5)
+    assert token_cache.get("user", authenticate, stale_token=token)[0] != token
+    assert len(calls) == 2
+    token_cache._entries["user"]["expires_at"] = time.time() + 60
+    token_cache.get("user", authenticate)
+    assert len(calls) == 3
+
+
+def test_disk_cache(main_class, token_cache, tmp_path, monkeypatch):
+    """Tests that a token cached on disk is reused by a new process and kept private."""
+    from czds.base import Base
+
+    path = tmp_path / "tokens.json"
+    monkeypatch.setattr(Base, "TOKEN_CACHE_PATH", str(path))
+    token = make_jwt(time.time() + 3 * 3600)
+    token_cache.get("user", lambda: token)
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+    assert "user" not in path.read_text()
+
+    monkeypatch.setattr(token_cache, "_entries", {})
+    assert token_cache.get("user", lambda: pytest.fail("authenticated again"))[0] == token
+    monkeypatch.setattr(token_cache, "_read_disk", lambda: pytest.fail("read the file on a memory hit"))
+    assert token_cache.peek("user") == token
+
+
+def test_token_cache_path_is_per_client(main_class, tmp_path, monkeypatch):
+    """Tests that a client created without a token cache does not inherit an earlier client's file."""
+    from czds import CZDS
+    from czds.base import Base
+
+    monkeypatch.setattr(Base, "TOKEN_CACHE_PATH", None)
+    CZDS(token_cache=str(tmp_path / "tokens.json"))
+    assert Base.TOKEN_CACHE_PATH == str(tmp_path / "tokens.json")
+    CZDS()
+    assert Base.TOKEN_CACHE_PATH is None
+
+
+def test_connector_reauthenticates_on_401(main_class, http_server, token_cache, monkeypatch):
+    """Tests that connectors share a token and a 401 is retried once with a new one."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+
+    monkeypatch.setattr(Base, "USERNAME", "user")
+    http_server.files["/czds/downloads/links"] = b"[]"
+    connector = CZDSConnector()
+    CZDSConnector()
+    assert http_server.auth_requests == 1
+
+    http_server.failures["/czds/downloads/links"] = [401]
+    assert connector._get_zone_links() == []
+    assert http_server.auth_requests == 2
@@ -21,10 +21,68 @@ def test_chunk(main_class):
 
 
 def test_run_threaded(main_class):
-    """Tests the run_threaded method in Base."""
-    assert True
+    """Tests the run_threaded method in Base returns one flat result per item."""
+    from czds.base import Base
+
+    results = Base().run_threaded(method=lambda item: item * 2, list_data=[1, 2, 3])
+    assert sorted(results) == [2, 4, 6]
+
+
+def test_run_threaded_largest_first(main_class, monkeypatch):
+    """Tests that run_threaded queues the largest items first."""
+    from czds.base import Base
+
+    monkeypatch.setattr(Base, "THREAD_COUNT", 1)
+    sizes = {"com": 100, "net": 50, "xyz": 1}
+    results = Base().run_threaded(method=lambda item: item, list_data=["xyz", "unknown", "com", "net"], sizes=sizes)
+    assert results == ["com", "net", "xyz", "unknown"]
 
 
 def test_log(main_class):
     """Tests the log method in Base."""
     assert True
+
+
+def test_log_uses_class_logger(main_class, caplog):
+    """Tests that Base.log logs through the instance's class logger with lazy arguments."""
+    import logging
+
+    from czds.connector import CZDSConnector
+
+    connector = CZDSConnector.__new__(CZDSConnector)
+    with caplog.at_level(logging.INFO):
+        connector.log("Fetched %d zones.", "info", 3)
+        connector.log("Skipped %s.", "debug", "com")
+    assert [(record.name, record.getMessage()) for record in caplog.records] == [
+        ("Base.CZDSConnector", "Fetched 3 zones.")
+    ]
+
+
+def test_queue_logging(main_class):
+    """Tests that queued records reach the root handlers and that stopping restores them."""
+    import logging
+
+    from czds.logger import start_queue_logging
+    from czds.logger import stop_queue_logging
+
+    class Collector(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    root = logging.getLogger()
+    collector = Collector()
+    root.addHandler(collector)
+    try:
+        assert start_queue_logging() is start_queue_logging()
+        assert collector not in root.handlers
+        logging.getLogger("Base.CZDS").warning("Queued %s.", "record")
+        stop_queue_logging()
+        assert collector in root.handlers
+        assert collector.messages == ["Queued record."]
+    finally:
+        stop_queue_logging()
+        root.removeHandler(collector)
@@ -0,0 +1,41 @@
+"""Tests the czds.bloom module classes."""
+
+import gzip
+
+
+ZONE = "".join(f"example{i}.com.\t172800\tin\tns\tns{j}.example.net.\n" for i in range(2000) for j in range(2))
+
+
+def test_bloom_filter_round_trip(main_class, tmp_path):
+    """Tests membership, the false positive rate and saving and loading."""
+    from czds.bloom import BloomFilter
+
+    bloom = BloomFilter(10000, error_rate=0.01)
+    bloom.add_many(f"example{i}.com" for i in range(10000))
+    assert all(bloom.contains_many(f"EXAMPLE{i}.com." for i in range(10000)))
+    false_positives = sum(bloom.contains_many(f"other{i}.com" for i in range(10000)))
+    assert false_positives < 300
+    bloom.save(str(tmp_path / "com.bloom"))
+    loaded = BloomFilter.load(str(tmp_path / "com.bloom"))
+    assert loaded.count == 10000
+    assert loaded.contains_many(["example5.com", "other5.com"]) == bloom.contains_many(["example5.com", "other5.com"])
+
+
+def test_filter_built_while_downloading(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download builds the zone's filter and contains_many routes names by TLD."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+
+    http_server.files["/czds/downloads/com.zone"] = gzip.compress(ZONE.encode())
+    for name in ("USERNAME", "PASSWORD", "SAVE_PATH"):
+        monkeypatch.setattr(Base, name, getattr(Base, name))
+    monkeypatch.setattr(Base, "BUILD_FILTERS", True)
+    monkeypatch.setattr(Base, "CHUNK_SIZE", 1024)
+    czds = main_class(save_directory=str(tmp_path))
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    connector.download(http_server.url + "/czds/downloads/com.zone")
+    assert (tmp_path / "com.bloom").is_file()
+    results = czds.contains_many(["example1999.com", "example1.net", "example0.com", "missing-domain.com"])
+    assert results[:3] == [True, False, True]
@@ -0,0 +1,42 @@
+"""Tests the czds.catalog module classes."""
+
+import json
+
+
+def test_list_links_uses_cached_catalog(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that the catalog is fetched with HEAD metadata once and then served from disk."""
+    from czds.base import Base
+
+    for name in ("USERNAME", "PASSWORD", "SAVE_PATH"):
+        monkeypatch.setattr(Base, name, getattr(Base, name))
+    links = [http_server.url + f"/czds/downloads/{tld}.zone" for tld in ("com", "net")]
+    http_server.files["/czds/downloads/links"] = json.dumps(links).encode()
+    http_server.files["/czds/downloads/com.zone"] = b"x" * 300
+    http_server.files["/czds/downloads/net.zone"] = b"x" * 100
+
+    assert main_class("user", "password", str(tmp_path)).list_links() == links
+    assert [hit[0] for hit in http_server.hits].count("HEAD") == 2
+    requests = len(http_server.hits)
+
+    czds = main_class("user", "password", str(tmp_path))
+    assert czds.list_links(tlds=["NET"]) == links[1:]
+    assert czds._get_catalog().sizes() == {links[0]: 300, links[1]: 100}
+    assert len(http_server.hits) == requests
+
+    monkeypatch.setattr(Base, "LINK_CACHE_TTL", 0)
+    czds.list_links()
+    assert len(http_server.hits) > requests
+
+
+def test_modified_since_filter(main_class):
+    """Tests filtering by Last-Modified, keeping zones whose age is unknown."""
+    from czds.catalog import LinkCatalog
+
+    catalog = LinkCatalog()
+    catalog.entries = {
+        "a/com.zone": {"zone": "com", "last_modified": "Wed, 01 May 2024 00:00:00 GMT"},
+        "a/net.zone": {"zone": "net", "last_modified": "Fri, 03 May 2024 00:00:00 GMT"},
+        "a/org.zone": {"zone": "org", "last_modified": None},
+    }
+    assert catalog.links(modified_since="2024-05-02") == ["a/net.zone", "a/org.zone"]
+    assert catalog.links(tlds=["com"], modified_since=0) == ["a/com.zone"]
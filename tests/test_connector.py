@@ -4,3 +4,52 @@
 def test_connector(main_class):
     """Tests the creation of a Connector class."""
     assert True
+
+
+def test_shared_session_follows_thread_count(main_class):
+    """Tests that all connectors share one session sized by THREAD_COUNT."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+
+    session = CZDSConnector.get_session()
+    assert CZDSConnector.get_session() is session
+    assert session.get_adapter(Base.BASE_URL)._pool_maxsize == Base.THREAD_COUNT
+
+
+def test_pool_stats_counts_reuse(main_class, http_server):
+    """Tests that sequential requests reuse a single keep-alive connection."""
+    from czds.connector import CZDSConnector
+
+    http_server.files["/zone"] = b"data"
+    CZDSConnector.close_session()
+    connector = CZDSConnector.__new__(CZDSConnector)
+    for _ in range(3):
+        assert connector._request(url=http_server.url + "/zone").content == b"data"
+
+    stats = CZDSConnector.pool_stats()["127.0.0.1"]
+    assert stats == {"requests": 3, "new_connections": 1, "reused_connections": 2}
+    CZDSConnector.close_session()
+
+
+def test_output_to_disk_large_buffer(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that the buffered write path reassembles the body exactly, with preallocation enabled."""
+    import gzip
+    import os
+
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+    from czds.resume import PartialDownload
+
+    monkeypatch.setattr(Base, "CHUNK_SIZE", 4096)
+    monkeypatch.setattr(Base, "PREALLOCATE", True)
+    body = gzip.compress(os.urandom(4096 * 3 + 17))
+    http_server.files["/czds/downloads/com.zone"] = body
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    partial = PartialDownload(str(tmp_path), "com")
+    partial.start(filename="com.txt.gz", total=len(body))
+    connector._output_to_disk(response=connector._get(http_server.url + "/czds/downloads/com.zone"), partial=partial)
+    result = partial.finish()
+    with open(result["path"], "rb") as f:
+        assert f.read() == body
@@ -0,0 +1,60 @@
+"""Tests the czds.diff module classes."""
+
+import gzip
+import json
+
+import pytest
+
+
+OLD = (
+    "com.\t900\tin\tsoa\ta.gtld-servers.net. nstld.verisign-grs.com. 1 1800 900 604800 86400\n"
+    "kept.com.\t172800\tin\tns\tns1.example.net.\n"
+    "dropped.com.\t172800\tin\tns\tns1.example.net.\n"
+    "moved.com.\t172800\tin\tns\tns1.example.net.\n"
+    "moved.com.\t172800\tin\tns\tns2.example.net.\n"
+    "ttl.com.\t172800\tin\tns\tns1.example.net.\n"
+)
+NEW = (
+    "com.\t900\tin\tsoa\ta.gtld-servers.net. nstld.verisign-grs.com. 2 1800 900 604800 86400\n"
+    "KEPT.com.\t172800\tin\tns\tns1.example.net.\n"
+    "moved.com.\t172800\tin\tns\tns2.example.net.\n"
+    "moved.com.\t172800\tin\tns\tns3.example.net.\n"
+    "ttl.com.\t86400\tin\tns\tns1.example.net.\n"
+    "new.com.\t172800\tin\tns\tns1.example.net.\n"
+)
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """Fixture for an old and a new snapshot of the com zone."""
+    (tmp_path / "old").mkdir()
+    (tmp_path / "new").mkdir()
+    old = tmp_path / "old" / "com.txt.gz"
+    new = tmp_path / "new" / "com.txt"
+    old.write_bytes(gzip.compress(OLD.encode()))
+    new.write_text(NEW)
+    return str(old), str(new)
+
+
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_zone_diff(main_class, snapshots, partitions):
+    """Tests that added, removed and changed names are found regardless of partitioning."""
+    from czds.diff import ZoneDiff
+
+    zone_diff = ZoneDiff(*snapshots, partitions=partitions)
+    changes = {change.name: change for change in zone_diff}
+    assert zone_diff.counts == {"added": 1, "removed": 1, "changed": 1}
+    assert changes["new.com"].change == "added"
+    assert changes["dropped.com"].removed == ["NS ns1.example.net."]
+    assert changes["moved.com"].added == ["NS ns3.example.net."]
+    assert changes["moved.com"].removed == ["NS ns1.example.net."]
+
+
+def test_diff_with_ttl_writes_ndjson(main_class, snapshots, tmp_path):
+    """Tests the CLI entry point writes one JSON change per line and counts TTL changes when asked."""
+    output = tmp_path / "changes.ndjson"
+    counts = main_class().diff(*snapshots, output=str(output), ignore_ttl=False)
+    assert counts == {"added": 1, "removed": 1, "changed": 2}
+    changes = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {change["name"] for change in changes} == {"new.com", "dropped.com", "moved.com", "ttl.com"}
+    assert all(change["zone_name"] == "com" for change in changes)
@@ -0,0 +1,82 @@
+"""Tests the czds.export module classes."""
+
+import gzip
+import json
+
+import pytest
+
+
+ZONE = "b.com.\t172800\tin\tns\tns1.example.net.\na.com.\tin\t3600\ta\t192.0.2.1\nc.com.\ttxt\thello\n"
+
+
+def test_ndjson_export(main_class, tmp_path, monkeypatch):
+    """Tests that NDJSON output is valid JSON per line, sorted by name."""
+    from czds.base import Base
+
+    for name in ("USERNAME", "PASSWORD", "SAVE_PATH"):
+        monkeypatch.setattr(Base, name, getattr(Base, name))
+    path = tmp_path / "com.txt.gz"
+    path.write_bytes(gzip.compress(ZONE.encode()))
+    output = main_class("username", "password", str(tmp_path)).export_file(str(path), output_format="ndjson")
+    assert output == str(tmp_path / "com.ndjson")
+    rows = [json.loads(line) for line in open(output)]
+    assert [row["dns_record"] for row in rows] == ["a.com", "b.com", "c.com"]
+    assert rows[0] == {
+        "zone_name": "com",
+        "dns_record": "a.com",
+        "ttl": 3600,
+        "record_class": "in",
+        "record_type": "a",
+        "record_data": "192.0.2.1",
+    }
+    assert rows[2]["ttl"] is None and rows[2]["record_class"] is None
+
+
+def test_parquet_row_groups(main_class, tmp_path):
+    """Tests that each batch becomes a dictionary encoded, name sorted Parquet row group."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    from czds.export import export_batches
+    from czds.parser import parse_batches
+
+    path = str(tmp_path / "com.parquet")
+    batches = parse_batches((ZONE * 2).splitlines(), zone_name="com", batch_size=3)
+    assert export_batches(batches, path, "parquet") == 6
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.schema.field("record_type").type.value_type == "string"
+    assert table.column("dns_record").to_pylist()[:3] == ["a.com", "b.com", "c.com"]
+    assert table.column("ttl").to_pylist()[:3] == [3600, 172800, None]
+
+
+def test_download_as_arrow(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download can be exported straight to an Arrow IPC stream."""
+    pa = pytest.importorskip("pyarrow")
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+
+    http_server.files["/czds/downloads/com.zone"] = gzip.compress(ZONE.encode())
+    monkeypatch.setattr(Base, "SAVE_PATH", str(tmp_path))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", "arrow")
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    path = connector.download(http_server.url + "/czds/downloads/com.zone")
+    assert path == str(tmp_path / "com.arrows")
+    table = pa.ipc.open_stream(path).read_all()
+    assert table.num_rows == 3
+    assert table.column("record_class").to_pylist() == ["in", "in", None]
+
+
+def test_incomplete_writer_fails_on_creation(main_class, tmp_path):
+    """Tests that a writer missing an abstract method cannot be instantiated."""
+    from czds.export import ZoneWriter
+
+    class IncompleteWriter(ZoneWriter):
+        """A writer without `_close`."""
+
+        def write_batch(self, batch):
+            """Discards the batch."""
+
+    with pytest.raises(TypeError):
+        IncompleteWriter(str(tmp_path / "zone.out"))
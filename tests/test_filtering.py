@@ -0,0 +1,73 @@
+"""Tests the czds.filtering module classes."""
+
+import gzip
+import pickle
+import re
+
+
+ZONE = (
+    b"example.com.\t172800\tin\tns\tns1.example.net.\n"
+    b"www.example.com. 3600 IN A 192.0.2.1\r\n"
+    b"badexample.com.\t172800\tin\tns\tns1.example.net.\n"
+    b"example.com.\tin\t86400\tds\t12345 8 2 ABCDEF\n"
+    b"other.com. 172800 IN NS ns.example.com.\n"
+    b"ns.other.com.\t3600\tin\ta\t192.0.2.2"
+)
+
+
+def test_record_types_and_names():
+    """Tests that lines are selected by type, exact name and suffix on either separator and line ending."""
+    from czds.filtering import make_filter
+
+    def owners(record_filter):
+        return [line.split()[0] for line in record_filter.select(ZONE).split(b"\n") if line]
+
+    assert owners(make_filter(record_types="ns, ds")) == [
+        b"example.com.",
+        b"badexample.com.",
+        b"example.com.",
+        b"other.com.",
+    ]
+    assert owners(make_filter(name_filter="example.com")) == [b"example.com.", b"example.com."]
+    assert owners(make_filter(name_filter=["*.example.com", "ns.other.com."])) == [
+        b"example.com.",
+        b"www.example.com.",
+        b"example.com.",
+        b"ns.other.com.",
+    ]
+    assert owners(make_filter(record_types=["A"], name_filter=".example.com")) == [b"www.example.com."]
+    assert owners(make_filter(record_types=["DS"], name_filter=re.compile(r"^example\."))) == [b"example.com."]
+    assert make_filter() is None
+
+
+def test_dense_blocks_match_sparse_selection():
+    """Tests that switching to single call selection for dense blocks keeps the same lines."""
+    from czds.filtering import make_filter
+
+    block = b"\n".join(b"name%d.com.\t86400\tin\tns\tns1.example.net." % i for i in range(200))
+    record_filter = make_filter(record_types=["NS"])
+    sparse = record_filter.select(block)
+    assert record_filter._dense
+    assert record_filter.select(block) == sparse == block
+    assert record_filter.select(ZONE) == make_filter(record_types=["NS"]).select(ZONE)
+
+
+def test_file_records_with_filter(main_class, tmp_path):
+    """Tests that the public API filters local zone files, including with a ParallelParser."""
+    czds = main_class
+    (tmp_path / "com.txt.gz").write_bytes(gzip.compress(ZONE * 100))
+    path = str(tmp_path / "com.txt.gz")
+
+    records = list(czds.iter_file_records(czds, path, record_types="A", name_filter=".other.com"))
+    assert len(records) == 100
+    assert {(record.dns_record, record.record_type) for record in records} == {("ns.other.com", "a")}
+    batches = czds.iter_file_batches(czds, path, workers=2, record_types=["DS"])
+    assert sum(len(batch) for batch in batches) == 100
+
+
+def test_filters_pickle():
+    """Tests that a filter can be sent to worker processes."""
+    from czds.filtering import make_filter
+
+    record_filter = make_filter(record_types=["NS"], name_filter=re.compile("other"))
+    assert pickle.loads(pickle.dumps(record_filter)).select(ZONE) == b"other.com. 172800 IN NS ns.example.com."
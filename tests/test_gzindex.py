@@ -0,0 +1,49 @@
+"""Tests the czds.gzindex module classes."""
+
+import gzip
+
+import pytest
+
+
+pytest.importorskip("indexed_gzip")
+
+
+@pytest.fixture
+def zone_file(tmp_path):
+    """Fixture for a gzip compressed zone file of 5000 records."""
+    lines = [f"example{i}.com.\t172800\tin\tns\tns{i % 7}.example.net.\n" for i in range(5000)]
+    path = tmp_path / "com.txt.gz"
+    path.write_bytes(gzip.compress("".join(lines).encode()))
+    return str(path)
+
+
+def test_build_and_random_access(main_class, zone_file):
+    """Tests that the index is saved next to the file and lines can be read from any position."""
+    from czds.gzindex import GzipIndex
+
+    index = GzipIndex(zone_file, spacing=64 * 1024, checkpoint_interval=4096).build()
+    assert index.lines == 5000
+    assert len(index.checkpoints) > 10
+    reloaded = GzipIndex(zone_file)
+    assert reloaded.is_current
+    assert list(reloaded.iter_lines(4321, 4323)) == [
+        "example4321.com.\t172800\tin\tns\tns2.example.net.",
+        "example4322.com.\t172800\tin\tns\tns3.example.net.",
+    ]
+    segments = reloaded.segments(4)
+    assert segments[0][0] == 0 and segments[-1][1] == reloaded.size
+    data = b"".join(reloaded.read(start, end) for start, end in segments)
+    assert data == gzip.decompress(open(zone_file, "rb").read())
+
+
+def test_parallel_parser_uses_index(main_class, zone_file):
+    """Tests that an indexed file is decompressed in segments with the same records as serial parsing."""
+    from czds.gzindex import GzipIndex
+    from czds.pipeline import ParallelParser
+    from czds.stream import iter_file_batches
+
+    GzipIndex(zone_file, checkpoint_interval=4096).build()
+    parallel = [
+        record for batch in ParallelParser(workers=2, unit_size=4096).iter_batches(zone_file) for record in batch
+    ]
+    assert parallel == [record for batch in iter_file_batches(zone_file) for record in batch]
@@ -0,0 +1,50 @@
+"""Tests that importing czds stays fast and free of side effects."""
+
+import os
+import subprocess
+import sys
+
+import czds
+
+
+# Importing czds.czds took about 220ms when it loaded requests, asyncio, cgi and the logging config.
+IMPORT_BUDGET_MS = 150
+HEAVY_MODULES = (
+    "aiohttp",
+    "asyncio",
+    "cgi",
+    "concurrent.futures",
+    "logging.config",
+    "prompt_toolkit",
+    "requests",
+    "sqlite3",
+    "yaml",
+)
+
+
+def _run(code, *options):
+    """Runs code in a fresh interpreter that imports czds from the tree under test."""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(czds.__file__)))
+    return subprocess.run([sys.executable, *options, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def test_import_has_no_side_effects():
+    """Tests that heavy dependencies and logging configuration wait until they are used."""
+    code = (
+        "import logging, sys\n"
+        "import czds, czds.czds, czds.configuration\n"
+        f"print(sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+        "print(len(logging.getLogger().handlers), czds.configuration.ConfigurationManager._session)\n"
+        "print(czds.CZDS.__name__, czds.AsyncCZDS.__name__)\n"
+    )
+    assert _run(code).stdout.splitlines() == ["[]", "0 None", "CZDS AsyncCZDS"]
+
+
+def test_import_time_budget():
+    """Tests that `-X importtime` reports importing the CLI's CZDS class within budget."""
+    timings = []
+    for _ in range(3):
+        report = _run("import czds.czds", "-X", "importtime").stderr.splitlines()
+        (line,) = [line for line in report if line.rstrip().endswith("| czds.czds")]
+        timings.append(int(line.split("|")[1]) / 1000)
+    assert min(timings) < IMPORT_BUDGET_MS
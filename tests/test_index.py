@@ -0,0 +1,50 @@
+"""Tests the czds.index module classes."""
+
+import gzip
+import os
+
+
+COM = (
+    "com.\t900\tin\tsoa\ta.gtld-servers.net. nstld.verisign-grs.com. 1 1800 900 604800 86400\n"
+    "Example.com.\t172800\tin\tns\tns1.example.net.\n"
+    "example.com.\t172800\tin\tns\tns2.example.net.\n"
+    "paypal-login.com.\t172800\tin\tns\tns1.evil.net.\n"
+    "secure-paypal.com.\t172800\tin\tns\tns1.evil.net.\n"
+)
+NET = "example.net.\t172800\tin\tns\tns1.example.net.\nns1.example.net.\t172800\tin\ta\t192.0.2.1\n"
+
+
+def test_lookup_and_scans(main_class, tmp_path):
+    """Tests exact lookups and prefix and suffix scans across zones."""
+    from czds.index import DomainIndex
+
+    (tmp_path / "com.txt.gz").write_bytes(gzip.compress(COM.encode()))
+    (tmp_path / "net.txt.gz").write_bytes(gzip.compress(NET.encode()))
+    with DomainIndex(str(tmp_path)) as index:
+        assert index.update() == {"com": 5, "net": 2}
+        records = index.lookup("EXAMPLE.com.", record_type="NS")
+        assert [record.record_data for record in records] == ["ns1.example.net.", "ns2.example.net."]
+        assert records[0].zone_name == "com" and records[0].ttl == 172800
+        assert index.lookup("missing.com") == []
+        assert [r.dns_record for r in index.scan_prefix("paypal")] == ["paypal-login.com"]
+        assert [r.dns_record for r in index.scan_suffix("paypal.com")] == ["secure-paypal.com"]
+        assert [r.dns_record for r in index.scan_suffix("example.net")] == ["example.net", "ns1.example.net"]
+
+
+def test_update_is_incremental(main_class, tmp_path):
+    """Tests that only changed zones are reloaded and removed zones are dropped."""
+    from czds.index import DomainIndex
+
+    com = tmp_path / "com.txt.gz"
+    net = tmp_path / "net.txt.gz"
+    com.write_bytes(gzip.compress(COM.encode()))
+    net.write_bytes(gzip.compress(NET.encode()))
+    with DomainIndex(str(tmp_path)) as index:
+        index.update()
+        assert index.update() == {}
+        com.write_bytes(gzip.compress((COM + "new.com.\t172800\tin\tns\tns1.example.net.\n").encode()))
+        os.remove(net)
+        assert index.update() == {"com": 6}
+        assert index.zones() == {"com": 6}
+        assert index.lookup("example.net") == []
+        assert len(index.lookup("new.com")) == 1
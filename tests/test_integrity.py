@@ -0,0 +1,87 @@
+"""Tests the czds.integrity module classes."""
+
+import gzip
+import json
+import zlib
+
+import pytest
+
+
+ZONE = b"".join(b"name%d.com. 86400 in ns ns1.example.net.\n" % i for i in range(2000))
+
+
+def test_checker_validates_members_and_trailers():
+    """Tests that concatenated members pass and that truncated or bit-flipped streams fail."""
+    from czds.exceptions import CorruptDownloadError
+    from czds.integrity import GzipChecker
+
+    body = gzip.compress(ZONE[:1000]) + gzip.compress(ZONE[1000:])
+    checker = GzipChecker()
+    for start in range(0, len(body), 7):
+        checker.feed(memoryview(body)[start : start + 7])
+    crc32 = f"{zlib.crc32(ZONE[:1000]):08x},{zlib.crc32(ZONE[1000:]):08x}"
+    assert checker.finish() == {"crc32": crc32, "uncompressed_size": len(ZONE)}
+    assert checker.trailers[1] == (zlib.crc32(ZONE[1000:]), len(ZONE) - 1000)
+
+    truncated = GzipChecker()
+    truncated.feed(body[:-20])
+    with pytest.raises(CorruptDownloadError):
+        truncated.finish()
+
+    flipped = bytearray(gzip.compress(ZONE))
+    flipped[-6] ^= 0xFF
+    corrupt = GzipChecker()
+    corrupt.feed(bytes(flipped))
+    with pytest.raises(CorruptDownloadError):
+        corrupt.finish()
+
+
+def test_download_records_and_verifies_checksums(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download records its CRC32 in the manifest and that verify detects later corruption."""
+    from czds.base import Base
+    from czds.manifest import Manifest
+
+    for name in ("USERNAME", "PASSWORD", "SAVE_PATH"):
+        monkeypatch.setattr(Base, name, getattr(Base, name))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", None)
+    monkeypatch.setattr(Base, "BUILD_FILTERS", Base.BUILD_FILTERS)
+    monkeypatch.setattr(Manifest, "_instances", {})
+    http_server.files["/czds/downloads/com.zone"] = gzip.compress(ZONE)
+    http_server.filenames["/czds/downloads/com.zone"] = "com.txt.gz"
+    czds = main_class("user", "password", str(tmp_path))
+
+    (path,) = czds.get_zone(http_server.url + "/czds/downloads/com.zone", build_filters=True)
+    entry = json.loads((tmp_path / ".czds-manifest.json").read_text())["com"]
+    assert entry["crc32"] == f"{zlib.crc32(ZONE):08x}"
+    assert entry["uncompressed_size"] == len(ZONE)
+    assert czds.contains_many(["name1999.com", "missing.com"]) == [True, False]
+    assert czds.verify(path)["valid"]
+
+    with open(path, "r+b") as f:
+        f.seek(30)
+        f.write(b"\x00\x00\x00\x00")
+    result = czds.verify(path)
+    assert not result["valid"]
+    assert any(error.startswith("sha256") for error in result["errors"])
+
+
+def test_corrupt_download_is_retried(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download failing its gzip check is discarded and not renamed into place."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+    from czds.exceptions import CorruptDownloadError
+    from czds.manifest import Manifest
+
+    monkeypatch.setattr(Base, "SAVE_PATH", str(tmp_path))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", None)
+    monkeypatch.setattr(Base, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(Base, "MAX_RETRIES", 1)
+    monkeypatch.setattr(Manifest, "_instances", {})
+    http_server.files["/czds/downloads/net.zone"] = gzip.compress(ZONE)[:-8] + b"\x00" * 8
+    http_server.filenames["/czds/downloads/net.zone"] = "net.txt.gz"
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    with pytest.raises(CorruptDownloadError):
+        connector._fetch_to_disk(http_server.url + "/czds/downloads/net.zone", "net")
+    assert [path.name for path in tmp_path.iterdir()] == []
@@ -0,0 +1,58 @@
+"""Tests the czds.manifest module classes."""
+
+import hashlib
+import json
+import os
+
+
+def test_manifest_round_trip(main_class, tmp_path):
+    """Tests that manifest entries are persisted and reloaded."""
+    from czds.manifest import Manifest
+
+    (tmp_path / "com.txt.gz").write_bytes(b"zone")
+    manifest = Manifest(str(tmp_path))
+    manifest.update("com", filename="com.txt.gz", etag='"abc"', last_modified=None, size=4, sha256="00")
+
+    reloaded = Manifest(str(tmp_path))
+    assert reloaded.get("com")["etag"] == '"abc"'
+    assert reloaded.conditional_headers("com") == {"If-None-Match": '"abc"'}
+    assert reloaded.is_unchanged("com", etag='"abc"')
+    assert not reloaded.is_unchanged("com", etag='"def"')
+
+
+def test_manifest_requires_local_copy(main_class, tmp_path):
+    """Tests that a missing or resized local file forces a full download."""
+    from czds.manifest import Manifest
+
+    manifest = Manifest(str(tmp_path))
+    manifest.update("com", filename="com.txt.gz", etag='"abc"', size=4)
+    assert manifest.conditional_headers("com") == {}
+
+    (tmp_path / "com.txt.gz").write_bytes(b"truncated zone")
+    assert manifest.conditional_headers("com") == {}
+
+
+def test_unchanged_zone_is_skipped(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a second download of an unchanged zone is answered with a 304 and not rewritten."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+    from czds.manifest import Manifest
+
+    monkeypatch.setattr(Base, "SAVE_PATH", str(tmp_path))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", None)
+    monkeypatch.setattr(Manifest, "_instances", {})
+    body = b"com zone data" * 100
+    http_server.files["/czds/downloads/com.zone"] = body
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    path = connector.download(http_server.url + "/czds/downloads/com.zone")
+    first_mtime = os.stat(path).st_mtime_ns
+    assert connector.download(http_server.url + "/czds/downloads/com.zone") == path
+    assert os.stat(path).st_mtime_ns == first_mtime
+    assert [hit[2] for hit in http_server.hits] == [200, 304]
+
+    with open(tmp_path / Manifest.FILENAME) as f:
+        entry = json.load(f)["com"]
+    assert entry["size"] == len(body)
+    assert entry["sha256"] == hashlib.sha256(body).hexdigest()
@@ -0,0 +1,94 @@
+"""Tests the czds.metrics module classes."""
+
+import gzip
+import json
+
+import pytest
+
+
+ZONE = b"".join(b"name%d.com.\t86400\tin\tns\tns1.example.net.\n" % i for i in range(1000))
+
+
+def test_metrics_summary_and_exposition():
+    """Tests that tracked values are attributed to the thread's zone and rendered in both formats."""
+    from czds.metrics import Metrics
+
+    metrics = Metrics()
+    download = metrics.queued(lambda zone_name: metrics.gauges["in_flight"], 2)
+    assert metrics.gauges["queue_depth"] == 2
+    with metrics.track("com"):
+        assert download("com") == 1
+        metrics.add("bytes", 100)
+        metrics.add("retries", 1)
+        metrics.set("status", 200)
+    metrics.add("records", 5, zone_name="net")
+    metrics.add("bytes", 1)
+
+    summary = metrics.summary()
+    assert summary["gauges"] == {"in_flight": 0, "queue_depth": 1}
+    assert summary["zones"]["com"]["throughput"] > 0
+    assert summary["totals"]["bytes"] == 100
+    assert summary["responses"] == {200: 1}
+
+    text = metrics.to_prometheus()
+    assert "# TYPE czds_zone_bytes_total counter" in text
+    assert 'czds_zone_records_total{zone="net"} 5' in text
+    assert 'czds_http_responses_total{code="200"} 1' in text
+    openmetrics = metrics.to_prometheus(openmetrics=True)
+    assert "# TYPE czds_zone_bytes counter" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+
+def test_get_zone_records_metrics(main_class, http_server, tmp_path, monkeypatch):
+    """Tests that a download reports its bytes, retries and status and writes a JSON summary."""
+    from czds.base import Base
+    from czds.manifest import Manifest
+    from czds.ratelimit import RateLimiter
+
+    for name in ("USERNAME", "PASSWORD", "SAVE_PATH", "METRICS", "BUILD_FILTERS"):
+        monkeypatch.setattr(Base, name, getattr(Base, name))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", None)
+    monkeypatch.setattr(Base, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(Manifest, "_instances", {})
+    monkeypatch.setattr(RateLimiter, "_shared", RateLimiter(requests_per_second=0))
+    body = gzip.compress(ZONE)
+    http_server.files["/czds/downloads/com.zone"] = body
+    http_server.filenames["/czds/downloads/com.zone"] = "com.txt.gz"
+    http_server.failures["/czds/downloads/com.zone"] = [503]
+    czds = main_class("user", "password", str(tmp_path), metrics=True)
+
+    czds.get_zone(http_server.url + "/czds/downloads/com.zone")
+    zone = json.loads((tmp_path / ".czds-metrics.json").read_text())["zones"]["com"]
+    assert (zone["bytes"], zone["retries"], zone["status"]) == (len(body), 1, 200)
+    assert zone["decompress_seconds"] > 0 and zone["time_to_first_byte_seconds"] > 0
+
+    czds.get_zone(http_server.url + "/czds/downloads/com.zone", output_format="ndjson", force=True)
+    assert json.loads(czds.metrics_report())["zones"]["com"]["records"] == 1000
+    assert 'czds_zone_records_total{zone="com"} 1000' in czds.metrics_report("prometheus")
+
+
+def test_metrics_report_disabled(main_class, tmp_path, monkeypatch):
+    """Tests that a report with metrics disabled raises RuntimeError and an unknown format UnsupportedTypeError."""
+    from czds.base import Base
+    from czds.exceptions import UnsupportedTypeError
+
+    monkeypatch.setattr(Base, "METRICS", None)
+    czds = main_class("user", "password", str(tmp_path))
+    with pytest.raises(RuntimeError):
+        czds.metrics_report()
+    czds = main_class("user", "password", str(tmp_path), metrics=True)
+    with pytest.raises(UnsupportedTypeError):
+        czds.metrics_report("xml")
+
+
+def test_default_client_disables_metrics(main_class, tmp_path, monkeypatch):
+    """Tests that a client created without metrics does not keep recording an earlier client's."""
+    from czds.base import Base
+
+    monkeypatch.setattr(Base, "METRICS", None)
+    main_class("user", "password", str(tmp_path / "first"), metrics=True)
+    assert Base.METRICS is not None
+    czds = main_class("user", "password", str(tmp_path / "second"))
+    assert Base.METRICS is None
+    with pytest.raises(RuntimeError):
+        czds.metrics_report()
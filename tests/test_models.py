@@ -0,0 +1,58 @@
+"""Tests the czds.models module classes."""
+
+import sys
+
+
+RECORDS = [
+    ("example.com", "172800", "in", "ns", "ns1.example.net."),
+    ("example.com", "86400", "in", "ds", "12345 8 2 ABCDEF"),
+    ("bücher.com", None, None, "a", "192.0.2.1"),
+]
+
+
+def test_zone_data_is_slotted_and_typed(main_class):
+    """Tests that ZoneData has no per-instance dict and an integer TTL."""
+    from czds.models import ZoneData
+
+    record = ZoneData.from_record("com", RECORDS[0])
+    assert not hasattr(record, "__dict__")
+    assert record.ttl == 172800
+    assert ZoneData.from_record("com", RECORDS[2]).ttl is None
+
+
+def test_zone_batch_round_trip(main_class):
+    """Tests that a ZoneBatch returns the records it was built from."""
+    from czds.models import ZoneBatch
+    from czds.models import ZoneData
+
+    batch = ZoneBatch("com")
+    batch.extend(RECORDS)
+    assert len(batch) == 3
+    assert list(batch) == [ZoneData.from_record("com", record) for record in RECORDS]
+    assert batch[-1].dns_record == "bücher.com"
+    assert batch.types == ["ns", "ds", "a"]
+
+
+def test_zone_batch_is_compact(main_class):
+    """Tests that a batch is several times smaller than the equivalent list of dicts."""
+    from czds.models import ZoneBatch
+    from czds.parser import parse_line
+
+    lines = [f"example{i}.com.\t172800\tin\tns\tns{i % 50}.example.net." for i in range(10000)]
+    batch = ZoneBatch("com")
+    dicts = []
+    for line in lines:
+        batch.append(tuple(parse_line(line).values()))
+        dicts.append(parse_line(line))
+    dict_bytes = sum(sys.getsizeof(d) + sum(sys.getsizeof(v) for v in d.values()) for d in dicts)
+    assert batch.nbytes * 5 < dict_bytes
+
+
+def test_parse_batches(main_class):
+    """Tests that the streaming parser emits batches of the requested size."""
+    from czds.parser import parse_batches
+
+    lines = [f"example{i}.com.\t172800\tin\tns\tns1.example.net." for i in range(10)]
+    batches = list(parse_batches(lines, "com", batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[2][1].dns_record == "example9.com"
@@ -0,0 +1,48 @@
+"""Tests the czds.parser module functions."""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("example.com.\t172800\tin\tns\tns1.example.net.", ("example.com", "172800", "in", "ns", "ns1.example.net.")),
+        ('example.com. IN 3600 TXT "v=spf1  -all"', ("example.com", "3600", "IN", "TXT", '"v=spf1  -all"')),
+        ("example.com. 3600 A 192.0.2.1", ("example.com", "3600", None, "A", "192.0.2.1")),
+        ("example.com. in ns ns1.example.net.", ("example.com", None, "in", "ns", "ns1.example.net.")),
+        ("; a comment", None),
+        ("$ORIGIN com.", None),
+        ("$TTL 86400", None),
+        ("", None),
+    ],
+)
+def test_parse_record(main_class, line, expected):
+    """Tests both TTL/class orderings, omitted fields, comments and directives."""
+    from czds.parser import parse_record
+    from czds.parser import parse_records
+
+    assert parse_record(line) == expected
+    assert list(parse_records([line])) == ([expected] if expected else [])
+
+
+def test_parse_record_interns_class_and_type(main_class):
+    """Tests that repeated class and type strings are shared."""
+    from czds.parser import parse_record
+
+    first = parse_record("a.com. 1 " + "in" + " " + "ns" + " x.")
+    second = parse_record("b.com. 1 " + "".join(["i", "n"]) + " " + "".join(["n", "s"]) + " y.")
+    assert first[2] is second[2]
+    assert first[3] is second[3]
+
+
+def test_parse_line_dict(main_class):
+    """Tests the dictionary form used by the json output mode."""
+    from czds.parser import parse_line
+
+    assert parse_line("example.com.\tin\t86400\tds\t12345 8 2 ABCDEF") == {
+        "dns_record": "example.com",
+        "ttl": "86400",
+        "record_class": "in",
+        "record_type": "ds",
+        "record_data": "12345 8 2 ABCDEF",
+    }
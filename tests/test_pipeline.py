@@ -0,0 +1,64 @@
+"""Tests the czds.pipeline module classes."""
+
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def zone_file(tmp_path):
+    """Fixture for a gzip compressed zone file of 5000 records."""
+    lines = [f"example{i}.com.\t172800\tin\tns\tns{i % 7}.example.net.\n" for i in range(5000)]
+    path = tmp_path / "com.txt.gz"
+    path.write_bytes(gzip.compress("".join(lines).encode()))
+    return str(path)
+
+
+def test_iter_units_are_line_aligned(main_class, zone_file):
+    """Tests that every unit holds whole lines and the units rebuild the zone."""
+    from czds.pipeline import ParallelParser
+
+    units = list(ParallelParser(workers=1, unit_size=1000).iter_units(zone_file))
+    assert len(units) > 10
+    lines = b"\n".join(units).decode().split("\n")
+    assert len([line for line in lines if line]) == 5000
+    assert all(line.startswith("example") for line in lines if line)
+
+
+def test_parallel_batches_match_serial(main_class, zone_file):
+    """Tests that parallel parsing yields the same records, in order, as serial parsing."""
+    from czds.pipeline import ParallelParser
+    from czds.stream import iter_file_batches
+
+    parallel = [
+        record for batch in ParallelParser(workers=2, unit_size=4096).iter_batches(zone_file) for record in batch
+    ]
+    serial = [record for batch in iter_file_batches(zone_file) for record in batch]
+    assert parallel == serial
+
+
+def test_write_shards(main_class, zone_file, tmp_path):
+    """Tests that workers write every record to their shards."""
+    from czds.pipeline import ParallelParser
+
+    parser = ParallelParser(workers=2, unit_size=4096)
+    shards = parser.write_shards(zone_file, str(tmp_path / "shards"))
+    lines = [line for shard in shards for line in open(shard).read().splitlines()]
+    assert len(lines) == parser.count(zone_file) == 5000
+    assert sorted(lines)[0] == "example0.com\t172800\tin\tns\tns0.example.net."
+
+
+def test_write_shards_again_replaces_shards(main_class, zone_file, tmp_path):
+    """Tests that writing shards into the same directory again neither duplicates records nor returns stale shards."""
+    from czds.pipeline import ParallelParser
+
+    output_directory = tmp_path / "shards"
+    output_directory.mkdir()
+    (output_directory / "com.1.tsv").write_text("stale.com\t\t\tns\tns.example.net.\n")
+    parser = ParallelParser(workers=2, unit_size=4096)
+    parser.write_shards(zone_file, str(output_directory))
+    shards = parser.write_shards(zone_file, str(output_directory))
+    assert sorted(shards) == sorted(str(path) for path in output_directory.glob("com.*.tsv"))
+    lines = [line for shard in shards for line in open(shard).read().splitlines()]
+    assert len(lines) == 5000
+    assert not any(line.startswith("stale") for line in lines)
@@ -0,0 +1,105 @@
+"""Tests the czds.ratelimit module classes."""
+
+import threading
+import time
+
+
+def test_token_bucket_paces_requests():
+    """Tests that requests beyond the burst are spaced at the configured rate."""
+    from czds.ratelimit import RateLimiter
+
+    limiter = RateLimiter(requests_per_second=50, burst=2)
+    start = time.monotonic()
+    for _ in range(7):
+        limiter.wait()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+    assert RateLimiter(requests_per_second=0, burst=1).wait() == 0
+
+
+def test_concurrency_backs_off_and_recovers():
+    """Tests that a 429 halves the concurrency limit at most once per cooldown and successes grow it back."""
+    from czds.ratelimit import RateLimiter
+
+    limiter = RateLimiter(requests_per_second=0, max_concurrency=8, min_concurrency=2)
+    limiter.feedback(429)
+    limiter.feedback(503)
+    assert limiter.limit == 4
+    limiter._last_decrease -= limiter.DECREASE_COOLDOWN
+    limiter.feedback(503)
+    limiter._last_decrease -= limiter.DECREASE_COOLDOWN
+    limiter.feedback(429)
+    assert limiter.limit == 2
+    for _ in range(20):
+        limiter.feedback(200)
+    assert 2 < limiter.limit <= 8
+    limiter.feedback(404)
+    assert limiter.limit <= 8
+
+
+def test_retry_after_pauses_every_caller():
+    """Tests that a Retry-After received by one caller delays the next request of any caller."""
+    from czds.ratelimit import RateLimiter
+    from czds.ratelimit import parse_retry_after
+
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 01 May 2024 00:00:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    limiter = RateLimiter(requests_per_second=0)
+    limiter.feedback(429, retry_after="0.2")
+    assert limiter.wait() > 0.1
+
+
+def test_slots_cap_concurrent_work():
+    """Tests that no more than the current limit of slots are held at once."""
+    from czds.ratelimit import RateLimiter
+
+    limiter = RateLimiter(requests_per_second=0, max_concurrency=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+
+def test_settings_precedence(monkeypatch):
+    """Tests that explicit settings beat environment variables, which beat the defaults."""
+    from czds.base import Base
+    from czds.ratelimit import RateLimiter
+
+    monkeypatch.setattr("czds.ratelimit._settings_from_config", lambda: {"burst": 3, "max_concurrency": 9})
+    monkeypatch.setenv("CZDS_RATE_LIMIT", "2.5")
+    monkeypatch.setenv("CZDS_MAX_CONCURRENCY", "6")
+    limiter = RateLimiter.shared()
+    assert (limiter.requests_per_second, limiter.burst, limiter.max_concurrency) == (2.5, 3, 6)
+    assert limiter.min_concurrency == Base.MIN_CONCURRENCY
+    assert RateLimiter.configure(max_concurrency=4).max_concurrency == 4
+    assert RateLimiter.shared().requests_per_second == 2.5
+
+
+def test_connector_reports_throttling(http_server, monkeypatch):
+    """Tests that the connector feeds 429 responses back to the shared limiter and still succeeds."""
+    from czds.connector import CZDSConnector
+    from czds.ratelimit import RateLimiter
+
+    limiter = RateLimiter(requests_per_second=0, max_concurrency=8)
+    monkeypatch.setattr(RateLimiter, "_shared", limiter)
+    http_server.files["/czds/downloads/com.zone"] = b"data"
+    http_server.failures["/czds/downloads/com.zone"] = [429]
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    response = connector._request(http_server.url + "/czds/downloads/com.zone")
+    assert response.content == b"data"
+    assert 4 <= limiter.limit < 5
@@ -0,0 +1,100 @@
+"""Tests the czds.resume module classes."""
+
+import gzip
+import hashlib
+import os
+
+import pytest
+
+
+@pytest.fixture
+def connector(http_server, tmp_path, monkeypatch):
+    """Fixture for a connector saving to a temporary directory without backoff delays."""
+    from czds.base import Base
+    from czds.connector import CZDSConnector
+    from czds.manifest import Manifest
+    from czds.resume import PartialDownload
+
+    monkeypatch.setattr(Base, "SAVE_PATH", str(tmp_path))
+    monkeypatch.setattr(Base, "OUTPUT_FORMAT", None)
+    monkeypatch.setattr(Base, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(Manifest, "_instances", {})
+    monkeypatch.setattr(PartialDownload, "COMMIT_INTERVAL", 1024)
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+    return connector
+
+
+def test_download_resumes_after_drop(main_class, http_server, connector, tmp_path):
+    """Tests that a dropped stream is resumed with a Range request and renamed into place."""
+    body = os.urandom(10 * 1024)
+    http_server.files["/czds/downloads/com.zone"] = body
+    http_server.drops["/czds/downloads/com.zone"] = 4096
+
+    path = connector.download(http_server.url + "/czds/downloads/com.zone")
+
+    with open(path, "rb") as f:
+        assert f.read() == body
+    assert [hit[2] for hit in http_server.hits] == [200, 206]
+    assert sorted(os.listdir(tmp_path)) == [".czds-manifest.json", "com.zone"]
+
+
+def test_request_retries_rate_limits(main_class, http_server, connector):
+    """Tests that 429 and 503 responses are retried before the zone is served."""
+    http_server.files["/czds/downloads/net.zone"] = b"net"
+    http_server.failures["/czds/downloads/net.zone"] = [429, 503]
+
+    path = connector.download(http_server.url + "/czds/downloads/net.zone")
+
+    assert os.path.basename(path) == "net.zone"
+    assert [hit[2] for hit in http_server.hits] == [429, 503, 200]
+
+
+def test_request_gives_up_after_max_retries(main_class, http_server, connector, monkeypatch):
+    """Tests that a persistent 429 surfaces as a CZDSConnectionError."""
+    from czds.base import Base
+    from czds.exceptions import CZDSConnectionError
+
+    monkeypatch.setattr(Base, "MAX_RETRIES", 2)
+    http_server.files["/czds/downloads/org.zone"] = b"org"
+    http_server.failures["/czds/downloads/org.zone"] = [429, 429, 429]
+
+    with pytest.raises(CZDSConnectionError) as error:
+        connector.download(http_server.url + "/czds/downloads/org.zone")
+    assert error.value.status_code == 429
+
+
+def test_tampered_part_file_restarts(main_class, tmp_path):
+    """Tests that a part file that no longer matches its committed checksum is discarded."""
+    from czds.resume import PartialDownload
+
+    partial = PartialDownload(str(tmp_path), "com")
+    partial.start(filename="com.txt.gz", etag='"abc"', total=8)
+    partial.write(b"1234")
+    partial.close()
+    assert PartialDownload(str(tmp_path), "com").resume_headers() == {"Range": "bytes=4-", "If-Range": '"abc"'}
+
+    with open(tmp_path / "com.txt.gz.part", "r+b") as f:
+        f.write(b"X")
+    resumed = PartialDownload(str(tmp_path), "com")
+    assert resumed.resume_headers() == {}
+    assert os.listdir(tmp_path) == []
+
+
+def test_finish_reports_digest(main_class, tmp_path):
+    """Tests that finish verifies the size and returns the checksum of the whole file."""
+    from czds.exceptions import IncompleteDownloadError
+    from czds.resume import PartialDownload
+
+    body = gzip.compress(b"com. 86400 IN SOA a. b. 1 2 3 4 5\n")
+    partial = PartialDownload(str(tmp_path), "com")
+    partial.start(filename="com.txt.gz", etag='"abc"', total=len(body))
+    partial.write(body[:20])
+    with pytest.raises(IncompleteDownloadError):
+        partial.finish()
+
+    resumed = PartialDownload(str(tmp_path), "com")
+    resumed.resume_headers()
+    assert resumed.resume(offset=20)
+    resumed.write(body[20:])
+    assert resumed.finish()["sha256"] == hashlib.sha256(body).hexdigest()
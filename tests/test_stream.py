@@ -0,0 +1,89 @@
+"""Tests the czds.stream module functions."""
+
+import gzip
+
+
+ZONE = (
+    "example.com.\t172800\tin\tns\tns1.example.net.\n"
+    "example.com.\t172800\tin\tns\tns2.example.net.\n"
+    "\n"
+    "other.com.\tin\t86400\tds\t12345 8 2 ABCDEF\n"
+)
+
+
+def test_iter_file_records_gzip_and_plain(main_class, tmp_path):
+    """Tests that compressed and plain zone files yield the same lines."""
+    from czds.stream import iter_file_records
+
+    (tmp_path / "com.txt.gz").write_bytes(gzip.compress(ZONE.encode()))
+    (tmp_path / "com.txt").write_text(ZONE)
+
+    expected = [line for line in ZONE.splitlines() if line]
+    assert list(iter_file_records(str(tmp_path / "com.txt.gz"))) == expected
+    assert list(iter_file_records(str(tmp_path / "com.txt"))) == expected
+
+
+def test_iter_file_records_parsed(main_class, tmp_path):
+    """Tests that records are parsed lazily when requested."""
+    from czds.connector import CZDSConnector
+    from czds.stream import iter_file_records
+
+    (tmp_path / "com.txt.gz").write_bytes(gzip.compress(ZONE.encode()))
+    records = iter_file_records(str(tmp_path / "com.txt.gz"), parse=CZDSConnector._parse_line)
+    assert next(records)["dns_record"] == "example.com"
+
+
+def test_connector_iter_records(main_class, http_server):
+    """Tests that a zone is streamed from the server and parsed record by record."""
+    from czds.connector import CZDSConnector
+    from czds.models import ZoneData
+
+    http_server.files["/czds/downloads/com.zone"] = gzip.compress(ZONE.encode() * 500)
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    records = list(connector.iter_records(http_server.url + "/czds/downloads/com.zone"))
+    assert len(records) == 1500
+    assert records[2] == ZoneData("com", "other.com", 86400, "in", "ds", "12345 8 2 ABCDEF")
+
+
+def test_line_assembler_carries_partial_lines(main_class):
+    """Tests that lines split at any byte boundary, even inside a UTF-8 character, come out whole."""
+    from czds.stream import LineAssembler
+
+    data = "bücher.de.\tin\tns\tns1.example.net.\r\nexample.com.\tin\tns\tns2.example.net.".encode()
+    for size in (1, 2, 7, len(data)):
+        assembler = LineAssembler()
+        lines = []
+        for start in range(0, len(data), size):
+            lines.extend(assembler.feed(data[start : start + size]))
+        lines.extend(assembler.flush())
+        assert lines == ["bücher.de.\tin\tns\tns1.example.net.", "example.com.\tin\tns\tns2.example.net."]
+
+
+def test_iter_lines_small_blocks_and_members(main_class):
+    """Tests that tiny blocks and concatenated gzip members yield every record intact."""
+    import io
+
+    from czds.stream import iter_lines
+
+    data = gzip.compress(ZONE.encode()) + gzip.compress(ZONE.encode())
+    expected = [line for line in ZONE.splitlines() if line] * 2
+    assert list(iter_lines(io.BytesIO(data), block_size=16)) == expected
+
+
+def test_text_stream_saves_zone(main_class, http_server, tmp_path, capsys):
+    """Tests that text output prints whole lines and still saves the zone file."""
+    from czds.connector import CZDSConnector
+
+    body = gzip.compress(ZONE.encode() * 1000)
+    http_server.files["/czds/downloads/com.zone"] = body
+    connector = CZDSConnector.__new__(CZDSConnector)
+    connector.token = "token"
+
+    response = connector._get(http_server.url + "/czds/downloads/com.zone")
+    assert connector._output_to_text_stream(response=response, file_path=str(tmp_path / "com.txt.gz")) == 3000
+    assert (tmp_path / "com.txt.gz").read_bytes() == body
+    assert capsys.readouterr().out.splitlines()[:4] == [line for line in ZONE.splitlines() if line] + [
+        "example.com.\t172800\tin\tns\tns1.example.net."
+    ]